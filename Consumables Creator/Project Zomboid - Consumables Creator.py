@@ -1,34 +1,32 @@
 import os
+import time
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
+
+from consumables.completion import game_indexes, suggest
+from consumables.engine import GenerationError
+from consumables.jobs import Job, create_item, generate_file, load_completions
+from consumables.profiling import start_tracing
+from consumables.schema import validate_spec
+from consumables.specs import SpecError, normalize_spec
+
+startup_started = time.perf_counter()
 
 # ===== Path Utilities =====
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-def p(path):
-    return os.path.join(BASE_DIR, path)
+# Set CONSUMABLES_TRACE to a file name to write a stage trace on exit
+start_tracing()
 
-def ensure_dir(path):
-    os.makedirs(path, exist_ok=True)
 
+# ===== Game Data =====
+# Set PZ_GAME_DIR to a Project Zomboid install to check names against it.
+# The fields complete from the default lists until the install has been
+# indexed by a background job (see Game Data Completions below).
+completion_indexes = game_indexes(None)
 
-# ===== File Insertion Utility =====
-def insert_inside_last_brace(filepath, block, module_name=None):
-    if not os.path.exists(filepath):
-        header = f"module {module_name}\n{{\n    imports {{\n        Base\n    }}\n\n" if module_name else ""
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(header + block + "\n}\n")
-        return
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
-    if block.strip() in content:
-        return
-    last_brace = content.rfind("}")
-    if last_brace == -1:
-        raise RuntimeError(f"Invalid file structure: {filepath}")
-    new_content = content[:last_brace].rstrip() + "\n\n" + block.rstrip() + "\n" + content[last_brace:]
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(new_content)
+def completion_index(kind):
+    return completion_indexes[kind]
 
 
 # ===== GUI Setup =====
@@ -45,6 +43,27 @@ toggle_buttons = []
 evolved_cbs_buttons = []    
 
 
+# ===== Coalesced Events =====
+# Keystroke- and resize-driven work runs at most once per frame: calls made
+# before the scheduled one fires are folded into it.
+FRAME_MS = 16
+
+class Coalesced:
+    def __init__(self, widget, callback, delay=FRAME_MS):
+        self.widget = widget
+        self.callback = callback
+        self.delay = delay
+        self.pending = None
+
+    def __call__(self, event=None):
+        if self.pending is None:
+            self.pending = self.widget.after(self.delay, self.run)
+
+    def run(self):
+        self.pending = None
+        self.callback()
+
+
 # ===== Scrollable Frame Setup =====
 canvas = tk.Canvas(root, bg=DARK_BG, highlightthickness=0)
 canvas.pack(side="left", fill="both", expand=True)
@@ -62,18 +81,14 @@ main_frame_window = canvas.create_window(
     anchor="nw"
 )
 
-def on_frame_configure(event):
+def update_scrollregion():
     canvas.configure(scrollregion=canvas.bbox("all"))
 
-def on_canvas_configure(event):
-    canvas.itemconfig(main_frame_window, width=event.width)
+def update_frame_width():
+    canvas.itemconfig(main_frame_window, width=canvas.winfo_width())
 
-main_frame.bind("<Configure>", on_frame_configure)
-canvas.bind("<Configure>", on_canvas_configure)
-
-def on_frame_configure(event):
-    canvas.configure(scrollregion=canvas.bbox("all"))
-main_frame.bind("<Configure>", on_frame_configure)
+main_frame.bind("<Configure>", Coalesced(canvas, update_scrollregion))
+canvas.bind("<Configure>", Coalesced(canvas, update_frame_width))
 
 def _on_mousewheel(event):
     canvas.yview_scroll(int(-1*(event.delta/120)), "units")
@@ -113,16 +128,11 @@ def exit_fullscreen(event=None):
     global is_fullscreen
     is_fullscreen = False
     root.attributes("-fullscreen", False)
+    root.state("normal")
     canvas.coords(main_frame_window, 0, 0)
     canvas.configure(scrollregion=canvas.bbox("all"))
 
 
-# ===== Exit Fullscreen =====
-def exit_fullscreen(event=None):
-    root.attributes('-fullscreen', False)
-    root.state('normal')
-
-
 # ===== Tooltip for Fullscreen =====
 fullscreen_label = tk.Label(
     root,
@@ -140,32 +150,149 @@ root.bind("<Escape>", exit_fullscreen)
 
 
 # ===== Tooltip Class =====
+# All tooltips share one window, created on first use and hidden (not
+# destroyed) on leave; showing a tip only changes its text and position.
 class ToolTip:
+    window = None
+    label = None
+    owner = None
+
     def __init__(self, widget, text):
         self.widget = widget
         self.text = text
-        self.tip_window = None
         widget.bind("<Enter>", self.show_tip)
         widget.bind("<Leave>", self.hide_tip)
 
+    @classmethod
+    def shared_window(cls):
+        if cls.window is None:
+            cls.window = tk.Toplevel(root)
+            cls.window.wm_overrideredirect(True)
+            cls.window.withdraw()
+            cls.label = tk.Label(cls.window, justify="left",
+                                 background="#ffffe0", relief="solid", borderwidth=1,
+                                 font=("tahoma", "8", "normal"))
+            cls.label.pack(ipadx=5, ipady=3)
+        return cls.window
+
     def show_tip(self, event=None):
-        if self.tip_window or not self.text:
+        if not self.text:
             return
-        x, y, _, _ = self.widget.bbox("insert")
+        # Entries place the tip next to the cursor, other widgets below their corner
+        x, y = 0, 0
+        if isinstance(self.widget, tk.Entry):
+            x, y, _, _ = self.widget.bbox("insert")
         x += self.widget.winfo_rootx() + 20
         y += self.widget.winfo_rooty() + 20
-        self.tip_window = tw = tk.Toplevel(self.widget)
-        tw.wm_overrideredirect(True) 
-        tw.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(tw, text=self.text, justify="left",
-                         background="#ffffe0", relief="solid", borderwidth=1,
-                         font=("tahoma", "8", "normal"))
-        label.pack(ipadx=5, ipady=3)
+        window = ToolTip.shared_window()
+        ToolTip.label.config(text=self.text)
+        window.wm_geometry(f"+{x}+{y}")
+        window.deiconify()
+        window.lift()
+        ToolTip.owner = self
 
     def hide_tip(self, event=None):
-        if self.tip_window:
-            self.tip_window.destroy()
-            self.tip_window = None
+        if ToolTip.owner is self:
+            ToolTip.window.withdraw()
+            ToolTip.owner = None
+
+
+# ===== Autocomplete =====
+# Type-ahead list under an Entry. With multiple=True the field holds several
+# comma-separated names and only the one being typed is completed.
+class Autocomplete:
+    IGNORED_KEYS = {"Up", "Down", "Return", "Tab", "Escape", "Shift_L", "Shift_R",
+                    "Control_L", "Control_R", "Alt_L", "Alt_R", "Left", "Right", "Home", "End"}
+
+    def __init__(self, widget, kind, multiple=False, limit=8):
+        self.widget = widget
+        self.kind = kind
+        self.multiple = multiple
+        self.limit = limit
+        self.head = ""
+        self.popup = None
+        self.listbox = None
+        self.refresh = Coalesced(widget, self.update)
+        widget.bind("<KeyRelease>", self.on_key, add="+")
+        widget.bind("<Down>", lambda e: self.move(1))
+        widget.bind("<Up>", lambda e: self.move(-1))
+        widget.bind("<Return>", self.accept)
+        widget.bind("<Tab>", self.accept)
+        widget.bind("<Escape>", self.escape)
+        widget.bind("<FocusOut>", lambda e: widget.after(150, self.hide_unless_focused))
+
+    def _build(self):
+        self.popup = tk.Toplevel(self.widget)
+        self.popup.wm_overrideredirect(True)
+        self.popup.withdraw()
+        self.listbox = tk.Listbox(self.popup, bg=DARK_BG, fg=DARK_FG, selectbackground="#505050",
+                                  activestyle="none", exportselection=False, height=self.limit)
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<ButtonRelease-1>", self.accept)
+
+    @property
+    def visible(self):
+        return self.popup is not None and self.popup.winfo_ismapped()
+
+    def on_key(self, event):
+        if event.keysym in self.IGNORED_KEYS or str(self.widget.cget("state")) == "disabled":
+            return
+        self.refresh()
+
+    def update(self):
+        self.head, matches = suggest(completion_index(self.kind), self.widget.get(), self.multiple, self.limit)
+        typed = self.widget.get()[len(self.head):].strip()
+        if not matches or matches == [typed]:
+            self.hide()
+            return
+        if self.popup is None:
+            self._build()
+        self.listbox.delete(0, tk.END)
+        for name in matches:
+            self.listbox.insert(tk.END, name)
+        self.listbox.config(height=len(matches))
+        self.listbox.selection_set(0)
+        x = self.widget.winfo_rootx()
+        y = self.widget.winfo_rooty() + self.widget.winfo_height()
+        self.popup.wm_geometry(f"{max(self.widget.winfo_width(), 160)}x{len(matches) * 18 + 4}+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def move(self, step):
+        if not self.visible:
+            return
+        selected = self.listbox.curselection()
+        index = min(max((selected[0] if selected else -1) + step, 0), self.listbox.size() - 1)
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def accept(self, event=None):
+        if not self.visible:
+            return
+        selected = self.listbox.curselection()
+        if selected:
+            self.widget.delete(0, tk.END)
+            self.widget.insert(0, self.head + self.listbox.get(selected[0]))
+            self.widget.icursor(tk.END)
+            self.widget.xview_moveto(1)
+        self.hide()
+        self.widget.focus_set()
+        return "break"
+
+    def escape(self, event=None):
+        if self.visible:
+            self.hide()
+            return "break"
+
+    def hide(self):
+        if self.popup is not None:
+            self.popup.withdraw()
+
+    def hide_unless_focused(self):
+        if self.widget.focus_get() not in (self.widget, self.listbox):
+            self.hide()
 
 
 # ===== Input Fields =====
@@ -186,10 +313,9 @@ def add_row(label_text, default=""):
 
 ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
 
-
 # ===== Generic Row with Toggle =====
-def add_row_with_toggle(label_text, default=""):
-    row = tk.Frame(fields_frame, bg=DARK_BG)
+def add_row_with_toggle(parent_frame, label_text, default=""):
+    row = tk.Frame(parent_frame, bg=DARK_BG)
     row.pack(pady=2, anchor="center") 
 
     tk.Label(row, text=label_text, width=20, anchor="e", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=5)
@@ -285,484 +411,565 @@ ToolTip(entry_asset, "Specify your model, texture, and icon files here.")
 
 ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
 
+# ===== Inline Rows =====
+def add_inline_row(parent_frame, fields):
+    row = tk.Frame(parent_frame, bg=DARK_BG)
+    row.pack(pady=0, anchor="center")
+    entries = []
+    for label_text, width in fields:
+        tk.Label(row, text=label_text, bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(5,2))
+        entry = tk.Entry(row, width=width, bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG, state="disabled")
+        entry.pack(side="left", padx=(0,8))
+        entries.append(entry)
+    active_var = tk.BooleanVar(value=False) 
+    def toggle_active():
+        state = "normal" if active_var.get() else "disabled"
+        for entry in entries:
+            entry.config(state=state)
+        if state == "disabled":
+            for entry in entries:
+                entry.delete(0, tk.END)
 
-# ===== Specialized Fields with Toggles =====
-entry_foodtype, foodtype_active = add_row_with_toggle("FoodType:")
-ToolTip(entry_foodtype, "Type of food item. Example: NoExplicit, Egg, Berry, Vegetables.")
+    tk.Checkbutton(row, text="Active", variable=active_var, command=toggle_active,
+                   takefocus=False, bg=DARK_BG, fg=DARK_FG, selectcolor=DARK_BG, activebackground=DARK_BG).pack(side="left", padx=5)
 
-entry_eattype, eattype_active = add_row_with_toggle("EatType:")
-ToolTip(entry_eattype, "Defines the eating animation. Example: EatSmall, CanDrink, EatOffStick.")
+    return (*entries, active_var)
 
-entry_cookingsound, cookingsound_active = add_row_with_toggle("CookingSound:")
-ToolTip(entry_cookingsound, "Sound played when cooking this item. Example: FryingFood, BoilingFood.")
 
-entry_eatingsound, eatingsound_active = add_row_with_toggle("CustomEatSound:")
-ToolTip(entry_eatingsound, "Sound played when the item is eaten. Example: EatingCrispy, EatingMushy.")
+# ===== Collapsible Sections =====
+# Optional groups of fields start collapsed and their widgets (and tooltips)
+# are only built the first time the section is expanded, or when the form is
+# read or cleared. Only the required fields are built at startup.
+COLLAPSED = "\u25b8"
+EXPANDED = "\u25be"
+sections = []
+
+class Section:
+    def __init__(self, title, build):
+        self.title = title
+        self.build = build
+        self.built = False
+        self.expanded = False
+        self.header = tk.Button(fields_frame, text=f"{COLLAPSED} {title}", anchor="w", relief="flat",
+                                font=("Segoe UI", 9, "bold"), bg=DARK_BG, fg=DARK_FG,
+                                activebackground="#3C3C3C", activeforeground=DARK_FG,
+                                takefocus=False, command=self.toggle)
+        self.header.pack(fill="x", pady=(4, 0))
+        self.body = tk.Frame(fields_frame, bg=DARK_BG)
+        sections.append(self)
+
+    def ensure_built(self):
+        if not self.built:
+            self.built = True
+            self.build(self.body)
+
+    def toggle(self):
+        self.ensure_built()
+        self.expanded = not self.expanded
+        if self.expanded:
+            self.body.pack(after=self.header, fill="x")
+        else:
+            self.body.pack_forget()
+        self.header.config(text=f"{EXPANDED if self.expanded else COLLAPSED} {self.title}")
 
 
-hunger_frame = tk.Frame(fields_frame, bg=DARK_BG); hunger_frame.pack()
-thirst_frame = tk.Frame(fields_frame, bg=DARK_BG); thirst_frame.pack()
-unhappy_frame = tk.Frame(fields_frame, bg=DARK_BG); unhappy_frame.pack()
-stress_frame = tk.Frame(fields_frame, bg=DARK_BG); stress_frame.pack()
-boredom_frame = tk.Frame(fields_frame, bg=DARK_BG); boredom_frame.pack()
-fatigue_frame = tk.Frame(fields_frame, bg=DARK_BG); fatigue_frame.pack()
-endurance_frame = tk.Frame(fields_frame, bg=DARK_BG); endurance_frame.pack()
-flu_frame = tk.Frame(fields_frame, bg=DARK_BG); flu_frame.pack()
-pain_frame = tk.Frame(fields_frame, bg=DARK_BG); pain_frame.pack()
-sickness_frame = tk.Frame(fields_frame, bg=DARK_BG); sickness_frame.pack()
-infection_frame = tk.Frame(fields_frame, bg=DARK_BG); infection_frame.pack()
+def build_all_sections():
+    for section in sections:
+        section.ensure_built()
 
 
-ttk.Separator(hunger_frame, orient="horizontal").pack(fill="x", pady=8)
+# ===== Food Type and Sounds =====
+def build_food_type(parent):
+    global entry_foodtype, foodtype_active, entry_eattype, eattype_active, entry_cookingsound
+    global cookingsound_active, entry_eatingsound, eatingsound_active, entry_herbalisttype
+    global herbalisttype_active
 
-entry_hunger, hunger_choice = add_stat_dropdown_row(hunger_frame, "HungerChange:")
-ToolTip(entry_hunger.master.children['!combobox'], 
-        "Decrease: reduces hunger (fills you up)\nIncrease: increases hunger")
+    entry_foodtype, foodtype_active = add_row_with_toggle(parent, "FoodType:")
+    ToolTip(entry_foodtype, "Type of food item. Example: NoExplicit, Egg, Berry, Vegetables.")
 
-entry_thirst, thirst_choice = add_stat_dropdown_row(thirst_frame, "ThirstChange:")
-ToolTip(entry_thirst.master.children['!combobox'], 
-        "Decrease: reduces thirst (quenches you)\nIncrease: increases thirst")
+    entry_eattype, eattype_active = add_row_with_toggle(parent, "EatType:")
+    ToolTip(entry_eattype, "Defines the eating animation. Example: EatSmall, CanDrink, EatOffStick.")
 
-entry_unhappy, unhappy_choice = add_stat_dropdown_row(unhappy_frame, "UnhappyChange:")
-ToolTip(entry_unhappy.master.children['!combobox'], 
-        "Decrease: reduces unhappiness\nIncrease: increases unhappiness")
+    entry_cookingsound, cookingsound_active = add_row_with_toggle(parent, "CookingSound:")
+    ToolTip(entry_cookingsound, "Sound played when cooking this item. Example: FryingFood, BoilingFood.")
 
-entry_stress, stress_choice = add_stat_dropdown_row(stress_frame, "StressChange:")
-ToolTip(entry_stress.master.children['!combobox'], 
-        "Decrease: reduces stress\nIncrease: increases stress")
+    entry_eatingsound, eatingsound_active = add_row_with_toggle(parent, "CustomEatSound:")
+    ToolTip(entry_eatingsound, "Sound played when the item is eaten. Example: EatingCrispy, EatingMushy.")
 
-entry_boredom, boredom_choice = add_stat_dropdown_row(boredom_frame, "BoredomChange:")
-ToolTip(entry_boredom.master.children['!combobox'], 
-        "Decrease: reduces boredom\nIncrease: increases boredom")
+    entry_herbalisttype, herbalisttype_active = add_row_with_toggle(parent, "HerbalistType:")
+    ToolTip(entry_herbalisttype, "To recognize an item with this parameter, you need to know the Herbalist recipe. Example: Mushroom, Berry, Poison.")
 
-entry_fatigue, fatigue_choice = add_stat_dropdown_row(fatigue_frame, "FatigueChange:")
-ToolTip(entry_fatigue.master.children['!combobox'], 
-        "Decrease: reduces fatigue\nIncrease: increases fatigue")
 
-entry_endurance, endurance_choice = add_stat_dropdown_row(endurance_frame, "EnduranceChange:")
-ToolTip(entry_endurance.master.children['!combobox'], 
-        "Decrease: reduces endurance\nIncrease: increases endurance")
+food_type_section = Section("Food Type and Sounds", build_food_type)
 
-entry_flu, flu_active = add_decrease_only_row(flu_frame, "FluReduction:")
-ToolTip(entry_flu, "Reduces the flu status when consumed.")
 
-entry_pain, pain_active = add_decrease_only_row(pain_frame, "PainReduction:")
-ToolTip(entry_pain, "Reduces the pain status when consumed.")
+# ===== Stat Changes =====
+def build_stats(parent):
+    global entry_hunger, hunger_choice, entry_thirst, thirst_choice, entry_unhappy, unhappy_choice
+    global entry_stress, stress_choice, entry_boredom, boredom_choice, entry_fatigue, fatigue_choice
+    global entry_endurance, endurance_choice, entry_flu, flu_active, entry_pain, pain_active
+    global entry_food_sick, food_sick_active, entry_infection, infection_active, entry_poisonpower
+    global poisonpower_active, entry_usedelta, usedelta_active
 
-entry_food_sick, food_sick_active = add_decrease_only_row(sickness_frame, "ReduceFoodSickness:")
-ToolTip(entry_food_sick, "Reduces the food sickness level.")
+    hunger_frame = tk.Frame(parent, bg=DARK_BG); hunger_frame.pack()
+    thirst_frame = tk.Frame(parent, bg=DARK_BG); thirst_frame.pack()
+    unhappy_frame = tk.Frame(parent, bg=DARK_BG); unhappy_frame.pack()
+    stress_frame = tk.Frame(parent, bg=DARK_BG); stress_frame.pack()
+    boredom_frame = tk.Frame(parent, bg=DARK_BG); boredom_frame.pack()
+    fatigue_frame = tk.Frame(parent, bg=DARK_BG); fatigue_frame.pack()
+    endurance_frame = tk.Frame(parent, bg=DARK_BG); endurance_frame.pack()
+    flu_frame = tk.Frame(parent, bg=DARK_BG); flu_frame.pack()
+    pain_frame = tk.Frame(parent, bg=DARK_BG); pain_frame.pack()
+    sickness_frame = tk.Frame(parent, bg=DARK_BG); sickness_frame.pack()
+    infection_frame = tk.Frame(parent, bg=DARK_BG); infection_frame.pack()
 
-entry_infection, infection_active = add_decrease_only_row(infection_frame, "ReduceInfectionPower:")
-ToolTip(entry_infection, "Reduces infection power.")
 
-ttk.Separator(infection_frame, orient="horizontal").pack(fill="x", pady=8)
+    ttk.Separator(hunger_frame, orient="horizontal").pack(fill="x", pady=8)
 
-entry_poisonpower, poisonpower_active = add_decrease_only_row(infection_frame, "PoisonPower:")
-ToolTip(entry_poisonpower, "Determines how poisonous the item is.")
+    entry_hunger, hunger_choice = add_stat_dropdown_row(hunger_frame, "HungerChange:")
+    ToolTip(entry_hunger.master.children['!combobox'], 
+            "Decrease: reduces hunger (fills you up)\nIncrease: increases hunger")
 
-entry_usedelta, usedelta_active = add_decrease_only_row(infection_frame, "UseDelta:")
-ToolTip(entry_usedelta, "Determines how much of the drainable item's value is spent on a single use.")
+    entry_thirst, thirst_choice = add_stat_dropdown_row(thirst_frame, "ThirstChange:")
+    ToolTip(entry_thirst.master.children['!combobox'], 
+            "Decrease: reduces thirst (quenches you)\nIncrease: increases thirst")
 
-entry_herbalisttype, herbalisttype_active = add_row_with_toggle("HerbalistType:")
-ToolTip(entry_herbalisttype, "To recognize an item with this parameter, you need to know the Herbalist recipe. Example: Mushroom, Berry, Poison.")
+    entry_unhappy, unhappy_choice = add_stat_dropdown_row(unhappy_frame, "UnhappyChange:")
+    ToolTip(entry_unhappy.master.children['!combobox'], 
+            "Decrease: reduces unhappiness\nIncrease: increases unhappiness")
 
-ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
+    entry_stress, stress_choice = add_stat_dropdown_row(stress_frame, "StressChange:")
+    ToolTip(entry_stress.master.children['!combobox'], 
+            "Decrease: reduces stress\nIncrease: increases stress")
 
-# ===== Nutrition Fields =====
-def add_inline_row(fields):
-    row = tk.Frame(fields_frame, bg=DARK_BG)
-    row.pack(pady=0, anchor="center")
-    entries = []
-    for label_text, width in fields:
-        tk.Label(row, text=label_text, bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(5,2))
-        entry = tk.Entry(row, width=width, bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG, state="disabled")
-        entry.pack(side="left", padx=(0,8))
-        entries.append(entry)
-    active_var = tk.BooleanVar(value=False) 
-    def toggle_active():
-        state = "normal" if active_var.get() else "disabled"
-        for entry in entries:
-            entry.config(state=state)
+    entry_boredom, boredom_choice = add_stat_dropdown_row(boredom_frame, "BoredomChange:")
+    ToolTip(entry_boredom.master.children['!combobox'], 
+            "Decrease: reduces boredom\nIncrease: increases boredom")
+
+    entry_fatigue, fatigue_choice = add_stat_dropdown_row(fatigue_frame, "FatigueChange:")
+    ToolTip(entry_fatigue.master.children['!combobox'], 
+            "Decrease: reduces fatigue\nIncrease: increases fatigue")
+
+    entry_endurance, endurance_choice = add_stat_dropdown_row(endurance_frame, "EnduranceChange:")
+    ToolTip(entry_endurance.master.children['!combobox'], 
+            "Decrease: reduces endurance\nIncrease: increases endurance")
+
+    entry_flu, flu_active = add_decrease_only_row(flu_frame, "FluReduction:")
+    ToolTip(entry_flu, "Reduces the flu status when consumed.")
+
+    entry_pain, pain_active = add_decrease_only_row(pain_frame, "PainReduction:")
+    ToolTip(entry_pain, "Reduces the pain status when consumed.")
+
+    entry_food_sick, food_sick_active = add_decrease_only_row(sickness_frame, "ReduceFoodSickness:")
+    ToolTip(entry_food_sick, "Reduces the food sickness level.")
+
+    entry_infection, infection_active = add_decrease_only_row(infection_frame, "ReduceInfectionPower:")
+    ToolTip(entry_infection, "Reduces infection power.")
+
+    ttk.Separator(infection_frame, orient="horizontal").pack(fill="x", pady=8)
+
+    entry_poisonpower, poisonpower_active = add_decrease_only_row(infection_frame, "PoisonPower:")
+    ToolTip(entry_poisonpower, "Determines how poisonous the item is.")
+
+    entry_usedelta, usedelta_active = add_decrease_only_row(infection_frame, "UseDelta:")
+    ToolTip(entry_usedelta, "Determines how much of the drainable item's value is spent on a single use.")
+
+
+stats_section = Section("Stat Changes", build_stats)
+
+
+# ===== Nutrition =====
+def build_nutrition(parent):
+    global entry_carbs, entry_proteins, entry_lipids, entry_calories, nutrition_active
+
+    entry_carbs, entry_proteins, entry_lipids, entry_calories, nutrition_active = add_inline_row(parent, [
+        ("Carbohydrates:", 8),
+        ("Proteins:", 8),
+        ("Lipids:", 8),
+        ("Calories:", 8),
+    ])
+    ToolTip(entry_carbs, "Amount of carbohydrates in the item. Use numbers only.")
+    ToolTip(entry_proteins, "Amount of proteins in the item. Use numbers only.")
+    ToolTip(entry_lipids, "Amount of lipids/fats in the item. Use numbers only.")
+    ToolTip(entry_calories, "Total calories provided by the item. Use numbers only.")
+
+
+nutrition_section = Section("Nutrition", build_nutrition)
+
+
+# ===== Cooking, Spoilage and Replacements =====
+def build_cooking(parent):
+    global iscookable_var, perishable_var, minutes_to_cook_entry, minutes_to_burn_entry
+    global entry_days_fresh, entry_days_rotten, replace_cooked_var, entry_replace_cooked
+    global replacerotten_var, entry_replace_rotten, replace_use_var, entry_replace_use
+
+    cook_perishable_frame = tk.Frame(parent, bg=DARK_BG)
+    cook_perishable_frame.pack(pady=2, anchor="center")
+    iscookable_var = tk.BooleanVar(value=False)
+    perishable_var = tk.BooleanVar(value=False)
+
+    def toggle_cookable():
+        state = "normal" if iscookable_var.get() else "disabled"
+        minutes_to_cook_entry.config(state=state, takefocus=iscookable_var.get())
+        minutes_to_burn_entry.config(state=state, takefocus=iscookable_var.get())
         if state == "disabled":
-            for entry in entries:
-                entry.delete(0, tk.END)
+            minutes_to_cook_entry.delete(0, tk.END)
+            minutes_to_burn_entry.delete(0, tk.END)
+
+    cook_check = tk.Checkbutton(
+        cook_perishable_frame,
+        text="Is Cookable:",
+        variable=iscookable_var,
+        command=toggle_cookable,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    cook_check.pack(side="left", padx=(5, 2))
+    ToolTip(cook_check, "If checked, this item can be cooked. Enables the cooking time entries.")
 
-    tk.Checkbutton(row, text="Active", variable=active_var, command=toggle_active,
-                   takefocus=False, bg=DARK_BG, fg=DARK_FG, selectcolor=DARK_BG, activebackground=DARK_BG).pack(side="left", padx=5)
+    minutes_to_cook_entry = tk.Entry(
+        cook_perishable_frame, width=6,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-    return (*entries, active_var)
+    minutes_to_burn_entry = tk.Entry(
+        cook_perishable_frame, width=6,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-entry_carbs, entry_proteins, entry_lipids, entry_calories, nutrition_active = add_inline_row([
-    ("Carbohydrates:", 8),
-    ("Proteins:", 8),
-    ("Lipids:", 8),
-    ("Calories:", 8),
-])
-ToolTip(entry_carbs, "Amount of carbohydrates in the item. Use numbers only.")
-ToolTip(entry_proteins, "Amount of proteins in the item. Use numbers only.")
-ToolTip(entry_lipids, "Amount of lipids/fats in the item. Use numbers only.")
-ToolTip(entry_calories, "Total calories provided by the item. Use numbers only.")
+    tk.Label(
+        cook_perishable_frame,
+        text="Minutes To Cook:",
+        bg=DARK_BG, fg=DARK_FG
+    ).pack(side="left", padx=(2, 2))
+    minutes_to_cook_entry.pack(side="left", padx=(0, 6))
+    ToolTip(minutes_to_cook_entry, "Time in minutes it takes to fully cook this item.")
 
-ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
+    tk.Label(
+        cook_perishable_frame,
+        text="Minutes To Burn:",
+        bg=DARK_BG, fg=DARK_FG
+    ).pack(side="left", padx=(2, 2))
+    minutes_to_burn_entry.pack(side="left", padx=(0, 15))
+    ToolTip(minutes_to_burn_entry, "Time in minutes before the cooked item burns. Must be greater than 'Minutes To Cook'.")
 
-# ===== Cooking and Perishable Fields =====
-cook_perishable_frame = tk.Frame(fields_frame, bg=DARK_BG)
-cook_perishable_frame.pack(pady=2, anchor="center")
-iscookable_var = tk.BooleanVar(value=False)
-perishable_var = tk.BooleanVar(value=False)
-
-def toggle_cookable():
-    state = "normal" if iscookable_var.get() else "disabled"
-    minutes_to_cook_entry.config(state=state, takefocus=iscookable_var.get())
-    minutes_to_burn_entry.config(state=state, takefocus=iscookable_var.get())
-    if state == "disabled":
-        minutes_to_cook_entry.delete(0, tk.END)
-        minutes_to_burn_entry.delete(0, tk.END)
-
-cook_check = tk.Checkbutton(
-    cook_perishable_frame,
-    text="Is Cookable:",
-    variable=iscookable_var,
-    command=toggle_cookable,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-cook_check.pack(side="left", padx=(5, 2))
-ToolTip(cook_check, "If checked, this item can be cooked. Enables the cooking time entries.")
 
-minutes_to_cook_entry = tk.Entry(
-    cook_perishable_frame, width=6,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
 
-minutes_to_burn_entry = tk.Entry(
-    cook_perishable_frame, width=6,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    def toggle_perishable():
+        state = "normal" if perishable_var.get() else "disabled"
+        entry_days_fresh.config(state=state, takefocus=perishable_var.get())
+        entry_days_rotten.config(state=state, takefocus=perishable_var.get())
+        if state == "disabled":
+            entry_days_fresh.delete(0, tk.END)
+            entry_days_rotten.delete(0, tk.END)
+            entry_days_fresh.insert(0, "0")
+            entry_days_rotten.insert(0, "0")
+
+    perishable_check = tk.Checkbutton(
+        cook_perishable_frame,
+        text="Is Perishable:",
+        variable=perishable_var,
+        command=toggle_perishable,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    perishable_check.pack(side="left", padx=(5, 2))
+    ToolTip(perishable_check, "If checked, this item will spoil over time. Enables 'Days Fresh' and 'Days Rotten'.")
 
-tk.Label(
-    cook_perishable_frame,
-    text="Minutes To Cook:",
-    bg=DARK_BG, fg=DARK_FG
-).pack(side="left", padx=(2, 2))
-minutes_to_cook_entry.pack(side="left", padx=(0, 6))
-ToolTip(minutes_to_cook_entry, "Time in minutes it takes to fully cook this item.")
-
-tk.Label(
-    cook_perishable_frame,
-    text="Minutes To Burn:",
-    bg=DARK_BG, fg=DARK_FG
-).pack(side="left", padx=(2, 2))
-minutes_to_burn_entry.pack(side="left", padx=(0, 15))
-ToolTip(minutes_to_burn_entry, "Time in minutes before the cooked item burns. Must be greater than 'Minutes To Cook'.")
-
-
-
-def toggle_perishable():
-    state = "normal" if perishable_var.get() else "disabled"
-    entry_days_fresh.config(state=state, takefocus=perishable_var.get())
-    entry_days_rotten.config(state=state, takefocus=perishable_var.get())
-    if state == "disabled":
-        entry_days_fresh.delete(0, tk.END)
-        entry_days_rotten.delete(0, tk.END)
-        entry_days_fresh.insert(0, "0")
-        entry_days_rotten.insert(0, "0")
-
-perishable_check = tk.Checkbutton(
-    cook_perishable_frame,
-    text="Is Perishable:",
-    variable=perishable_var,
-    command=toggle_perishable,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-perishable_check.pack(side="left", padx=(5, 2))
-ToolTip(perishable_check, "If checked, this item will spoil over time. Enables 'Days Fresh' and 'Days Rotten'.")
 
+    entry_days_fresh = tk.Entry(
+        cook_perishable_frame, width=6,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
+    entry_days_fresh.insert(0, "0")
 
-entry_days_fresh = tk.Entry(
-    cook_perishable_frame, width=6,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
-entry_days_fresh.insert(0, "0")
+    entry_days_rotten = tk.Entry(
+        cook_perishable_frame, width=6,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
+    entry_days_rotten.insert(0, "0")
+
+    tk.Label(
+        cook_perishable_frame,
+        text="Days Fresh:",
+        bg=DARK_BG, fg=DARK_FG
+    ).pack(side="left", padx=(2, 2))
+    entry_days_fresh.pack(side="left", padx=(0, 6))
+    ToolTip(entry_days_fresh, "Number of in-game days this item stays fresh before starting to rot.")
+
+    tk.Label(
+        cook_perishable_frame,
+        text="Days Rotten:",
+        bg=DARK_BG, fg=DARK_FG
+    ).pack(side="left", padx=(2, 2))
+    entry_days_rotten.pack(side="left", padx=(0, 5))
+    ToolTip(entry_days_rotten, "Number of in-game days after which the item is completely rotten and useless.")
+
+    ttk.Separator(parent, orient="horizontal").pack(fill="x", pady=8)
+
+    # ===== Replace Fields =====
+    replace_row = tk.Frame(parent, bg=DARK_BG)
+    replace_row.pack(pady=2, anchor="center")
+
+    # ===== ReplaceOnCooked ======
+    replace_cooked_var = tk.BooleanVar(value=False)
+    entry_replace_cooked = tk.Entry(
+        replace_row, width=28,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-entry_days_rotten = tk.Entry(
-    cook_perishable_frame, width=6,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
-entry_days_rotten.insert(0, "0")
-
-tk.Label(
-    cook_perishable_frame,
-    text="Days Fresh:",
-    bg=DARK_BG, fg=DARK_FG
-).pack(side="left", padx=(2, 2))
-entry_days_fresh.pack(side="left", padx=(0, 6))
-ToolTip(entry_days_fresh, "Number of in-game days this item stays fresh before starting to rot.")
-
-tk.Label(
-    cook_perishable_frame,
-    text="Days Rotten:",
-    bg=DARK_BG, fg=DARK_FG
-).pack(side="left", padx=(2, 2))
-entry_days_rotten.pack(side="left", padx=(0, 5))
-ToolTip(entry_days_rotten, "Number of in-game days after which the item is completely rotten and useless.")
+    def toggle_replace_cooked():
+        if replace_cooked_var.get():
+            iscookable_var.set(True)
+            toggle_cookable()
 
-ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
+        state = "normal" if replace_cooked_var.get() else "disabled"
+        entry_replace_cooked.config(state=state, takefocus=replace_cooked_var.get())
+        if state == "disabled":
+            entry_replace_cooked.delete(0, tk.END)
+
+    replace_cooked_check = tk.Checkbutton(
+        replace_row,
+        text="ReplaceOnCooked:",
+        variable=replace_cooked_var,
+        command=toggle_replace_cooked,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    replace_cooked_check.pack(side="left", padx=(5, 2))
+    ToolTip(replace_cooked_check, "When checked, the item is replaced with this value when cooked.")
+
+    entry_replace_cooked.pack(side="left", padx=(0, 5))
+    ToolTip(entry_replace_cooked, "Internal item name to replace this item with when cooked.")
+
+    # ===== ReplaceOnRotten =====
+    replacerotten_var = tk.BooleanVar(value=False)
+    entry_replace_rotten = tk.Entry(
+        replace_row, width=28,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-# ===== Replace Fields =====
-replace_row = tk.Frame(fields_frame, bg=DARK_BG)
-replace_row.pack(pady=2, anchor="center")
+    def toggle_replace_rotten():
+        if replacerotten_var.get():
+            perishable_var.set(True)
+            toggle_perishable()
 
-# ===== ReplaceOnCooked ======
-replace_cooked_var = tk.BooleanVar(value=False)
-entry_replace_cooked = tk.Entry(
-    replace_row, width=28,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+        state = "normal" if replacerotten_var.get() and perishable_var.get() else "disabled"
+        entry_replace_rotten.config(state=state, takefocus=replacerotten_var.get() and perishable_var.get())
+        if state == "disabled":
+            entry_replace_rotten.delete(0, tk.END)
+
+    replace_check = tk.Checkbutton(
+        replace_row,
+        text="ReplaceOnRotten:",
+        variable=replacerotten_var,
+        command=toggle_replace_rotten,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    replace_check.pack(side="left", padx=(5, 2))
+    ToolTip(replace_check, "When checked, the item is replaced with this entry when it becomes rotten.")
 
-def toggle_replace_cooked():
-    if replace_cooked_var.get():
-        iscookable_var.set(True)
-        toggle_cookable()
-
-    state = "normal" if replace_cooked_var.get() else "disabled"
-    entry_replace_cooked.config(state=state, takefocus=replace_cooked_var.get())
-    if state == "disabled":
-        entry_replace_cooked.delete(0, tk.END)
-
-replace_cooked_check = tk.Checkbutton(
-    replace_row,
-    text="ReplaceOnCooked:",
-    variable=replace_cooked_var,
-    command=toggle_replace_cooked,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-replace_cooked_check.pack(side="left", padx=(5, 2))
-ToolTip(replace_cooked_check, "When checked, the item is replaced with this value when cooked.")
-
-entry_replace_cooked.pack(side="left", padx=(0, 5))
-ToolTip(entry_replace_cooked, "Internal item name to replace this item with when cooked.")
-
-# ===== ReplaceOnRotten =====
-replacerotten_var = tk.BooleanVar(value=False)
-entry_replace_rotten = tk.Entry(
-    replace_row, width=28,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    entry_replace_rotten.pack(side="left", padx=(0, 20))
+    ToolTip(entry_replace_rotten, "Internal item name to replace this item with when it rots.")
 
-def toggle_replace_rotten():
-    if replacerotten_var.get():
-        perishable_var.set(True)
-        toggle_perishable()
-
-    state = "normal" if replacerotten_var.get() and perishable_var.get() else "disabled"
-    entry_replace_rotten.config(state=state, takefocus=replacerotten_var.get() and perishable_var.get())
-    if state == "disabled":
-        entry_replace_rotten.delete(0, tk.END)
-
-replace_check = tk.Checkbutton(
-    replace_row,
-    text="ReplaceOnRotten:",
-    variable=replacerotten_var,
-    command=toggle_replace_rotten,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-replace_check.pack(side="left", padx=(5, 2))
-ToolTip(replace_check, "When checked, the item is replaced with this entry when it becomes rotten.")
+    # ===== ReplaceOnUse =====
+    use_sound_row = tk.Frame(parent, bg=DARK_BG)
+    use_sound_row.pack(pady=2, anchor="center")
 
-entry_replace_rotten.pack(side="left", padx=(0, 20))
-ToolTip(entry_replace_rotten, "Internal item name to replace this item with when it rots.")
+    replace_use_var = tk.BooleanVar(value=False)
+    entry_replace_use = tk.Entry(
+        use_sound_row, width=26,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-# ===== ReplaceOnUse =====
-use_sound_row = tk.Frame(fields_frame, bg=DARK_BG)
-use_sound_row.pack(pady=2, anchor="center")
+    def toggle_replace_use():
+        state = "normal" if replace_use_var.get() else "disabled"
+        entry_replace_use.config(state=state, takefocus=replace_use_var.get())
+        if state == "disabled":
+            entry_replace_use.delete(0, tk.END)
+
+    replace_use_check = tk.Checkbutton(
+        use_sound_row,
+        text="ReplaceOnUse:",
+        variable=replace_use_var,
+        command=toggle_replace_use,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    replace_use_check.pack(side="left", padx=(5, 2))
+    ToolTip(replace_use_check, "When checked, the item is replaced with this value when used.")
 
-replace_use_var = tk.BooleanVar(value=False)
-entry_replace_use = tk.Entry(
-    use_sound_row, width=26,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    entry_replace_use.pack(side="left", padx=(0, 20))
+    ToolTip(entry_replace_use, "Internal item name to replace this item with when used.")
 
-def toggle_replace_use():
-    state = "normal" if replace_use_var.get() else "disabled"
-    entry_replace_use.config(state=state, takefocus=replace_use_var.get())
-    if state == "disabled":
-        entry_replace_use.delete(0, tk.END)
-
-replace_use_check = tk.Checkbutton(
-    use_sound_row,
-    text="ReplaceOnUse:",
-    variable=replace_use_var,
-    command=toggle_replace_use,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-replace_use_check.pack(side="left", padx=(5, 2))
-ToolTip(replace_use_check, "When checked, the item is replaced with this value when used.")
 
-entry_replace_use.pack(side="left", padx=(0, 20))
-ToolTip(entry_replace_use, "Internal item name to replace this item with when used.")
+cooking_section = Section("Cooking, Spoilage and Replacements", build_cooking)
 
-ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
 
-# ===== Tags Field =====
-tags_frame = tk.Frame(fields_frame, bg=DARK_BG)
-tags_frame.pack(pady=4, fill="x")
+# ===== Tags, Tooltip and Lua Hooks =====
+def build_script_fields(parent):
+    global tags_var, entry_tags, tooltip_var, entry_tooltip, oneat_var, entry_oneat
+    global customcontextmenu_var, entry_customcontextmenu
 
-tags_var = tk.BooleanVar(value=False)
+    # ===== Tags Field =====
+    tags_frame = tk.Frame(parent, bg=DARK_BG)
+    tags_frame.pack(pady=4, fill="x")
 
-entry_tags = tk.Entry(
-    tags_frame, width=40,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    tags_var = tk.BooleanVar(value=False)
 
-def toggle_tags():
-    state = "normal" if tags_var.get() else "disabled"
-    entry_tags.config(state=state, takefocus=tags_var.get())
-    if state == "disabled":
-        entry_tags.delete(0, tk.END)
-
-tags_cb = tk.Checkbutton(
-    tags_frame,
-    text="Add Tags:",
-    variable=tags_var,
-    command=toggle_tags,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-tags_cb.pack(side="left", padx=5)
-ToolTip(tags_cb, "Enable this to add custom tags to the item. Tags can affect gameplay or mods.")
+    entry_tags = tk.Entry(
+        tags_frame, width=40,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-entry_tags.pack(side="left", padx=5, fill="x", expand=True)
-ToolTip(entry_tags, "Separated list of tags. Example: base:herbaltea;base:commonmallow")
+    def toggle_tags():
+        state = "normal" if tags_var.get() else "disabled"
+        entry_tags.config(state=state, takefocus=tags_var.get())
+        if state == "disabled":
+            entry_tags.delete(0, tk.END)
+
+    tags_cb = tk.Checkbutton(
+        tags_frame,
+        text="Add Tags:",
+        variable=tags_var,
+        command=toggle_tags,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    tags_cb.pack(side="left", padx=5)
+    ToolTip(tags_cb, "Enable this to add custom tags to the item. Tags can affect gameplay or mods.")
 
+    entry_tags.pack(side="left", padx=5, fill="x", expand=True)
+    ToolTip(entry_tags, "Separated list of tags. Example: base:herbaltea;base:commonmallow")
 
-# ===== Tooltip Field =====
-tooltip_frame = tk.Frame(fields_frame, bg=DARK_BG)
-tooltip_frame.pack(pady=4, fill="x")
 
-tooltip_var = tk.BooleanVar(value=False)
+    # ===== Tooltip Field =====
+    tooltip_frame = tk.Frame(parent, bg=DARK_BG)
+    tooltip_frame.pack(pady=4, fill="x")
 
-entry_tooltip = tk.Entry(
-    tooltip_frame, width=40,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    tooltip_var = tk.BooleanVar(value=False)
 
-def toggle_tooltip():
-    state = "normal" if tooltip_var.get() else "disabled"
-    entry_tooltip.config(state=state, takefocus=tooltip_var.get())
-    if state == "disabled":
-        entry_tooltip.delete(0, tk.END)
-
-tooltip_cb = tk.Checkbutton(
-    tooltip_frame,
-    text="Add Tooltip:",
-    variable=tooltip_var,
-    command=toggle_tooltip,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-tooltip_cb.pack(side="left", padx=5)
-ToolTip(tooltip_cb, "Enable this to add a tooltip for the item. Tooltips appear in-game when hovering.")
+    entry_tooltip = tk.Entry(
+        tooltip_frame, width=40,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
+
+    def toggle_tooltip():
+        state = "normal" if tooltip_var.get() else "disabled"
+        entry_tooltip.config(state=state, takefocus=tooltip_var.get())
+        if state == "disabled":
+            entry_tooltip.delete(0, tk.END)
+
+    tooltip_cb = tk.Checkbutton(
+        tooltip_frame,
+        text="Add Tooltip:",
+        variable=tooltip_var,
+        command=toggle_tooltip,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    tooltip_cb.pack(side="left", padx=5)
+    ToolTip(tooltip_cb, "Enable this to add a tooltip for the item. Tooltips appear in-game when hovering.")
 
-entry_tooltip.pack(side="left", padx=5, fill="x", expand=True)
-ToolTip(entry_tooltip, 'Example: "Tooltip_Mallow" located in Translation Files (ToolTip_EN)')
+    entry_tooltip.pack(side="left", padx=5, fill="x", expand=True)
+    ToolTip(entry_tooltip, 'Example: "Tooltip_Mallow" located in Translation Files (ToolTip_EN)')
 
 
-# ===== OnEat Field =====
-oneat_frame = tk.Frame(fields_frame, bg=DARK_BG)
-oneat_frame.pack(pady=4, fill="x")
+    # ===== OnEat Field =====
+    oneat_frame = tk.Frame(parent, bg=DARK_BG)
+    oneat_frame.pack(pady=4, fill="x")
 
-oneat_var = tk.BooleanVar(value=False)
+    oneat_var = tk.BooleanVar(value=False)
 
-entry_oneat = tk.Entry(
-    oneat_frame, width=40,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    entry_oneat = tk.Entry(
+        oneat_frame, width=40,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-def toggle_oneat():
-    state = "normal" if oneat_var.get() else "disabled"
-    entry_oneat.config(state=state, takefocus=oneat_var.get())
-    if state == "disabled":
-        entry_oneat.delete(0, tk.END)
-
-oneat_cb = tk.Checkbutton(
-    oneat_frame,
-    text="Add OnEat:",
-    variable=oneat_var,
-    command=toggle_oneat,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-oneat_cb.pack(side="left", padx=5)
-ToolTip(oneat_cb, "Enable this to add a custom OnEat script for this item. Requires a Lua function.")
+    def toggle_oneat():
+        state = "normal" if oneat_var.get() else "disabled"
+        entry_oneat.config(state=state, takefocus=oneat_var.get())
+        if state == "disabled":
+            entry_oneat.delete(0, tk.END)
+
+    oneat_cb = tk.Checkbutton(
+        oneat_frame,
+        text="Add OnEat:",
+        variable=oneat_var,
+        command=toggle_oneat,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    oneat_cb.pack(side="left", padx=5)
+    ToolTip(oneat_cb, "Enable this to add a custom OnEat script for this item. Requires a Lua function.")
 
-entry_oneat.pack(side="left", padx=5, fill="x", expand=True)
-ToolTip(entry_oneat, 'Enter the Lua function name to run on consumption. Example: "RecipeCodeOnEat_MyItem".')
+    entry_oneat.pack(side="left", padx=5, fill="x", expand=True)
+    ToolTip(entry_oneat, 'Enter the Lua function name to run on consumption. Example: "RecipeCodeOnEat_MyItem".')
 
 
-# ===== CustomContextMenu Field =====
-customcontextmenu_frame = tk.Frame(fields_frame, bg=DARK_BG)
-customcontextmenu_frame.pack(pady=4, fill="x")
+    # ===== CustomContextMenu Field =====
+    customcontextmenu_frame = tk.Frame(parent, bg=DARK_BG)
+    customcontextmenu_frame.pack(pady=4, fill="x")
 
-customcontextmenu_var = tk.BooleanVar(value=False)
+    customcontextmenu_var = tk.BooleanVar(value=False)
 
-entry_customcontextmenu = tk.Entry(
-    customcontextmenu_frame, width=40,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    entry_customcontextmenu = tk.Entry(
+        customcontextmenu_frame, width=40,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-def toggle_customcontextmenu():
-    state = "normal" if customcontextmenu_var.get() else "disabled"
-    entry_customcontextmenu.config(state=state, takefocus=customcontextmenu_var.get())
-    if state == "disabled":
-        entry_customcontextmenu.delete(0, tk.END)
-
-customcontextmenu_cb = tk.Checkbutton(
-    customcontextmenu_frame,
-    text="Add CustomContextMenu:",
-    variable=customcontextmenu_var,
-    command=toggle_customcontextmenu,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-customcontextmenu_cb.pack(side="left", padx=5)
-ToolTip(customcontextmenu_cb, "Enable this to add a custom context menu for this item in-game.")
+    def toggle_customcontextmenu():
+        state = "normal" if customcontextmenu_var.get() else "disabled"
+        entry_customcontextmenu.config(state=state, takefocus=customcontextmenu_var.get())
+        if state == "disabled":
+            entry_customcontextmenu.delete(0, tk.END)
+
+    customcontextmenu_cb = tk.Checkbutton(
+        customcontextmenu_frame,
+        text="Add CustomContextMenu:",
+        variable=customcontextmenu_var,
+        command=toggle_customcontextmenu,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    customcontextmenu_cb.pack(side="left", padx=5)
+    ToolTip(customcontextmenu_cb, "Enable this to add a custom context menu for this item in-game.")
+
+    entry_customcontextmenu.pack(side="left", padx=5, fill="x", expand=True)
+    ToolTip(entry_customcontextmenu, 'Enter the Lua function or menu name. Example: "CustomContextMenu_MyItem".')
 
-entry_customcontextmenu.pack(side="left", padx=5, fill="x", expand=True)
-ToolTip(entry_customcontextmenu, 'Enter the Lua function or menu name. Example: "CustomContextMenu_MyItem".')
+
+script_fields_section = Section("Tags, Tooltip and Lua Hooks", build_script_fields)
 
 
 # ===== Additional Flags =====
@@ -814,291 +1021,310 @@ def toggle_button(parent, text, var, width):
 
     return btn
 
-ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
+
+# Toggle Button Factory with Tooltips
+def add_toggle_button(frame, text, var, size, tooltip_text):
+    btn = toggle_button(frame, text, var, size)
+    btn.var = var 
+    toggle_buttons.append(btn)
+    ToolTip(frame.winfo_children()[-1], tooltip_text)
+    return btn
 
 
 # ===== Evolved Recipes =====
-evolved_frame = tk.Frame(fields_frame, bg=DARK_BG)
-evolved_frame.pack(pady=4, fill="x")
+def build_evolved(parent):
+    global evolved_var, evolved_name_entry, sweet_var, salty_var, evolved_cbs_buttons
 
-evolved_var = tk.BooleanVar(value=False)
+    evolved_frame = tk.Frame(parent, bg=DARK_BG)
+    evolved_frame.pack(pady=4, fill="x")
 
-tk.Label(evolved_frame, text="Evolved Recipe Name:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=2)
-evolved_name_entry = tk.Entry(
-    evolved_frame, bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", width=25, takefocus=False
-)
-evolved_name_entry.pack(side="left", padx=0, fill="x", expand=True)
-ToolTip(evolved_name_entry, "Internal name for the evolved recipe. Example: 'ChocolateCakeEvolved'.")
+    evolved_var = tk.BooleanVar(value=False)
 
-# Sweet and Salty frames
-sweet_frame = tk.Frame(fields_frame, bg=DARK_BG)
-sweet_frame.pack(pady=3, fill="x")
-salty_frame = tk.Frame(fields_frame, bg=DARK_BG)
-salty_frame.pack(pady=3, fill="x")
+    tk.Label(evolved_frame, text="Evolved Recipe Name:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=2)
+    evolved_name_entry = tk.Entry(
+        evolved_frame, bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", width=25, takefocus=False
+    )
+    evolved_name_entry.pack(side="left", padx=0, fill="x", expand=True)
+    ToolTip(evolved_name_entry, "Internal name for the evolved recipe. Example: 'ChocolateCakeEvolved'.")
+
+    # Sweet and Salty frames
+    sweet_frame = tk.Frame(parent, bg=DARK_BG)
+    sweet_frame.pack(pady=3, fill="x")
+    salty_frame = tk.Frame(parent, bg=DARK_BG)
+    salty_frame.pack(pady=3, fill="x")
+
+    sweet_list = ["Pancakes","Muffin","ConeIcecream","Cake","PieSweet","Oatmeal","Toast"]
+    salty_list = ["Sandwich","Stir fry","Pasta","Taco","Burrito","Salad","Soup","Stew","Bread"]
+
+    sweet_var = tk.BooleanVar(value=False)
+    salty_var = tk.BooleanVar(value=False)
+
+    # "Mark All" toggles
+    def toggle_all_sweet():
+        if evolved_var.get():
+            for btn in evolved_cbs_buttons:
+                if btn.cget("text") in sweet_list:
+                    btn.var.set(sweet_var.get())
+                    btn.config(bg=ACTIVE_GREEN if sweet_var.get() else INACTIVE_BG)
+
+    def toggle_all_salty():
+        if evolved_var.get():
+            for btn in evolved_cbs_buttons:
+                if btn.cget("text") in salty_list:
+                    btn.var.set(salty_var.get())
+                    btn.config(bg=ACTIVE_GREEN if salty_var.get() else INACTIVE_BG)
+
+    sweet_toggle_cb = tk.Checkbutton(
+        sweet_frame, text="Mark All Sweet", variable=sweet_var, command=toggle_all_sweet,
+        bg=DARK_BG, fg=DARK_FG, selectcolor=DARK_BG, activebackground=DARK_BG, state="disabled",
+        takefocus=False
+    )
+    sweet_toggle_cb.pack(side="left", padx=5)
+    ToolTip(sweet_toggle_cb, "Check to mark all sweet recipes in this evolved recipe.")
 
-sweet_list = ["Pancakes","Muffin","ConeIcecream","Cake","PieSweet","Oatmeal","Toast"]
-salty_list = ["Sandwich","Stir fry","Pasta","Taco","Burrito","Salad","Soup","Stew","Bread"]
+    salty_toggle_cb = tk.Checkbutton(
+        salty_frame, text="Mark All Salty", variable=salty_var, command=toggle_all_salty,
+        bg=DARK_BG, fg=DARK_FG, selectcolor=DARK_BG, activebackground=DARK_BG, state="disabled",
+        takefocus=False
+    )
+    salty_toggle_cb.pack(side="left", padx=5)
+    ToolTip(salty_toggle_cb, "Check to mark all salty recipes in this evolved recipe.")
+
+    evolved_cbs_buttons = []
+    for lst, frame in [(sweet_list, sweet_frame), (salty_list, salty_frame)]:
+        for item_name in lst:
+            var = tk.BooleanVar(value=False)
+            btn = toggle_button(frame, item_name, var, width=max(len(item_name)//1 + 2, 8))
+            btn.var = var
+            btn.config(state="disabled", takefocus=False)
+            ToolTip(btn, f"Include {item_name} in this evolved recipe.")
+            evolved_cbs_buttons.append(btn)
+
+    def toggle_evolved():
+        state = "normal" if evolved_var.get() else "disabled"
+        evolved_name_entry.config(state=state, takefocus=evolved_var.get())
+        for btn in evolved_cbs_buttons:
+            btn.config(state=state)
+        sweet_toggle_cb.config(state=state)
+        salty_toggle_cb.config(state=state)
+
+    evolved_cb = tk.Checkbutton(
+        evolved_frame,
+        text="EvolvedRecipe:",
+        variable=evolved_var,
+        command=toggle_evolved,
+        bg=DARK_BG,
+        fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
+    evolved_cb.pack(side="left", padx=5)
+    ToolTip(evolved_cb, "Enable to allow this item to evolve into another recipe when crafted.")
 
-sweet_var = tk.BooleanVar(value=False)
-salty_var = tk.BooleanVar(value=False)
 
-# "Mark All" toggles
-def toggle_all_sweet():
-    if evolved_var.get():
-        for btn in evolved_cbs_buttons:
-            if btn.cget("text") in sweet_list:
-                btn.var.set(sweet_var.get())
-                btn.config(bg=ACTIVE_GREEN if sweet_var.get() else INACTIVE_BG)
+evolved_section = Section("Evolved Recipes", build_evolved)
 
-def toggle_all_salty():
-    if evolved_var.get():
-        for btn in evolved_cbs_buttons:
-            if btn.cget("text") in salty_list:
-                btn.var.set(salty_var.get())
-                btn.config(bg=ACTIVE_GREEN if salty_var.get() else INACTIVE_BG)
 
-sweet_toggle_cb = tk.Checkbutton(
-    sweet_frame, text="Mark All Sweet", variable=sweet_var, command=toggle_all_sweet,
-    bg=DARK_BG, fg=DARK_FG, selectcolor=DARK_BG, activebackground=DARK_BG, state="disabled",
-    takefocus=False
-)
-sweet_toggle_cb.pack(side="left", padx=5)
-ToolTip(sweet_toggle_cb, "Check to mark all sweet recipes in this evolved recipe.")
+# ===== Flags =====
+def build_flags(parent):
+    # ===== Flags Row 1 =====
+    flags_row = tk.Frame(parent, bg=DARK_BG)
+    flags_row.pack(pady=2, anchor="center")
 
-salty_toggle_cb = tk.Checkbutton(
-    salty_frame, text="Mark All Salty", variable=salty_var, command=toggle_all_salty,
-    bg=DARK_BG, fg=DARK_FG, selectcolor=DARK_BG, activebackground=DARK_BG, state="disabled",
-    takefocus=False
-)
-salty_toggle_cb.pack(side="left", padx=5)
-ToolTip(salty_toggle_cb, "Check to mark all salty recipes in this evolved recipe.")
-
-evolved_cbs_buttons = []
-for lst, frame in [(sweet_list, sweet_frame), (salty_list, salty_frame)]:
-    for item_name in lst:
-        var = tk.BooleanVar(value=False)
-        btn = toggle_button(frame, item_name, var, width=max(len(item_name)//1 + 2, 8))
-        btn.var = var
-        btn.config(state="disabled", takefocus=False)
-        ToolTip(btn, f"Include {item_name} in this evolved recipe.")
-        evolved_cbs_buttons.append(btn)
-
-def toggle_evolved():
-    state = "normal" if evolved_var.get() else "disabled"
-    evolved_name_entry.config(state=state, takefocus=evolved_var.get())
-    for btn in evolved_cbs_buttons:
-        btn.config(state=state)
-    sweet_toggle_cb.config(state=state)
-    salty_toggle_cb.config(state=state)
-
-evolved_cb = tk.Checkbutton(
-    evolved_frame,
-    text="EvolvedRecipe:",
-    variable=evolved_var,
-    command=toggle_evolved,
-    bg=DARK_BG,
-    fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
-evolved_cb.pack(side="left", padx=5)
-ToolTip(evolved_cb, "Enable to allow this item to evolve into another recipe when crafted.")
+    add_toggle_button(flags_row, "It's a Canned Food", cannedfood_var, 15, "Item is canned food.")
+    add_toggle_button(flags_row, "It's a Spice", spice_var, 8, "Marks item as a spice ingredient.")
+    add_toggle_button(flags_row, "It's Packaged", packaged_var, 11, "Item is packaged.")
+    add_toggle_button(flags_row, "It's a Medical Item", medical_var, 14, "Item is considered a medical item.")
 
-ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
+    # ===== Flags Row 2 =====
+    flags_row2 = tk.Frame(parent, bg=DARK_BG)
+    flags_row2.pack(pady=2, anchor="center")
 
-# Toggle Button Factory with Tooltips
-def add_toggle_button(frame, text, var, size, tooltip_text):
-    btn = toggle_button(frame, text, var, size)
-    btn.var = var 
-    toggle_buttons.append(btn)
-    ToolTip(frame.winfo_children()[-1], tooltip_text)
-    return btn
+    add_toggle_button(flags_row2, "Can't be Eaten", canteat_var, 12, "Prevents the item from being eaten.")
+    add_toggle_button(flags_row2, "Can't be Frozen", cantbefrozen_var, 13, "Item cannot be frozen.")
+    add_toggle_button(flags_row2, "Can be used as Fishing Lure", fishing_var, 24, "Item can be used as a fishing lure.")
 
-# ===== Flags Row 1 =====
-flags_row = tk.Frame(fields_frame, bg=DARK_BG)
-flags_row.pack(pady=2, anchor="center")
+    # ===== Flags Row 3 =====
+    flags_row3 = tk.Frame(parent, bg=DARK_BG)
+    flags_row3.pack(pady=2, anchor="center")
+    add_toggle_button(flags_row3, "It's Dangerous Raw", dangerous_raw_var, 16, "Eating raw can be dangerous.")
+    add_toggle_button(flags_row3, "It's Bad Microwaved", badmicrowave_var, 18, "Item quality decreases if microwaved.")
+    add_toggle_button(flags_row3, "It's Bad Cold", badcold_var, 12, "Item is unpleasant when cold.")
+    add_toggle_button(flags_row3, "It's Good Hot", goodhot_var, 12, "Item is pleasant when hot.")
 
-add_toggle_button(flags_row, "It's a Canned Food", cannedfood_var, 15, "Item is canned food.")
-add_toggle_button(flags_row, "It's a Spice", spice_var, 8, "Marks item as a spice ingredient.")
-add_toggle_button(flags_row, "It's Packaged", packaged_var, 11, "Item is packaged.")
-add_toggle_button(flags_row, "It's a Medical Item", medical_var, 14, "Item is considered a medical item.")
+    # ===== Flags Row 4 =====
+    flags_row4 = tk.Frame(parent, bg=DARK_BG)
+    flags_row4.pack(pady=2, anchor="center")
+    add_toggle_button(flags_row4, "Removes Unhappiness when Cooked", remove_unhappy_cooked_var, 33, "Cooking removes unhappiness effect.")
+    add_toggle_button(flags_row4, "Removes Negative Effects when Cooked", remove_negative_effects_cooked_var, 35, "Cooking removes all negative effects.")
 
-# ===== Flags Row 2 =====
-flags_row2 = tk.Frame(fields_frame, bg=DARK_BG)
-flags_row2.pack(pady=2, anchor="center")
 
-add_toggle_button(flags_row2, "Can't be Eaten", canteat_var, 12, "Prevents the item from being eaten.")
-add_toggle_button(flags_row2, "Can't be Frozen", cantbefrozen_var, 13, "Item cannot be frozen.")
-add_toggle_button(flags_row2, "Can be used as Fishing Lure", fishing_var, 24, "Item can be used as a fishing lure.")
+flags_section = Section("Flags", build_flags)
 
-# ===== Flags Row 3 =====
-flags_row3 = tk.Frame(fields_frame, bg=DARK_BG)
-flags_row3.pack(pady=2, anchor="center")
-add_toggle_button(flags_row3, "It's Dangerous Raw", dangerous_raw_var, 16, "Eating raw can be dangerous.")
-add_toggle_button(flags_row3, "It's Bad Microwaved", badmicrowave_var, 18, "Item quality decreases if microwaved.")
-add_toggle_button(flags_row3, "It's Bad Cold", badcold_var, 12, "Item is unpleasant when cold.")
-add_toggle_button(flags_row3, "It's Good Hot", goodhot_var, 12, "Item is pleasant when hot.")
 
-# ===== Flags Row 4 =====
-flags_row4 = tk.Frame(fields_frame, bg=DARK_BG)
-flags_row4.pack(pady=2, anchor="center")
-add_toggle_button(flags_row4, "Removes Unhappiness when Cooked", remove_unhappy_cooked_var, 33, "Cooking removes unhappiness effect.")
-add_toggle_button(flags_row4, "Removes Negative Effects when Cooked", remove_negative_effects_cooked_var, 35, "Cooking removes all negative effects.")
+# ===== Distribution and Foraging =====
+def build_spawning(parent):
+    global distribution_var, entry_distribution_lists, entry_spawning_chance, foraging_var
+    global entry_foraging_category, entry_foraging_min, entry_foraging_max, entry_foraging_skill
 
+    # ===== Distribution File Checkbox + Chance =====
+    distribution_frame = tk.Frame(parent, bg=DARK_BG)
+    distribution_frame.pack(pady=4, fill="x")
 
-ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
+    distribution_var = tk.BooleanVar(value=False)
 
-# ===== Distribution File Checkbox + Chance =====
-distribution_frame = tk.Frame(fields_frame, bg=DARK_BG)
-distribution_frame.pack(pady=4, fill="x")
+    # Label for Item Spawning Chance
+    label_spawning_chance = tk.Label(
+        distribution_frame, text="Item Spawning Chance:", bg=DARK_BG, fg=DARK_FG
+    )
 
-distribution_var = tk.BooleanVar(value=False)
+    # Entry for distribution lists
+    entry_distribution_lists = tk.Entry(
+        distribution_frame, width=40,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-# Label for Item Spawning Chance
-label_spawning_chance = tk.Label(
-    distribution_frame, text="Item Spawning Chance:", bg=DARK_BG, fg=DARK_FG
-)
+    # Entry for spawning chance
+    entry_spawning_chance = tk.Entry(
+        distribution_frame, width=6,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
+    entry_spawning_chance.insert(0, "1")  # default value
 
-# Entry for distribution lists
-entry_distribution_lists = tk.Entry(
-    distribution_frame, width=40,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    def toggle_distribution():
+        state = "normal" if distribution_var.get() else "disabled"
+        entry_distribution_lists.config(state=state, takefocus=distribution_var.get())
+        entry_spawning_chance.config(state=state, takefocus=distribution_var.get())
+        if state == "disabled":
+            entry_distribution_lists.delete(0, tk.END)
+            entry_spawning_chance.delete(0, tk.END)
+            entry_spawning_chance.insert(0, "1")  # reset default
+
+    distribution_cb = tk.Checkbutton(
+        distribution_frame,
+        text="Create Distribution File:",
+        variable=distribution_var,
+        command=toggle_distribution,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
 
-# Entry for spawning chance
-entry_spawning_chance = tk.Entry(
-    distribution_frame, width=6,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
-entry_spawning_chance.insert(0, "1")  # default value
-
-def toggle_distribution():
-    state = "normal" if distribution_var.get() else "disabled"
-    entry_distribution_lists.config(state=state, takefocus=distribution_var.get())
-    entry_spawning_chance.config(state=state, takefocus=distribution_var.get())
-    if state == "disabled":
-        entry_distribution_lists.delete(0, tk.END)
-        entry_spawning_chance.delete(0, tk.END)
-        entry_spawning_chance.insert(0, "1")  # reset default
-
-distribution_cb = tk.Checkbutton(
-    distribution_frame,
-    text="Create Distribution File:",
-    variable=distribution_var,
-    command=toggle_distribution,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
+    # Pack widgets
+    distribution_cb.pack(side="left", padx=5)
+    entry_distribution_lists.pack(side="left", padx=5, fill="x", expand=True)
 
-# Pack widgets
-distribution_cb.pack(side="left", padx=5)
-entry_distribution_lists.pack(side="left", padx=5, fill="x", expand=True)
+    # Spawning chance label and entry next to each other
+    label_spawning_chance.pack(side="left", padx=(10,2))
+    entry_spawning_chance.pack(side="left", padx=2)
 
-# Spawning chance label and entry next to each other
-label_spawning_chance.pack(side="left", padx=(10,2))
-entry_spawning_chance.pack(side="left", padx=2)
+    ToolTip(distribution_cb, "Check to generate a Distribution file. Enter distribution list names separated by commas.")
+    ToolTip(entry_distribution_lists, "Example: SchoolLockers,CafeteriaDrinks,ClassroomDesk,FridgeOffice,FridgeSoda")
+    Autocomplete(entry_distribution_lists, "distribution_lists", multiple=True)
+    ToolTip(entry_spawning_chance, "Enter a value for ItemSpawningChance (default is 1)")
 
-ToolTip(distribution_cb, "Check to generate a Distribution file. Enter distribution list names separated by commas.")
-ToolTip(entry_distribution_lists, "Example: SchoolLockers,CafeteriaDrinks,ClassroomDesk,FridgeOffice,FridgeSoda")
-ToolTip(entry_spawning_chance, "Enter a value for ItemSpawningChance (default is 1)")
+    # ===== Foraging Distribution Checkbox + Settings =====
+    foraging_frame = tk.Frame(parent, bg=DARK_BG)
+    foraging_frame.pack(pady=4, fill="x")
 
-# ===== Foraging Distribution Checkbox + Settings =====
-foraging_frame = tk.Frame(fields_frame, bg=DARK_BG)
-foraging_frame.pack(pady=4, fill="x")
+    foraging_var = tk.BooleanVar(value=False)
 
-foraging_var = tk.BooleanVar(value=False)
+    # Entries
+    entry_foraging_category = tk.Entry(
+        foraging_frame, width=22,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
 
-# Entries
-entry_foraging_category = tk.Entry(
-    foraging_frame, width=22,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
+    entry_foraging_min = tk.Entry(
+        foraging_frame, width=4,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
+    entry_foraging_min.insert(0, "1")
 
-entry_foraging_min = tk.Entry(
-    foraging_frame, width=4,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
-entry_foraging_min.insert(0, "1")
+    entry_foraging_max = tk.Entry(
+        foraging_frame, width=4,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
+    entry_foraging_max.insert(0, "1")
 
-entry_foraging_max = tk.Entry(
-    foraging_frame, width=4,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
-entry_foraging_max.insert(0, "1")
+    entry_foraging_skill = tk.Entry(
+        foraging_frame, width=4,
+        bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
+        state="disabled", takefocus=False
+    )
+    entry_foraging_skill.insert(0, "0")
 
-entry_foraging_skill = tk.Entry(
-    foraging_frame, width=4,
-    bg=DARK_BG, fg=DARK_FG, insertbackground=DARK_FG,
-    state="disabled", takefocus=False
-)
-entry_foraging_skill.insert(0, "0")
 
+    def toggle_foraging():
+        state = "normal" if foraging_var.get() else "disabled"
+
+        for entry in (
+            entry_foraging_category,
+            entry_foraging_min,
+            entry_foraging_max,
+            entry_foraging_skill
+        ):
+            entry.config(state=state, takefocus=foraging_var.get())
 
-def toggle_foraging():
-    state = "normal" if foraging_var.get() else "disabled"
+        if state == "disabled":
+            entry_foraging_category.delete(0, tk.END)
 
-    for entry in (
-        entry_foraging_category,
-        entry_foraging_min,
-        entry_foraging_max,
-        entry_foraging_skill
-    ):
-        entry.config(state=state, takefocus=foraging_var.get())
+            entry_foraging_min.delete(0, tk.END)
+            entry_foraging_min.insert(0, "1")
 
-    if state == "disabled":
-        entry_foraging_category.delete(0, tk.END)
+            entry_foraging_max.delete(0, tk.END)
+            entry_foraging_max.insert(0, "1")
 
-        entry_foraging_min.delete(0, tk.END)
-        entry_foraging_min.insert(0, "1")
+            entry_foraging_skill.delete(0, tk.END)
+            entry_foraging_skill.insert(0, "0")
 
-        entry_foraging_max.delete(0, tk.END)
-        entry_foraging_max.insert(0, "1")
 
-        entry_foraging_skill.delete(0, tk.END)
-        entry_foraging_skill.insert(0, "0")
+    foraging_cb = tk.Checkbutton(
+        foraging_frame,
+        text="Add to Foraging List:",
+        variable=foraging_var,
+        command=toggle_foraging,
+        bg=DARK_BG, fg=DARK_FG,
+        selectcolor=DARK_BG,
+        activebackground=DARK_BG,
+        takefocus=False
+    )
 
+    # Pack layout
+    foraging_cb.pack(side="left", padx=5)
 
-foraging_cb = tk.Checkbutton(
-    foraging_frame,
-    text="Add to Foraging List:",
-    variable=foraging_var,
-    command=toggle_foraging,
-    bg=DARK_BG, fg=DARK_FG,
-    selectcolor=DARK_BG,
-    activebackground=DARK_BG,
-    takefocus=False
-)
+    tk.Label(foraging_frame, text="Forage Category:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(6,2))
+    entry_foraging_category.pack(side="left", padx=2)
+
+    tk.Label(foraging_frame, text="Min:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(8,2))
+    entry_foraging_min.pack(side="left", padx=2)
+
+    tk.Label(foraging_frame, text="Max:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(8,2))
+    entry_foraging_max.pack(side="left", padx=2)
 
-# Pack layout
-foraging_cb.pack(side="left", padx=5)
+    tk.Label(foraging_frame, text="Skill Level Required:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(8,2))
+    entry_foraging_skill.pack(side="left", padx=2)
 
-tk.Label(foraging_frame, text="Forage Category:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(6,2))
-entry_foraging_category.pack(side="left", padx=2)
+    # Tooltips
+    ToolTip(foraging_cb, "Check to add this item to the Foraging (Scavenge) system.")
+    ToolTip(entry_foraging_category, "Example: ForestGoods,MedicinalPlants,Trash,Insects")
+    Autocomplete(entry_foraging_category, "forage_categories")
+    ToolTip(entry_foraging_min, "Minimum amount found per forage roll.")
+    ToolTip(entry_foraging_max, "Maximum amount found per forage roll.")
+    ToolTip(entry_foraging_skill, "Required Foraging skill level (0 = no requirement).")
 
-tk.Label(foraging_frame, text="Min:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(8,2))
-entry_foraging_min.pack(side="left", padx=2)
 
-tk.Label(foraging_frame, text="Max:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(8,2))
-entry_foraging_max.pack(side="left", padx=2)
+spawning_section = Section("Distribution and Foraging", build_spawning)
 
-tk.Label(foraging_frame, text="Skill Level Required:", bg=DARK_BG, fg=DARK_FG).pack(side="left", padx=(8,2))
-entry_foraging_skill.pack(side="left", padx=2)
 
-# Tooltips
-ToolTip(foraging_cb, "Check to add this item to the Foraging (Scavenge) system.")
-ToolTip(entry_foraging_category, "Example: ForestGoods,MedicinalPlants,Trash,Insects")
-ToolTip(entry_foraging_min, "Minimum amount found per forage roll.")
-ToolTip(entry_foraging_max, "Maximum amount found per forage roll.")
-ToolTip(entry_foraging_skill, "Required Foraging skill level (0 = no requirement).")
 ttk.Separator(fields_frame, orient="horizontal").pack(fill="x", pady=8)
 
 
@@ -1107,402 +1333,245 @@ buttons_frame = tk.Frame(main_frame, bg=DARK_BG)
 buttons_frame.pack(pady=10)
 status_label = tk.Label(main_frame, text="", bg=DARK_BG, fg="#00ff00", font=("Segoe UI", 10, "bold"))
 status_label.pack(pady=2)
+# Disk activity of the last run: files opened, bytes read/written, unchanged files skipped
+io_label = tk.Label(main_frame, text="", bg=DARK_BG, fg="#AAAAAA", font=("Segoe UI", 8))
+io_label.pack(pady=0)
+
+# Shown only while a job runs
+progress_frame = tk.Frame(main_frame, bg=DARK_BG)
+progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate", length=300)
+progress_bar.pack(side="left", padx=5)
+cancel_button = tk.Button(progress_frame, text="Cancel", font=("Segoe UI", 9, "bold"), width=8)
+cancel_button.pack(side="left", padx=5)
 
 # ===== Autofill In-Game Name and Asset Fields =====
-def autofill_fields(event=None):
+# Once per frame while typing, and only fields whose text differs are rewritten
+def autofill_fields():
     text = entry_item.get()
-    entry_ingame.delete(0, tk.END)
-    entry_ingame.insert(0, text)
-    entry_asset.delete(0, tk.END)
-    entry_asset.insert(0, text)
-entry_item.bind("<KeyRelease>", autofill_fields)
+    for entry in (entry_ingame, entry_asset):
+        if entry.get() != text:
+            entry.delete(0, tk.END)
+            entry.insert(0, text)
+entry_item.bind("<KeyRelease>", Coalesced(entry_item, autofill_fields))
+
+# ===== Build Item Spec From Form =====
+def read_form_spec():
+    build_all_sections()
+
+    def active(entry, var):
+        return entry.get().strip() if var.get() else ""
+
+    spec = {
+        "module": entry_module.get(),
+        "item": entry_item.get(),
+        "ingame_name": entry_ingame.get(),
+        "asset": entry_asset.get(),
+        "category": entry_category.get(),
+        "itemtype": entry_itemtype.get(),
+        "weight": entry_weight.get(),
+
+        "food_type": active(entry_foodtype, foodtype_active),
+        "eat_type": active(entry_eattype, eattype_active),
+        "cooking_sound": active(entry_cookingsound, cookingsound_active),
+        "custom_eat_sound": active(entry_eatingsound, eatingsound_active),
+        "herbalist_type": active(entry_herbalisttype, herbalisttype_active),
+
+        "flu_reduction": active(entry_flu, flu_active),
+        "pain_reduction": active(entry_pain, pain_active),
+        "reduce_food_sickness": active(entry_food_sick, food_sick_active),
+        "reduce_infection_power": active(entry_infection, infection_active),
+        "poison_power": active(entry_poisonpower, poisonpower_active),
+        "use_delta": active(entry_usedelta, usedelta_active),
+
+        "tags": active(entry_tags, tags_var),
+        "tooltip": active(entry_tooltip, tooltip_var),
+        "on_eat": active(entry_oneat, oneat_var),
+        "custom_context_menu": active(entry_customcontextmenu, customcontextmenu_var),
+
+        "perishable": perishable_var.get(),
+        "days_fresh": entry_days_fresh.get(),
+        "days_rotten": entry_days_rotten.get(),
+        "replace_on_rotten": active(entry_replace_rotten, replacerotten_var),
+
+        "cookable": iscookable_var.get(),
+        "minutes_to_cook": minutes_to_cook_entry.get(),
+        "minutes_to_burn": minutes_to_burn_entry.get(),
+        "replace_on_cooked": active(entry_replace_cooked, replace_cooked_var),
+        "replace_on_use": active(entry_replace_use, replace_use_var),
+
+        "fishing_lure": fishing_var.get(),
+        "dangerous_uncooked": dangerous_raw_var.get(),
+        "bad_cold": badcold_var.get(),
+        "bad_in_microwave": badmicrowave_var.get(),
+        "good_hot": goodhot_var.get(),
+        "cant_eat": canteat_var.get(),
+        "medical": medical_var.get(),
+        "canned_food": cannedfood_var.get(),
+        "cant_be_frozen": cantbefrozen_var.get(),
+        "spice": spice_var.get(),
+        "packaged": packaged_var.get(),
+        "remove_unhappiness_when_cooked": remove_unhappy_cooked_var.get(),
+        "remove_negative_effect_on_cooked": remove_negative_effects_cooked_var.get(),
+
+        "evolved_recipe_name": active(evolved_name_entry, evolved_var),
+        "evolved_recipes": [btn.cget("text") for btn in evolved_cbs_buttons if btn.var.get()] if evolved_var.get() else [],
+
+        "distribution_lists": entry_distribution_lists.get() if distribution_var.get() else "",
+        "spawning_chance": entry_spawning_chance.get(),
+
+        "forage_category": active(entry_foraging_category, foraging_var),
+        "forage_min": entry_foraging_min.get(),
+        "forage_max": entry_foraging_max.get(),
+        "forage_skill": entry_foraging_skill.get(),
+    }
+
+    stat_rows = [
+        ("hunger", entry_hunger, hunger_choice),
+        ("thirst", entry_thirst, thirst_choice),
+        ("unhappy", entry_unhappy, unhappy_choice),
+        ("stress", entry_stress, stress_choice),
+        ("boredom", entry_boredom, boredom_choice),
+        ("fatigue", entry_fatigue, fatigue_choice),
+        ("endurance", entry_endurance, endurance_choice),
+    ]
+    for stat, entry, choice in stat_rows:
+        if choice.get() in ("Increase", "Decrease"):
+            spec[stat] = entry.get()
+            spec[f"{stat}_mode"] = choice.get()
+
+    if nutrition_active.get():
+        spec["carbohydrates"] = entry_carbs.get()
+        spec["proteins"] = entry_proteins.get()
+        spec["lipids"] = entry_lipids.get()
+        spec["calories"] = entry_calories.get()
+
+    return normalize_spec(spec)
+
 
 # ===== Create Food Item Function =====
 def create_food_item():
-    module_name = entry_module.get().strip()
-    item_name = entry_item.get().strip()
-    ingame_name = entry_ingame.get().strip()
-    asset_name = entry_asset.get().strip()
-    display_category = entry_category.get().strip()
-    itemtype = entry_itemtype.get().strip()
-    weight = entry_weight.get().strip()
-
-    hunger = entry_hunger.get().strip()
-    thirst = entry_thirst.get().strip()
-    unhappy = entry_unhappy.get().strip()
-    stress = entry_stress.get().strip()
-    boredom = entry_boredom.get().strip()
-    fatigue = entry_fatigue.get().strip()
-    endurance = entry_endurance.get().strip()
-
-    flureduction = entry_flu.get().strip()
-    painreduction = entry_pain.get().strip()
-    reducefoodsickness = entry_food_sick.get().strip()
-    reduceinfectionpower = entry_infection.get().strip()
-
-    foodtype = entry_foodtype.get().strip()
-    eattype = entry_eattype.get().strip()
-    cookingsound = entry_cookingsound.get().strip()
-    customsound = entry_eatingsound.get().strip()
-    herbalisttype = entry_herbalisttype.get().strip()
-
-    carbs = entry_carbs.get().strip()
-    proteins = entry_proteins.get().strip()
-    lipids = entry_lipids.get().strip()
-    calories = entry_calories.get().strip()
-
-    tags = entry_tags.get().strip() if tags_var.get() else ""
-    tooltip = entry_tooltip.get().strip() if tooltip_var.get() else ""
-    oneat = entry_oneat.get().strip() if oneat_var.get() else ""
-    customcontextmenu = entry_customcontextmenu.get().strip() if customcontextmenu_var.get() else ""
-
-    evolved = evolved_var.get()
-    evolved_name = evolved_name_entry.get().strip() if evolved_var.get() else ""
-    evolved_recipes = [btn.cget("text") for btn in evolved_cbs_buttons if btn.var.get()] if evolved_var.get() else []
-
-    cantbefrozen = cantbefrozen_var.get()
-    spice = spice_var.get()
-    packaged = packaged_var.get()
-    replaceonrotten = replacerotten_var.get()
-    replace_text = entry_replace_rotten.get().strip()
-    poisonpower = entry_poisonpower.get().strip() if poisonpower_active.get() else ""
-    usedelta = entry_usedelta.get().strip() if usedelta_active.get() else ""
-    iscookable = iscookable_var.get()
-    
-    cook_minutes = minutes_to_cook_entry.get().strip()
-    burn_minutes = minutes_to_burn_entry.get().strip()
-
-    fishing = fishing_var.get()
-    dangerousraw = dangerous_raw_var.get()
-    badcold = badcold_var.get()
-    badmicrowave = badmicrowave_var.get()
-    goodhot = goodhot_var.get()
-    canteat = canteat_var.get()
-    medical = medical_var.get()
-    remove_unhappy_cooked = remove_unhappy_cooked_var.get()
-    remove_negative_effects_cooked = remove_negative_effects_cooked_var.get()
-    cannedfood = cannedfood_var.get()
-
-# ===== Validate Required Fields =====
-    required = [module_name, item_name, ingame_name, asset_name, weight, itemtype, display_category]
+    required = [entry_module.get().strip(), entry_item.get().strip(), entry_ingame.get().strip(),
+                entry_asset.get().strip(), entry_weight.get().strip(), entry_itemtype.get().strip(),
+                entry_category.get().strip()]
     if not all(required):
         status_label.config(text="Fill all required fields!", fg="red")
         return
 
-# ===== Ensure Directories Exist =====
-    scripts_dir = p("media/scripts/generated")
-    items_dir = os.path.join(scripts_dir, "items")
-    models_dir = p("media/models_X/WorldItems")
-    textures_dir = p("media/textures/WorldItems")
-    icon_dir = p("media/textures")
-    for d in [scripts_dir, items_dir, models_dir, textures_dir, icon_dir]:
-        ensure_dir(d)
-
-# ===== Check for Existing Item =====
-    display_category = entry_category.get().strip() 
-    item_file = os.path.join(items_dir, f"{module_name}_{display_category}.txt")
-
-    if os.path.exists(item_file):
-        with open(item_file, "r", encoding="utf-8") as f:
-            if f"item {item_name}" in f.read():
-                status_label.config(text=f"Item '{item_name}' already exists!", fg="red")
-                return
-
-# ===== Create Translation File =====
-    translation_dir = p("media/lua/shared/translate/EN")
-    ensure_dir(translation_dir)
-    translation_file = os.path.join(translation_dir, f"{module_name}_ItemName_EN.txt")
-
-    existing_lines = []
-    if os.path.exists(translation_file):
-        with open(translation_file, "r", encoding="utf-8") as f:
-            existing_lines = f.readlines()
-
-    new_line = f'    ItemName_{module_name}.{item_name} = "{ingame_name}",\n'
-
-    if new_line not in existing_lines:
-        if not existing_lines:
-            existing_lines.append("ItemName_EN = {\n")
-            existing_lines.append(new_line)
-            existing_lines.append("}\n")
-        else:
-            for i in range(len(existing_lines)-1, -1, -1):
-                if existing_lines[i].strip() == "}":
-                    existing_lines.insert(i, new_line)
-                    break
-
-    with open(translation_file, "w", encoding="utf-8") as f:
-        f.writelines(existing_lines)
-
-# ===== Create Model Definition =====
-    model_script_file = os.path.join(scripts_dir, f"{module_name}_Models.txt")
-    model_block = f"""model {asset_name}
-{{
-    mesh = WorldItems/{asset_name},
-    texture = WorldItems/{asset_name},
-    scale = 1.0,
-}}"""
-    insert_inside_last_brace(model_script_file, model_block, module_name=module_name)
-
-# ===== Distribution File Generation =====
-    if distribution_var.get():
-        dist_file_dir = p("media/lua/server")
-        ensure_dir(dist_file_dir)
-        dist_file_path = os.path.join(dist_file_dir, f"{module_name}_Distributions.lua")
-        
-        try:
-            spawning_chance = float(entry_spawning_chance.get())
-        except ValueError:
-            spawning_chance = 1 
-        
-        dist_lists = [x.strip() for x in entry_distribution_lists.get().split(",") if x.strip()]
-        
-        if os.path.exists(dist_file_path):
-            with open(dist_file_path, "r", encoding="utf-8") as f:
-                existing_lines = f.readlines()
-        else:
-            existing_lines = []
-
-        requires = [
-            "require 'Items/ProceduralDistributions'\n",
-            "require 'Items/Distributions'\n\n"
-        ]
-        for req in requires:
-            if req not in existing_lines:
-                existing_lines.insert(0, req)
-
-        new_lines = []
-        for dist in dist_lists:
-            item_var = f"{module_name}_{item_name}SpawningChance"
-            line1 = f"local {item_var} = {spawning_chance}\n"
-            line2 = f'table.insert(ProceduralDistributions["list"]["{dist}"].items, "{module_name}.{item_name}");\n'
-            line3 = f"table.insert(ProceduralDistributions['list']['{dist}'].items, {item_var} * 0.1);\n\n"
-
-            if line2 not in existing_lines:
-                new_lines.extend([line1, line2, line3])
-                existing_lines.extend([line1, line2, line3])  
-
-        with open(dist_file_path, "w", encoding="utf-8") as f:
-            f.writelines(existing_lines)
-
-# ===== Foraging Definition File Generation =====
-    if foraging_var.get():
-        forage_dir = p("media/lua/shared/Foraging/Categories")
-        ensure_dir(forage_dir)
-
-        forage_file_path = os.path.join(
-            forage_dir,
-            f"{module_name}_ForageDefinitions.lua"
-        )
-
-        if os.path.exists(forage_file_path):
-            with open(forage_file_path, "r", encoding="utf-8") as f:
-                existing_lines = f.readlines()
-        else:
-            existing_lines = []
-
-        requires = [
-            'require "Foraging/forageDefinitions";\n',
-            'require "Foraging/forageSystem";\n\n'
-        ]
-
-        for req in reversed(requires):
-            if req not in existing_lines:
-                existing_lines.insert(0, req)
-
-        forage_category = entry_foraging_category.get().strip()
-
-        try:
-            min_count = int(entry_foraging_min.get())
-        except ValueError:
-            min_count = 1
-
-        try:
-            max_count = int(entry_foraging_max.get())
-        except ValueError:
-            max_count = min_count
-
-        try:
-            skill_req = int(entry_foraging_skill.get())
-        except ValueError:
-            skill_req = 0
-
-        item_var = f"{module_name}_{item_name}_Forage"
-
-        line_block = [
-            f"local {item_var} = {{}}\n",
-            f'{item_var}.type = "{module_name}.{item_name}"\n',
-            f"{item_var}.minCount = {min_count}\n",
-            f"{item_var}.maxCount = {max_count}\n",
-            f"{item_var}.skill = {skill_req}\n",
-            f'table.insert(scavenges.{forage_category}, {item_var})\n\n'
-        ]
-
-        type_line = f'{item_var}.type = "{module_name}.{item_name}"\n'
-
-        if type_line not in existing_lines:
-            existing_lines.extend(line_block)
-
-        with open(forage_file_path, "w", encoding="utf-8") as f:
-            f.writelines(existing_lines)
-
-# ===== Create Item Definition =====
-    def process_value(val, inc_var, dec_var):
-        try:
-            v = float(val)
-        except:
-            v = 0
-        if inc_var.get(): v = -abs(v)
-        if dec_var.get(): v = abs(v)
-        return v
-
-    item_block_lines = [
-        f"item {item_name}",
-        "{",
-        f"    DisplayCategory = {display_category},",
-        f"    Icon = Item_{asset_name},",
-        f"    Weight = {weight},",
-        f"    ItemType = base:{itemtype},",
-            ]
-    
-    if hunger_choice.get() == "Increase":
-        item_block_lines.append(f"    HungerChange = {hunger},")
-    elif hunger_choice.get() == "Decrease":
-        item_block_lines.append(f"    HungerChange = -{hunger},")
-        
-    if thirst_choice.get() == "Increase":
-        item_block_lines.append(f"    ThirstChange = {thirst},")
-    elif thirst_choice.get() == "Decrease":
-        item_block_lines.append(f"    ThirstChange = -{thirst},")
-
-    if unhappy_choice.get() == "Increase":
-        item_block_lines.append(f"    UnhappyChange = {unhappy},")
-    elif unhappy_choice.get() == "Decrease":
-        item_block_lines.append(f"    UnhappyChange = -{unhappy},")
-
-    if stress_choice.get() == "Increase":
-        item_block_lines.append(f"    StressChange = {stress},")
-    elif stress_choice.get() == "Decrease":
-        item_block_lines.append(f"    StressChange = -{stress},")   
-
-    if boredom_choice.get() == "Increase":
-        item_block_lines.append(f"    BoredomChange = {boredom},")
-    elif boredom_choice.get() == "Decrease":
-        item_block_lines.append(f"    BoredomChange = -{boredom},")
-
-    if fatigue_choice.get() == "Increase":
-        item_block_lines.append(f"    FatigueChange = {fatigue},")
-    elif fatigue_choice.get() == "Decrease":
-        item_block_lines.append(f"    FatigueChange = -{fatigue},")
-
-    if endurance_choice.get() == "Increase":
-        item_block_lines.append(f"    EnduranceChange = {endurance},")
-    elif endurance_choice.get() == "Decrease":
-        item_block_lines.append(f"    EnduranceChange = -{endurance},")
-        
-    if nutrition_active.get():
-        item_block_lines.append(f"    Carbohydrates = {carbs},")
-        item_block_lines.append(f"    Proteins = {proteins},")
-        item_block_lines.append(f"    Lipids = {lipids},")
-        item_block_lines.append(f"    Calories = {calories},")
-
-    if foodtype_active.get():
-        item_block_lines.append(f"    FoodType = {foodtype},",)
-    if eattype_active.get():
-        item_block_lines.append(f"    EatType = {eattype},")
-    if cookingsound_active.get():    
-        item_block_lines.append(f"    CookingSound = {cookingsound},")
-    if customsound:
-        item_block_lines.append(f"    CustomEatSound = {customsound},")
-    if herbalisttype:
-        item_block_lines.append(f"    HerbalistType = {herbalisttype},")
-
-    if flu_active.get():
-        flureduction = float(entry_flu.get())
-        item_block_lines.append(f"    FluReduction = {flureduction},")
-    if pain_active.get():
-        painreduction= float(entry_pain.get())
-        item_block_lines.append(f"    PainReduction = {painreduction},")
-    if food_sick_active.get():
-        reducefoodsickness = float(entry_food_sick.get())
-        item_block_lines.append(f"    ReduceFoodSickness = {reducefoodsickness},")
-    if infection_active.get():
-        reduceinfectionpower = float(entry_infection.get())
-        item_block_lines.append(f"    ReduceInfectionPower = {reduceinfectionpower},")
-    if poisonpower:
-        item_block_lines.append(f"    PoisonPower = {poisonpower},")
-    if usedelta:
-        item_block_lines.append(f"    UseDelta = {usedelta},")
-    if tags:
-        item_block_lines.append(f"    Tags = {tags},")
-    if tooltip:
-        item_block_lines.append(f"    Tooltip = {entry_tooltip.get().strip()},")
-    
-    if oneat:
-        item_block_lines.append(f"    OnEat = {oneat},")
-    if customcontextmenu:
-        item_block_lines.append(f"    CustomContextMenu = {customcontextmenu},")
-
-    if perishable_var.get():
-        days_fresh = entry_days_fresh.get().strip()
-        days_rotten = entry_days_rotten.get().strip()
-        item_block_lines.append(f"    DaysFresh = {days_fresh},")
-        item_block_lines.append(f"    DaysTotallyRotten = {days_rotten},")
-    if perishable_var.get() and replaceonrotten and replace_text:
-        item_block_lines.append(f"    ReplaceOnRotten = {replace_text},")
-
-    if iscookable:
-        item_block_lines.append(f"    IsCookable = true,")
-        item_block_lines.append(f"    MinutesToCook = {cook_minutes},")
-        item_block_lines.append(f"    MinutesToBurn = {burn_minutes},")
-        item_block_lines.append(f"    ReplaceOnCooked = {entry_replace_cooked.get().strip() if replace_cooked_var.get() else 'nil'},")
-
-    if replace_use_var.get() and entry_replace_use.get().strip():
-        item_block_lines.append(f"    ReplaceOnUse = {entry_replace_use.get().strip()},")
-
-    if fishing: item_block_lines.append("    FishingLure = true,")
-    if dangerousraw: item_block_lines.append("    DangerousUncooked = true,")
-    if badcold: item_block_lines.append("    BadCold = true,")
-    if badmicrowave: item_block_lines.append("    BadInMicrowave = true,")
-    if goodhot: item_block_lines.append("    GoodHot = true,")
-    if canteat: item_block_lines.append("    CantEat = true,")
-    if medical: item_block_lines.append("    Medical = true,")
-    if cannedfood: item_block_lines.append("    CannedFood = true,")
-    if cantbefrozen: item_block_lines.append("    CantBeFrozen = true,")
-    if spice: item_block_lines.append("    Spice = true,")
-    if packaged: item_block_lines.append("    Packaged = true,")
-    if remove_unhappy_cooked: item_block_lines.append("    RemoveUnhappinessWhenCooked = true,")
-    if remove_negative_effects_cooked: item_block_lines.append("    RemoveNegativeEffectOnCooked = true,")  
-    if evolved:
-        item_block_lines.append(f"    EvolvedRecipeName = {evolved_name},")
-        if evolved_recipes:
-            evolved_items_str = ";".join([f"{r}:1" for r in evolved_recipes])
-            item_block_lines.append(f"    EvolvedItems = {evolved_items_str},")
-
-
-    item_block_lines.append(f"    WorldStaticModel = {asset_name},")
-    item_block_lines.append(f"    StaticModel = {asset_name},")
-
-    
-    item_block_lines.append("}")
-    insert_inside_last_brace(item_file, "\n".join(item_block_lines), module_name=module_name)
-
-# ===== Create Placeholder Assets =====
-    placeholders = {
-        os.path.join(models_dir, f"{asset_name}.fbx"): f"Placeholder FBX for {asset_name}\n",
-        os.path.join(textures_dir, f"{asset_name}.png"): f"Placeholder texture for {asset_name}\n",
-        os.path.join(icon_dir, f"Item_{asset_name}.png"): f"Placeholder icon for {asset_name}\n"
-    }
-    for path, content in placeholders.items():
-        if not os.path.exists(path):
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
+    try:
+        spec = read_form_spec()
+    except SpecError as e:
+        status_label.config(text=str(e), fg="red")
+        return
+    errors = validate_spec(spec)
+    if errors:
+        status_label.config(text="\n".join(errors), fg="red")
+        return
+
+    status_label.config(text=f"Creating {spec['item']}...", fg=DARK_FG)
+    start_job(Job(create_item, BASE_DIR, spec, update_var.get()), lambda result: item_created(spec, *result),
+              cancellable=False)
+
 
 # ===== Update Status =====
-    status_label.config(text=f"Item Created: {item_name}", fg="#00ff00")
+def item_created(spec, warnings, updated, io):
+    done = "Item Updated" if updated else "Item Created"
+    if warnings:
+        status_label.config(text=f"{done}: {spec['item']} (warning: {'; '.join(warnings)})", fg="orange")
+    else:
+        status_label.config(text=f"{done}: {spec['item']}", fg="#00ff00")
+    io_label.config(text=io.summary())
+
+
+# ===== Import Batch File =====
+def import_batch():
+    path = filedialog.askopenfilename(title="Import item specs",
+                                      filetypes=[("Item specs", "*.csv *.jsonl"), ("All files", "*.*")])
+    if not path:
+        return
+    status_label.config(text=f"Importing {os.path.basename(path)}...", fg=DARK_FG)
+    start_job(Job(generate_file, BASE_DIR, path), batch_imported)
+
+
+def batch_imported(result):
+    generator, stopped = result
+    text = f"{generator.created} item(s) created, {len(generator.errors)} error(s)"
+    if stopped:
+        text += " (cancelled)"
+    problems = [f"row {row}: {message}" for row, message in generator.errors[:5]]
+    problems += [f"row {row}: warning: {message}" for row, message in generator.warnings[:5]]
+    if problems:
+        text += "\n" + "\n".join(problems)
+    color = "red" if generator.errors else "orange" if stopped or generator.warnings else "#00ff00"
+    status_label.config(text=text, fg=color)
+    io_label.config(text=generator.io.summary())
+
+
+# ===== Background Jobs =====
+# Generation runs on a worker thread; the queue it reports to is drained here
+# about once a frame, so the window keeps redrawing and Cancel stays clickable.
+JOB_POLL_MS = 16
+current_job = None
+job_buttons = []
+
+def start_job(job, on_done, cancellable=True):
+    global current_job
+    current_job = job
+    for button in job_buttons:
+        button.config(state="disabled")
+    progress_bar.config(mode="indeterminate", value=0)
+    progress_bar.start(JOB_POLL_MS)
+    cancel_button.config(state="normal" if cancellable else "disabled", command=cancel_job)
+    progress_frame.pack(after=io_label, pady=2)
+    job.start()
+    root.after(JOB_POLL_MS, poll_job, job, on_done)
+
+
+def cancel_job():
+    if current_job is not None:
+        current_job.cancel()
+        cancel_button.config(state="disabled")
+        status_label.config(text="Cancelling after the current item...", fg="orange")
+
+
+def poll_job(job, on_done):
+    progress = None
+    for event in job.drain():
+        if event[0] == "progress":
+            # Only the latest count is worth drawing
+            progress = event[1:]
+        elif event[0] == "error":
+            finish_job()
+            error = event[1]
+            if isinstance(error, (GenerationError, SpecError, OSError)):
+                status_label.config(text=str(error), fg="red")
+            else:
+                status_label.config(text=f"Unexpected error: {error!r}", fg="red")
+            return
+        else:
+            finish_job()
+            on_done(event[1])
+            return
+    if progress is not None:
+        done, total = progress
+        if str(progress_bar.cget("mode")) != "determinate":
+            progress_bar.stop()
+            progress_bar.config(mode="determinate")
+        progress_bar.config(maximum=max(total, 1), value=done)
+    root.after(JOB_POLL_MS, poll_job, job, on_done)
+
+
+def finish_job():
+    global current_job
+    current_job = None
+    progress_bar.stop()
+    progress_frame.pack_forget()
+    for button in job_buttons:
+        button.config(state="normal")
+
 
 # ===== Clear All Entries =====
 def clear_all_entries():
+    build_all_sections()
     entries_to_clear = [
         entry_asset, entry_item, entry_ingame, entry_weight,
         entry_category, entry_itemtype, entry_foodtype, entry_eattype,
@@ -1555,13 +1624,74 @@ def clear_all_entries():
         choice.set("Inactive")
 
     status_label.config(text="", fg="#00ff00")
+    io_label.config(text="")
 
 # ===== Create Item Button =====
-tk.Button(buttons_frame, text="Create Item", font=("Segoe UI", 12, "bold"),
-          width=15, command=create_food_item).pack(pady=0)
+create_row = tk.Frame(buttons_frame, bg=DARK_BG)
+create_row.pack(pady=0)
+
+create_button = tk.Button(create_row, text="Create Item", font=("Segoe UI", 12, "bold"),
+                          width=15, command=create_food_item)
+create_button.pack(side="left")
+
+update_var = tk.BooleanVar(value=False)
+update_check = tk.Checkbutton(
+    create_row,
+    text="Update if it exists",
+    variable=update_var,
+    bg=DARK_BG, fg=DARK_FG,
+    selectcolor=DARK_BG,
+    activebackground=DARK_BG,
+    takefocus=False
+)
+update_check.pack(side="left", padx=(5, 0))
+ToolTip(update_check, "Rewrite an existing item with the same name in place (with its translation, "
+                      "distribution and foraging entries) instead of refusing it.")
+
+import_button = tk.Button(buttons_frame, text="Import Batch...", font=("Segoe UI", 12, "bold"),
+                          width=15, command=import_batch)
+import_button.pack(pady=0)
+job_buttons.extend((create_button, import_button))
 
 tk.Button(buttons_frame, text="Clear All", font=("Segoe UI", 12, "bold"),
           width=15, command=clear_all_entries).pack(pady=0)
 
+# ===== Startup Timing =====
+# Time from launch to the first frame that takes input, printed on the console
+STARTUP_BUDGET_MS = 300
+
+def report_startup():
+    elapsed = (time.perf_counter() - startup_started) * 1000
+    over = f", over the {STARTUP_BUDGET_MS} ms budget" if elapsed > STARTUP_BUDGET_MS else ""
+    print(f"Ready in {elapsed:.0f} ms{over}")
+
+def on_first_map(event):
+    # Idle callbacks run after the pending redraws, so the window is on screen by then
+    if event.widget is root:
+        root.unbind("<Map>", first_map_binding)
+        root.after_idle(report_startup)
+
+first_map_binding = root.bind("<Map>", on_first_map)
+
+
+# ===== Game Data Completions =====
+# Indexing the install is file I/O and parsing, so it runs in a worker once
+# the window is up; a missing or unreadable install keeps the default lists.
+COMPLETION_POLL_MS = 100
+
+def poll_completions(job):
+    for event in job.drain():
+        if event[0] == "done":
+            completion_indexes.update(event[1])
+        if event[0] in ("done", "error"):
+            return
+    root.after(COMPLETION_POLL_MS, poll_completions, job)
+
+def start_completions():
+    poll_completions(Job(load_completions).start())
+
+root.after_idle(start_completions)
+
+
 # ===== Start Main Loop =====
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,228 @@
+import hashlib
+import io
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import output_dirs
+from .fileio import (COPY_CHUNK, DEFAULT_MODE, FileLock, atomic_write, io_stats, lock_dir, locked,
+                     remove_legacy_state)
+from .placeholders import ICON_SIZE
+from .schema import NAME_RE
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ASSETS_VERSION = 1
+ASSETS_FILE = ".consumables_assets.json"
+TEXTURE_SIZE = 256
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tga", ".gif", ".webp")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def assets_cache_path(root):
+    # Next to media/, outside the files the game loads
+    return os.path.join(root, ASSETS_FILE)
+
+
+def asset_outputs(root, asset_name):
+    dirs = output_dirs(root)
+    return {
+        "icon": os.path.join(dirs["icons"], f"Item_{asset_name}.png"),
+        "texture": os.path.join(dirs["textures"], f"{asset_name}.png"),
+    }
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        io_stats.count_read(f)
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_sources(source_dir):
+    # {asset name: source image}; the file name without extension is the asset name
+    sources = {}
+    errors = []
+    for name in sorted(os.listdir(source_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in SOURCE_EXTENSIONS:
+            continue
+        if not NAME_RE.match(stem):
+            errors.append((name, "asset names must not contain spaces or punctuation"))
+        elif stem in sources:
+            errors.append((name, f"more than one source image for '{stem}'"))
+        else:
+            sources[stem] = os.path.join(source_dir, name)
+    return sources, errors
+
+
+# ===== Conversion =====
+# Runs in a worker process. With Pillow the source is scaled to fit a square
+# icon (centred on a transparent canvas) and shrunk to at most texture_size
+# for the world texture. Without it, PNG sources are copied unchanged.
+def png_size(data):
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", data[16:24])
+
+
+def _encode(image):
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _fit(image, size, upscale):
+    scale = min(size / image.width, size / image.height)
+    if scale >= 1 and not upscale:
+        return image
+    resample = getattr(Image, "Resampling", Image).LANCZOS
+    return image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), resample)
+
+
+def render_outputs(data, icon_size, texture_size):
+    if Image is None:
+        if png_size(data) is None:
+            raise ValueError("only PNG sources can be imported without Pillow (pip install pillow)")
+        return {"icon": data, "texture": data}
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            image = source.convert("RGBA")
+    except Image.UnidentifiedImageError:
+        raise ValueError("not an image file Pillow can read") from None
+    icon = Image.new("RGBA", (icon_size, icon_size), (0, 0, 0, 0))
+    fitted = _fit(image, icon_size, upscale=True)
+    icon.paste(fitted, ((icon_size - fitted.width) // 2, (icon_size - fitted.height) // 2))
+    return {"icon": _encode(icon), "texture": _encode(_fit(image, texture_size, upscale=False))}
+
+
+def convert_image(source, outputs, icon_size, texture_size):
+    # Returns (source hash, {kind: (mtime, size)}, warning or None)
+    with open(source, "rb") as f:
+        io_stats.count_read(f)
+        data = f.read()
+    rendered = render_outputs(data, icon_size, texture_size)
+    stats = {}
+    for kind, path in outputs.items():
+        # An explicit mode also replaces the read-only shared placeholder
+        atomic_write(path, rendered[kind], durable=False, mode=DEFAULT_MODE)
+        st = os.stat(path)
+        stats[kind] = (st.st_mtime_ns, st.st_size)
+    warning = None
+    size = png_size(data)
+    if Image is None and size != (icon_size, icon_size):
+        warning = f"copied unchanged at {size[0]}x{size[1]}, install Pillow to resize"
+    return hashlib.sha256(data).hexdigest(), stats, warning
+
+
+# ===== Asset Import =====
+# Turns a folder of source images into the icons and world textures the
+# generated scripts point at. A sidecar JSON file remembers each source's
+# content hash and the outputs made from it, so a re-run only converts images
+# whose content or settings changed, or whose outputs were replaced.
+class AssetImporter:
+    def __init__(self, root, icon_size=ICON_SIZE, texture_size=TEXTURE_SIZE):
+        self.root = root
+        self.path = assets_cache_path(root)
+        self.settings = {"icon": icon_size, "texture": texture_size, "resized": Image is not None}
+        self.converted = []
+        self.unchanged = []
+        self.errors = []
+        self.warnings = []
+
+    def _read_cache(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                io_stats.count_read(f)
+                data = json.load(f)
+            if data.get("version") == ASSETS_VERSION:
+                return data.get("assets", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _is_current(self, entry, source, outputs):
+        if entry is None or entry["settings"] != self.settings:
+            return False
+        for kind, path in outputs.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if [st.st_mtime_ns, st.st_size] != entry["outputs"].get(kind):
+                return False
+        st = os.stat(source)
+        if [st.st_mtime_ns, st.st_size] == entry["source"]:
+            return True
+        # Touched or checked out again: only the content decides
+        if file_hash(source) != entry["hash"]:
+            return False
+        entry["source"] = [st.st_mtime_ns, st.st_size]
+        return True
+
+    def run(self, source_dir, workers=None, force=False):
+        sources, errors = find_sources(source_dir)
+        self.errors.extend(errors)
+        with locked(FileLock(os.path.join(lock_dir(self.root), "assets.lock"))):
+            cache = self._read_cache()
+            pending = {}
+            for asset_name, source in sources.items():
+                outputs = asset_outputs(self.root, asset_name)
+                if not force and self._is_current(cache.get(asset_name), source, outputs):
+                    self.unchanged.append(asset_name)
+                else:
+                    pending[asset_name] = (source, outputs)
+
+            for asset_name, result in self._convert(pending, workers):
+                source_name = os.path.basename(pending[asset_name][0])
+                try:
+                    digest, stats, warning = result()
+                except (OSError, ValueError) as e:
+                    self.errors.append((source_name, str(e)))
+                    cache.pop(asset_name, None)
+                    continue
+                st = os.stat(pending[asset_name][0])
+                cache[asset_name] = {"hash": digest, "source": [st.st_mtime_ns, st.st_size],
+                                     "settings": self.settings,
+                                     "outputs": {kind: list(stat) for kind, stat in stats.items()}}
+                self.converted.append(asset_name)
+                if warning:
+                    self.warnings.append((source_name, warning))
+
+            cache = {name: entry for name, entry in cache.items() if name in sources}
+            data = json.dumps({"version": ASSETS_VERSION, "assets": cache}, separators=(",", ":"))
+            atomic_write(self.path, data)
+            remove_legacy_state(self.root, ASSETS_FILE)
+        return self
+
+    def _convert(self, pending, workers):
+        # Yields (asset name, callable returning the result or raising its error)
+        jobs = {name: (source, outputs, self.settings["icon"], self.settings["texture"])
+                for name, (source, outputs) in pending.items()}
+        if workers == 1 or len(jobs) < 2:
+            for name, job in jobs.items():
+                yield name, lambda job=job: convert_image(*job)
+            return
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {name: pool.submit(_convert_counted, *job) for name, job in jobs.items()}
+            for name, future in futures.items():
+                yield name, lambda future=future: _counted_result(future)
+
+
+# A worker process has its own io_stats; its counts travel back with the result
+def _convert_counted(*job):
+    io_started = io_stats.snapshot()
+    result = convert_image(*job)
+    return result, io_stats.since(io_started).as_dict()
+
+
+def _counted_result(future):
+    result, io = future.result()
+    io_stats.add(io)
+    return result
@@ -0,0 +1,246 @@
+import csv
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from .engine import GENERATOR_VERSION, Generator, generate_item
+from .fileio import atomic_write, format_size
+from .schema import check_batch
+from .specs import iter_specs, normalize_spec
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BENCH_VERSION = 1
+SCALES = (1000, 10000, 100000)
+# Module and category counts: one big items file, or items spread over many
+LAYOUTS = {
+    "one-file": (1, 1),
+    "spread": (20, 10),
+}
+STAGES = ("validate", "generate", "append", "append-each", "update")
+# Share of the pack added or changed by the append and update stages
+CHANGE_SHARE = 0.01
+# Items append-each adds one at a time, as the window does
+EACH_ITEMS = 10
+THRESHOLD = 0.15
+# Timing differences below this are noise, whatever the ratio
+NOISE_SECONDS = 0.02
+COMPARED = ("seconds", "written_bytes")
+
+SPEC_COLUMNS = ["module", "item", "category", "itemtype", "weight", "distribution_lists", "forage_category"]
+
+
+# ===== Synthetic Packs =====
+def synthetic_rows(count, layout, start=0, weight="0.5"):
+    modules, categories = LAYOUTS[layout]
+    for n in range(start, start + count):
+        yield {
+            "module": f"BenchMod{n % modules}",
+            "item": f"BenchItem{n}",
+            "category": f"BenchCat{n % categories}",
+            "itemtype": "Food",
+            "weight": weight,
+            # Every fourth item spawns somewhere, every eighth can be foraged
+            "distribution_lists": "KitchenCounter;FridgeGeneric" if n % 4 == 0 else "",
+            "forage_category": "Trash" if n % 8 == 0 else "",
+        }
+
+
+def write_spec_file(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SPEC_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# ===== Measurements =====
+# Bytes go through read()/write() system calls (Linux), or the OS counters of
+# psutil when it is installed. Peak memory is the process's peak resident set
+# where Linux lets it be reset between stages, and the peak of Python
+# allocations (tracemalloc, which slows the stage down) everywhere else.
+def _proc_io():
+    try:
+        with open("/proc/self/io", "r") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _psutil_io():
+    counters = psutil.Process().io_counters()
+    return counters.read_bytes, counters.write_bytes
+
+
+def io_source():
+    if _proc_io() is not None:
+        return "syscalls", _proc_io
+    if psutil is not None:
+        return "psutil", _psutil_io
+    return None, lambda: None
+
+
+def _peak_rss():
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return _peak_rss() is not None
+    except OSError:
+        return False
+
+
+class Measure:
+    def __init__(self):
+        self.io_kind, self.read_io = io_source()
+        self.memory_kind = "rss" if _reset_peak_rss() else "python-heap"
+
+    def run(self, func):
+        if self.memory_kind == "rss":
+            _reset_peak_rss()
+        else:
+            tracemalloc.start()
+        io_before = self.read_io()
+        started = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - started
+        io_after = self.read_io()
+        if self.memory_kind == "rss":
+            peak = _peak_rss()
+        else:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        result = {"seconds": round(seconds, 4), "read_bytes": None, "written_bytes": None, "peak_memory_bytes": peak}
+        if io_before is not None and io_after is not None:
+            result["read_bytes"] = io_after[0] - io_before[0]
+            result["written_bytes"] = io_after[1] - io_before[1]
+        return result
+
+
+# ===== Scenarios =====
+# One scenario is a pack size and layout, built in a fresh mod root:
+# validate reads and checks the spec file, generate writes the whole pack,
+# append adds new items to the existing files, append-each adds a few more
+# with one generator (and one flush) per item, and update rewrites existing
+# items in place.
+def run_scenario(count, layout, measure, workdir):
+    root = os.path.join(workdir, "mod")
+    spec_path = os.path.join(workdir, "items.csv")
+    changed = max(10, int(count * CHANGE_SHARE))
+    write_spec_file(spec_path, synthetic_rows(count, layout))
+    new_rows = [(n, normalize_spec(raw, n)) for n, raw in enumerate(synthetic_rows(changed, layout, start=count), 2)]
+    each_rows = [normalize_spec(raw) for raw in synthetic_rows(EACH_ITEMS, layout, start=count + changed)]
+    updated_rows = [(n, normalize_spec(raw, n)) for n, raw in enumerate(synthetic_rows(changed, layout, weight="0.75"), 2)]
+    loaded = {}
+
+    def validate():
+        _, loaded["problems"] = check_batch(spec_path)
+
+    def generate():
+        with Generator(root) as generator:
+            generator.add_all(iter_specs(spec_path), validated=True)
+
+    def append():
+        with Generator(root) as generator:
+            generator.add_all(new_rows)
+
+    def append_each():
+        for spec in each_rows:
+            generate_item(root, spec)
+
+    def update():
+        with Generator(root) as generator:
+            generator.add_all(updated_rows, replace=True)
+
+    stages = {"validate": validate, "generate": generate, "append": append, "append-each": append_each,
+              "update": update}
+    results = []
+    for stage in STAGES:
+        result = measure.run(stages[stage])
+        if stage == "validate" and loaded["problems"]:
+            raise ValueError(f"synthetic pack does not validate: {loaded['problems'][:3]}")
+        items = {"validate": count, "generate": count, "append-each": EACH_ITEMS}.get(stage, changed)
+        result.update({"items": count, "layout": layout, "stage": stage, "stage_items": items,
+                       "items_per_second": round(items / result["seconds"]) if result["seconds"] else None})
+        results.append(result)
+    shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def run_suite(scales=SCALES, layouts=tuple(LAYOUTS), repeat=1, report=print):
+    measure = Measure()
+    best = {}
+    for _ in range(repeat):
+        for count in scales:
+            for layout in layouts:
+                with tempfile.TemporaryDirectory(prefix="consumables-bench-") as workdir:
+                    for result in run_scenario(count, layout, measure, workdir):
+                        key = (result["items"], result["layout"], result["stage"])
+                        if key not in best or result["seconds"] < best[key]["seconds"]:
+                            best[key] = result
+                        report(format_result(result))
+    return {
+        "version": BENCH_VERSION,
+        "generator": GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "io": measure.io_kind,
+        "memory": measure.memory_kind,
+        "repeat": repeat,
+        "results": list(best.values()),
+    }
+
+
+# ===== Reporting =====
+def format_result(result):
+    return (f"{result['items']:>7} {result['layout']:<9} {result['stage']:<11} {result['seconds']:>9.3f}s "
+            f"read {format_size(result['read_bytes']):>10}  written {format_size(result['written_bytes']):>10}  "
+            f"peak {format_size(result['peak_memory_bytes']):>10}")
+
+
+def save_results(path, data):
+    atomic_write(path, json.dumps(data, indent=2) + "\n")
+
+
+def compare_results(baseline, current, threshold=THRESHOLD):
+    # Returns (lines, regressions); a stage regresses when it is more than
+    # threshold slower or writes more than threshold more bytes
+    old = {(r["items"], r["layout"], r["stage"]): r for r in baseline["results"]}
+    lines, regressions = [], 0
+    for result in current["results"]:
+        before = old.get((result["items"], result["layout"], result["stage"]))
+        if before is None:
+            continue
+        changes = []
+        worse = False
+        for field in COMPARED:
+            if not before.get(field) or result.get(field) is None:
+                continue
+            ratio = result[field] / before[field]
+            changes.append(f"{field} x{ratio:.2f}")
+            if field == "seconds" and result[field] - before[field] < NOISE_SECONDS:
+                continue
+            worse = worse or ratio > 1 + threshold
+        regressions += worse
+        label = f"{result['items']} {result['layout']} {result['stage']}"
+        lines.append(f"{'REGRESSION' if worse else 'ok':<10} {label}: {', '.join(changes)}")
+    return lines, regressions
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
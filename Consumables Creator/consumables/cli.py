@@ -0,0 +1,347 @@
+import argparse
+import json
+import os
+import sys
+
+from .assets import TEXTURE_SIZE, AssetImporter
+from .bench import LAYOUTS, SCALES, THRESHOLD, compare_results, load_results, run_suite, save_results
+from .engine import Generator
+from .fileio import io_stats
+from .game_data import GAME_DIR_ENV, open_game_data
+from .parallel import generate_parallel
+from .placeholders import ICON_SIZE
+from .preview import shadow_tree, unified_diff
+from .profiling import TRACE_ENV, format_summary, span, start_tracing
+from .schema import check_batch
+from .script_parser import ScriptFile, ScriptParseError, iter_tree
+from .specs import SpecError, iter_specs
+from .watch import SpecWatcher, spec_files
+
+
+# ===== Commands =====
+def load_game_data(game_dir):
+    try:
+        return open_game_data(game_dir)
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return False
+
+
+def parse_languages(value):
+    return [lang.strip().upper() for lang in value.split(",") if lang.strip()]
+
+
+def run_batch(root, rows, languages, game, jobs, upsert=False):
+    # rows are streamed and already validated. Upserts run serially: the
+    # parallel shards only append, and sharding needs every row at once.
+    with Generator(root, languages=languages, game=game) as generator:
+        if jobs == 1 or upsert:
+            generator.add_all(rows, replace=upsert, validated=True)
+        else:
+            generate_parallel(generator, list(rows), workers=jobs or None, validated=True)
+    return generator
+
+
+def run_summary(generator, **extra):
+    # What --json prints at the end of a run
+    return {
+        "created": generator.created,
+        "updated": generator.updated,
+        "duplicates": generator.duplicates,
+        "errors": [{"row": row, "message": message} for row, message in generator.errors],
+        "warnings": [{"row": row, "message": message} for row, message in generator.warnings],
+        "io": generator.io.as_dict(),
+        **extra,
+    }
+
+
+def cmd_generate(args):
+    languages = parse_languages(args.languages)
+    try:
+        _, problems = check_batch(args.input, args.format)
+    except (OSError, SpecError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if problems:
+        for row, message in problems:
+            print(f"row {row}: {message}", file=sys.stderr)
+        print(f"{len(problems)} error(s) in {len({row for row, _ in problems})} row(s), nothing was generated")
+        return 2
+
+    game = load_game_data(args.game)
+    if game is False:
+        return 2
+    rows = iter_specs(args.input, args.format)
+    try:
+        if args.dry_run:
+            # The diff goes to stdout on its own so it can be piped or applied
+            with shadow_tree(args.root) as shadow:
+                generator = run_batch(shadow, rows, languages, game, args.jobs, args.upsert)
+                sys.stdout.writelines(unified_diff(args.root, shadow))
+        else:
+            generator = run_batch(args.root, rows, languages, game, args.jobs, args.upsert)
+    finally:
+        if game is not None:
+            game.close()
+
+    status = 1 if len(generator.errors) > generator.duplicates else 0
+    if args.json:
+        # The diff of a dry run keeps stdout to itself
+        print(json.dumps(run_summary(generator, dry_run=args.dry_run), indent=2),
+              file=sys.stderr if args.dry_run else sys.stdout)
+        return status
+    for row, message in generator.errors:
+        # Errors without a row are about a whole file
+        print(f"row {row}: {message}" if row is not None else f"error: {message}", file=sys.stderr)
+    for row, message in generator.warnings:
+        print(f"row {row}: warning: {message}", file=sys.stderr)
+    if args.upsert:
+        summary = f"{generator.created} item(s) created, {generator.updated} updated, {len(generator.errors)} error(s)"
+    else:
+        summary = (f"{generator.created} item(s) created, {generator.duplicates} duplicate(s) skipped, "
+                   f"{len(generator.errors) - generator.duplicates} error(s)")
+    if generator.warnings:
+        summary += f", {len(generator.warnings)} warning(s)"
+    if args.dry_run:
+        print(f"dry run: {summary}; nothing was written", file=sys.stderr)
+        print(f"I/O (in a scratch copy): {generator.io.summary()}", file=sys.stderr)
+    else:
+        print(summary)
+        print(f"I/O: {generator.io.summary()}")
+    return status
+
+
+def cmd_watch(args):
+    if not os.path.isdir(args.directory):
+        print(f"error: not a directory: {args.directory}", file=sys.stderr)
+        return 2
+    game = load_game_data(args.game)
+    if game is False:
+        return 2
+    watcher = SpecWatcher(args.root, args.directory, languages=parse_languages(args.languages), game=game,
+                          report=lambda message: print(message, flush=True), adopt=args.adopt)
+    try:
+        if args.once:
+            watcher.apply(watcher.poll())
+        else:
+            watcher.watch()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if game is not None:
+            game.close()
+    return 0
+
+
+def cmd_build(args):
+    paths = []
+    for target in args.inputs:
+        paths.extend(spec_files(target) if os.path.isdir(target) else [target])
+    game = load_game_data(args.game)
+    if game is False:
+        return 2
+    # With --json the progress lines go to stderr and stdout only gets the summary
+    report = (lambda message: print(message, file=sys.stderr)) if args.json else print
+    watcher = SpecWatcher(args.root, languages=parse_languages(args.languages), game=game, report=report,
+                          adopt=args.adopt)
+    try:
+        generator = watcher.apply(paths, force=args.force)
+    finally:
+        if game is not None:
+            game.close()
+    if generator is None:
+        if args.json:
+            print(json.dumps({"created": 0, "updated": 0, "duplicates": 0, "errors": [], "warnings": [], "io": None},
+                             indent=2))
+        else:
+            print("nothing to rebuild")
+        return 0
+    if args.json:
+        print(json.dumps(run_summary(generator), indent=2))
+    return 1 if generator.errors else 0
+
+
+def cmd_game(args):
+    game = load_game_data(args.game)
+    if game is False:
+        return 2
+    if game is None:
+        print(f"error: no game install given (use --game or set {GAME_DIR_ENV})", file=sys.stderr)
+        return 2
+    with game:
+        counts = game.counts()
+        print(f"{counts['items']} item(s), {counts['distribution_lists']} distribution list(s), "
+              f"{counts['forage_categories']} forage category(ies) indexed; {game.rescanned} file(s) rescanned")
+        if args.list:
+            values = {
+                "lists": game.distribution_lists,
+                "categories": game.forage_categories,
+                "item-types": game.item_types,
+                "food-types": game.food_types,
+            }[args.list]()
+            for value in sorted(values):
+                print(value)
+    return 0
+
+
+def cmd_assets(args):
+    if not os.path.isdir(args.source):
+        print(f"error: not a directory: {args.source}", file=sys.stderr)
+        return 2
+    io_started = io_stats.snapshot()
+    importer = AssetImporter(args.root, icon_size=args.icon_size, texture_size=args.texture_size)
+    importer.run(args.source, workers=args.jobs, force=args.force)
+    for name, message in importer.errors:
+        print(f"{name}: {message}", file=sys.stderr)
+    for name, message in importer.warnings:
+        print(f"{name}: warning: {message}", file=sys.stderr)
+    print(f"{len(importer.converted)} image(s) converted, {len(importer.unchanged)} unchanged, "
+          f"{len(importer.errors)} error(s)")
+    print(f"I/O: {io_stats.since(io_started).summary()}")
+    return 1 if importer.errors else 0
+
+
+def cmd_bench(args):
+    try:
+        scales = [int(value) for value in args.scales.split(",") if value.strip()]
+    except ValueError:
+        print(f"error: --scales must be comma-separated item counts, got {args.scales!r}", file=sys.stderr)
+        return 2
+    layouts = [value.strip() for value in args.layouts.split(",") if value.strip()]
+    unknown = [layout for layout in layouts if layout not in LAYOUTS]
+    if unknown:
+        print(f"error: unknown layout(s) {', '.join(unknown)} (choose from {', '.join(LAYOUTS)})", file=sys.stderr)
+        return 2
+    try:
+        baseline = load_results(args.compare) if args.compare else None
+    except (OSError, ValueError) as e:
+        print(f"error: cannot read {args.compare}: {e}", file=sys.stderr)
+        return 2
+
+    data = run_suite(scales, layouts, repeat=args.repeat, report=lambda line: print(line, flush=True))
+    if args.output:
+        save_results(args.output, data)
+        print(f"results written to {args.output}")
+    if baseline is None:
+        return 0
+    lines, regressions = compare_results(baseline, data, args.threshold)
+    for line in lines:
+        print(line)
+    print(f"{regressions} regression(s) over {args.threshold:.0%} against {args.compare}")
+    return 1 if regressions else 0
+
+
+def cmd_check(args):
+    files = blocks = errors = 0
+    for target in args.paths:
+        for path in iter_tree(target) if os.path.isdir(target) else [target]:
+            files += 1
+            try:
+                with ScriptFile(path) as script:
+                    blocks += sum(1 for _ in script.blocks())
+            except ScriptParseError as e:
+                errors += 1
+                print(f"error: {e}", file=sys.stderr)
+    print(f"{files} file(s), {blocks} block(s) parsed, {errors} error(s)")
+    return 1 if errors else 0
+
+
+# ===== Argument Parsing =====
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="consumables",
+        description="Project Zomboid - Consumables Creator (headless)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help=f"Time every stage and write a Chrome trace-event JSON file (default: ${TRACE_ENV})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Generate items from a CSV or JSON Lines spec file")
+    gen.add_argument("input", help="Item spec file (.csv or .jsonl)")
+    gen.add_argument("--root", default=".", help="Mod root directory that contains media/ (default: current directory)")
+    gen.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from file extension)")
+    gen.add_argument("--languages", default="EN",
+                     help="Comma-separated translation languages to write, e.g. EN,ES,PTBR,RU (default: EN). "
+                          "Languages the module already ships are always kept in sync.")
+    gen.add_argument("-j", "--jobs", type=int, default=1,
+                     help="Worker processes; the batch is sharded by category file (0 = one per CPU, default: 1)")
+    gen.add_argument("--game", help=f"Project Zomboid install to check names against (default: ${GAME_DIR_ENV})")
+    gen.add_argument("--upsert", action="store_true",
+                     help="Update items that already exist in place instead of skipping them as duplicates")
+    gen.add_argument("-n", "--dry-run", action="store_true",
+                     help="Print a unified diff of every file the run would change and write nothing")
+    gen.add_argument("--json", action="store_true",
+                     help="Print the results (counts, errors, warnings and I/O totals) as JSON")
+    gen.set_defaults(func=cmd_generate)
+
+    watch = sub.add_parser("watch", help="Regenerate items whenever the spec files in a directory change")
+    watch.add_argument("directory", help="Directory of .csv and .jsonl item spec files")
+    watch.add_argument("--root", default=".", help="Mod root directory that contains media/ (default: current directory)")
+    watch.add_argument("--languages", default="EN", help="Comma-separated translation languages to write (default: EN)")
+    watch.add_argument("--game", help=f"Project Zomboid install to check names against (default: ${GAME_DIR_ENV})")
+    watch.add_argument("--once", action="store_true", help="Rebuild the changed items once and exit")
+    watch.add_argument("--adopt", action="store_true",
+                       help="Also update items that exist but were not built from the spec files (hand-written or "
+                            "made in the window) instead of reporting them")
+    watch.set_defaults(func=cmd_watch)
+
+    build = sub.add_parser("build", help="Rebuild the items whose spec changed since the last build")
+    build.add_argument("inputs", nargs="+", help="Item spec files (.csv or .jsonl) or directories of them")
+    build.add_argument("--root", default=".", help="Mod root directory that contains media/ (default: current directory)")
+    build.add_argument("--languages", default="EN", help="Comma-separated translation languages to write (default: EN)")
+    build.add_argument("--game", help=f"Project Zomboid install to check names against (default: ${GAME_DIR_ENV})")
+    build.add_argument("--force", action="store_true", help="Rebuild every item, changed or not")
+    build.add_argument("--adopt", action="store_true",
+                       help="Also update items that exist but were not built from the spec files (hand-written or "
+                            "made in the window) instead of reporting them")
+    build.add_argument("--json", action="store_true",
+                       help="Print the results (counts, errors, warnings and I/O totals) as JSON")
+    build.set_defaults(func=cmd_build)
+
+    game = sub.add_parser("game", help="Index a Project Zomboid install and show what it contains")
+    game.add_argument("--game", help=f"Project Zomboid install directory (default: ${GAME_DIR_ENV})")
+    game.add_argument("--list", choices=["lists", "categories", "item-types", "food-types"],
+                      help="Print the indexed distribution lists, forage categories, item types or food types")
+    game.set_defaults(func=cmd_game)
+
+    assets = sub.add_parser("assets", help="Convert a folder of images into item icons and world textures")
+    assets.add_argument("source", help="Folder of source images named after their asset (e.g. Burger.png)")
+    assets.add_argument("--root", default=".", help="Mod root directory that contains media/ (default: current directory)")
+    assets.add_argument("-j", "--jobs", type=int, default=0,
+                        help="Worker processes (0 = one per CPU, default: 0)")
+    assets.add_argument("--icon-size", type=int, default=ICON_SIZE,
+                        help=f"Icon width and height in pixels (default: {ICON_SIZE})")
+    assets.add_argument("--texture-size", type=int, default=TEXTURE_SIZE,
+                        help=f"Largest world texture side in pixels (default: {TEXTURE_SIZE})")
+    assets.add_argument("--force", action="store_true", help="Convert every image, even the unchanged ones")
+    assets.set_defaults(func=cmd_assets)
+
+    bench = sub.add_parser("bench", help="Time generation end to end on synthetic packs")
+    bench.add_argument("--scales", default=",".join(str(n) for n in SCALES),
+                       help=f"Comma-separated pack sizes in items (default: {','.join(str(n) for n in SCALES)})")
+    bench.add_argument("--layouts", default=",".join(LAYOUTS),
+                       help=f"Comma-separated module/category layouts: {', '.join(LAYOUTS)} (default: all)")
+    bench.add_argument("--repeat", type=int, default=1, help="Run every scenario this many times and keep the fastest")
+    bench.add_argument("-o", "--output", help="Write the results as JSON to this file")
+    bench.add_argument("--compare", help="Results JSON of an earlier run; exit with 1 if any stage regressed")
+    bench.add_argument("--threshold", type=float, default=THRESHOLD,
+                       help=f"Slowdown or extra bytes written that counts as a regression (default: {THRESHOLD})")
+    bench.set_defaults(func=cmd_bench)
+
+    check = sub.add_parser("check", help="Parse script files and report syntax errors")
+    check.add_argument("paths", nargs="+", help="Script files or directories (e.g. media/scripts)")
+    check.set_defaults(func=cmd_check)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    tracer = start_tracing(args.trace)
+    if tracer is None:
+        return args.func(args)
+    with span(args.command):
+        status = args.func(args)
+    tracer.save()
+    print(format_summary(tracer), file=sys.stderr)
+    print(f"trace written to {tracer.path} (open it in chrome://tracing or ui.perfetto.dev)", file=sys.stderr)
+    return status
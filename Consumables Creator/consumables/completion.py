@@ -0,0 +1,66 @@
+import bisect
+
+# Shown when no game install is configured
+DEFAULT_DISTRIBUTION_LISTS = ["CafeteriaDrinks", "ClassroomDesk", "FridgeOffice", "FridgeSoda", "SchoolLockers"]
+DEFAULT_FORAGE_CATEGORIES = ["ForestGoods", "Insects", "MedicinalPlants", "Trash"]
+SEPARATORS = ",;"
+
+
+# ===== Prefix Index =====
+# Case-insensitive type-ahead over a sorted name list. A lookup is one binary
+# search plus a short scan, so it stays far below a millisecond per keystroke.
+class PrefixIndex:
+    def __init__(self, names=()):
+        entries = sorted({(name.lower(), name) for name in names if name})
+        self.keys = [key for key, _ in entries]
+        self.names = [name for _, name in entries]
+
+    def __len__(self):
+        return len(self.names)
+
+    def complete(self, prefix, limit=10, exclude=()):
+        key = prefix.lower()
+        start = bisect.bisect_left(self.keys, key)
+        matches = []
+        for i in range(start, len(self.keys)):
+            if not self.keys[i].startswith(key):
+                break
+            if self.names[i] not in exclude:
+                matches.append(self.names[i])
+                if len(matches) == limit:
+                    break
+        return matches
+
+
+# ===== Multi-Entry Fields =====
+def current_entry(text, multiple=False):
+    # Splits a field into the finished part and the entry being typed
+    if not multiple:
+        return "", text.strip()
+    cut = max(text.rfind(sep) for sep in SEPARATORS) + 1
+    return text[:cut], text[cut:].lstrip()
+
+
+def finished_entries(head):
+    for sep in SEPARATORS[1:]:
+        head = head.replace(sep, SEPARATORS[0])
+    return {entry.strip() for entry in head.split(SEPARATORS[0]) if entry.strip()}
+
+
+def suggest(index, text, multiple=False, limit=10):
+    head, prefix = current_entry(text, multiple)
+    if not prefix:
+        return head, []
+    return head, index.complete(prefix, limit, exclude=finished_entries(head))
+
+
+def game_indexes(game):
+    if game is None:
+        return {
+            "distribution_lists": PrefixIndex(DEFAULT_DISTRIBUTION_LISTS),
+            "forage_categories": PrefixIndex(DEFAULT_FORAGE_CATEGORIES),
+        }
+    return {
+        "distribution_lists": PrefixIndex(game.distribution_lists()),
+        "forage_categories": PrefixIndex(game.forage_categories()),
+    }
@@ -0,0 +1,146 @@
+import os
+import re
+
+from .lua_file import GeneratedLuaFile
+
+LIST_RE = re.compile(r'^\s*\["(.+)"\]\s*=\s*\{\s*$')
+ENTRY_RE = re.compile(r'^\s*"(.+)",\s*([-+0-9.eE]+),\s*$')
+
+# Layout written by earlier versions: one local + two table.insert lines per pair
+LEGACY_LOCAL_RE = re.compile(r"^\s*local\s+(\w+)\s*=\s*([-+0-9.eE]+)\s*$")
+LEGACY_ITEM_RE = re.compile(r"""^\s*table\.insert\(ProceduralDistributions\[["']list["']\]\[["'](.+?)["']\]\.items,\s*"(.+?)"\);?\s*$""")
+LEGACY_CHANCE_RE = re.compile(r"""^\s*table\.insert\(ProceduralDistributions\[["']list["']\]\[["'](.+?)["']\]\.items,\s*(\w+)\s*\*\s*0\.1\);?\s*$""")
+
+
+def distributions_path(root, module_name):
+    return os.path.join(root, "media", "lua", "server", f"{module_name}_Distributions.lua")
+
+
+def format_chance(value):
+    try:
+        return repr(float(value))
+    except (TypeError, ValueError):
+        return "1.0"
+
+
+# ===== Distribution Model =====
+# All (list, item, chance) entries of one module. The Lua file is rendered from
+# the model as a single data table plus one insertion loop, so it uses one local
+# however many entries it holds.
+class DistributionModel(GeneratedLuaFile):
+    REQUIRES = [
+        "require 'Items/ProceduralDistributions'",
+        "require 'Items/Distributions'",
+    ]
+    BEGIN_MARKER = "-- BEGIN GENERATED DISTRIBUTIONS (edit the item specs, not this block)"
+    END_MARKER = "-- END GENERATED DISTRIBUTIONS"
+
+    def __init__(self, path):
+        self.lists = {}
+        super().__init__(path)
+
+    def parse_generated(self, lines):
+        current = None
+        for line in lines:
+            match = LIST_RE.match(line)
+            if match:
+                current = self.lists.setdefault(match.group(1), {})
+                continue
+            match = ENTRY_RE.match(line)
+            if match and current is not None:
+                current[match.group(1)] = match.group(2)
+
+    def parse_legacy(self, lines):
+        # Only an item insert immediately followed by its "<local> * 0.1" insert
+        # is migrated, together with the local right before it. Every other line
+        # (e.g. hand-written inserts with a literal weight) is kept verbatim and
+        # in order, so the item/weight pairs of the list stay aligned.
+        unknown = []
+        chances = {}
+        i = 0
+        while i < len(lines):
+            local = LEGACY_LOCAL_RE.match(lines[i])
+            if local:
+                chances[local.group(1)] = local.group(2)
+            start = i + 1 if local else i
+            item = LEGACY_ITEM_RE.match(lines[start]) if start < len(lines) else None
+            chance = LEGACY_CHANCE_RE.match(lines[start+1]) if item and start + 1 < len(lines) else None
+            if chance and chance.group(1) == item.group(1) and chance.group(2) in chances:
+                dist, name = item.groups()
+                self.lists.setdefault(dist, {}).setdefault(name, format_chance(chances[chance.group(2)]))
+                i = start + 2
+                continue
+            unknown.append(lines[i])
+            i += 1
+        return unknown
+
+    def add(self, dist, item, chance):
+        entries = self.lists.setdefault(dist, {})
+        if item in entries:
+            return False
+        entries[item] = format_chance(chance)
+        self.dirty = True
+        return True
+
+    def set_item(self, item, dists, chance):
+        # Puts the item in exactly these lists; entries that stay keep their position
+        chance = format_chance(chance)
+        for dist in [dist for dist, entries in self.lists.items() if item in entries and dist not in dists]:
+            del self.lists[dist][item]
+            if not self.lists[dist]:
+                del self.lists[dist]
+            self.dirty = True
+        for dist in dists:
+            entries = self.lists.setdefault(dist, {})
+            if entries.get(item) != chance:
+                entries[item] = chance
+                self.dirty = True
+
+    def render_generated(self):
+        out = ["local ItemDistributions = {"]
+        for dist, entries in self.lists.items():
+            out.append(f'    ["{dist}"] = {{')
+            out.extend(f'        "{item}", {chance},' for item, chance in entries.items())
+            out.append("    },")
+        out.extend([
+            "}",
+            "",
+            "for listName, entries in pairs(ItemDistributions) do",
+            "    local list = ProceduralDistributions.list[listName]",
+            "    if list then",
+            "        for i = 1, #entries, 2 do",
+            "            table.insert(list.items, entries[i])",
+            "            table.insert(list.items, entries[i + 1] * 0.1)",
+            "        end",
+            "    else",
+            '        print("Unknown ProceduralDistributions list: " .. tostring(listName))',
+            "    end",
+            "end",
+        ])
+        return out
+
+
+# ===== Distribution Manager =====
+class DistributionManager:
+    def __init__(self, root):
+        self.root = root
+        self.models = {}
+
+    def model(self, module_name):
+        model = self.models.get(module_name)
+        if model is None:
+            model = self.models[module_name] = DistributionModel(distributions_path(self.root, module_name))
+        return model
+
+    def add(self, module_name, item_name, dist_lists, chance):
+        model = self.model(module_name)
+        for dist in dist_lists:
+            model.add(dist, f"{module_name}.{item_name}", chance)
+
+    def set(self, module_name, item_name, dist_lists, chance):
+        model = self.model(module_name)
+        if dist_lists or os.path.exists(model.path):
+            model.set_item(f"{module_name}.{item_name}", dist_lists, chance)
+
+    def flush(self):
+        return [model.path for model in self.models.values() if model.flush()]
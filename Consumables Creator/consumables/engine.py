@@ -0,0 +1,452 @@
+import os
+
+from .distributions import DistributionManager, distributions_path
+from .fileio import io_stats, make_dirs, module_lock, remove_legacy_state
+from .foraging import ForageManager, foraging_path, parse_int
+from .item_index import ItemIndex
+from .placeholders import write_placeholders
+from .profiling import current_tracer, span
+from .schema import STAT_NAMES, validate_spec
+from .script_parser import ScriptParseError
+from .script_writer import ScriptWriter
+from .specs import STAT_FIELDS
+from .translations import DEFAULT_LANGUAGES, TranslationManager, translation_path
+
+FLUSH_EVERY = 1000
+# Bump whenever a change makes the same spec render to different output, so
+# incremental builds rebuild every item
+GENERATOR_VERSION = 2
+
+
+class GenerationError(Exception):
+    pass
+
+
+class DuplicateItemError(GenerationError):
+    pass
+
+
+# ===== Path Utilities =====
+def ensure_dir(path):
+    make_dirs(path)
+
+
+def output_dirs(root):
+    scripts_dir = os.path.join(root, "media", "scripts", "generated")
+    return {
+        "scripts": scripts_dir,
+        "items": os.path.join(scripts_dir, "items"),
+        "models": os.path.join(root, "media", "models_X", "WorldItems"),
+        "textures": os.path.join(root, "media", "textures", "WorldItems"),
+        "icons": os.path.join(root, "media", "textures"),
+    }
+
+
+def output_paths(root, spec):
+    dirs = output_dirs(root)
+    module_name = spec["module"]
+    asset_name = spec["asset"]
+    return {
+        "items": os.path.join(dirs["items"], f"{module_name}_{spec['category']}.txt"),
+        "models": os.path.join(dirs["scripts"], f"{module_name}_Models.txt"),
+        "translations": translation_path(root, module_name, "EN"),
+        "distributions": distributions_path(root, module_name),
+        "foraging": foraging_path(root, module_name),
+        "mesh": os.path.join(dirs["models"], f"{asset_name}.fbx"),
+        "texture": os.path.join(dirs["textures"], f"{asset_name}.png"),
+        "icon": os.path.join(dirs["icons"], f"Item_{asset_name}.png"),
+    }
+
+
+# ===== Model Definition =====
+def render_model_block(asset_name):
+    return f"""model {asset_name}
+{{
+    mesh = WorldItems/{asset_name},
+    texture = WorldItems/{asset_name},
+    scale = 1.0,
+}}"""
+
+
+# ===== Foraging Definition =====
+def parse_forage_counts(spec):
+    min_count = parse_int(spec["forage_min"], 1)
+    return min_count, parse_int(spec["forage_max"], min_count), parse_int(spec["forage_skill"], 0)
+
+
+# ===== Item Definition =====
+# Formatters turn a spec value into the text after "Key = ", or None to leave
+# the property out. text (no formatter) writes a non-empty value as it is.
+text = None
+
+
+def prefixed(prefix):
+    return lambda value: f"{prefix}{value}" if value else None
+
+
+def constant(value):
+    return lambda _: value
+
+
+def number(value):
+    return str(float(value)) if value else None
+
+
+def flag(value):
+    return "true" if value else None
+
+
+def item_or_nil(value):
+    return value or "nil"
+
+
+def evolved_items(recipes):
+    return ";".join(f"{recipe}:1" for recipe in recipes) or None
+
+
+# One row per script property in output order:
+# (script key, spec field, sign field, formatter, emitted only when this field is set)
+# A sign field holding "Decrease" negates the value.
+ITEM_PROPERTIES = [
+    ("DisplayCategory", "category", None, text, None),
+    ("Icon", "asset", None, prefixed("Item_"), None),
+    ("Weight", "weight", None, text, None),
+    ("ItemType", "itemtype", None, prefixed("base:"), None),
+    # Without a mode the stat is inactive, as in the window
+    *[(STAT_NAMES[stat], stat, f"{stat}_mode", text, f"{stat}_mode") for stat in STAT_FIELDS],
+    ("Carbohydrates", "carbohydrates", None, text, None),
+    ("Proteins", "proteins", None, text, None),
+    ("Lipids", "lipids", None, text, None),
+    ("Calories", "calories", None, text, None),
+    ("FoodType", "food_type", None, text, None),
+    ("EatType", "eat_type", None, text, None),
+    ("CookingSound", "cooking_sound", None, text, None),
+    ("CustomEatSound", "custom_eat_sound", None, text, None),
+    ("HerbalistType", "herbalist_type", None, text, None),
+    ("FluReduction", "flu_reduction", None, number, None),
+    ("PainReduction", "pain_reduction", None, number, None),
+    ("ReduceFoodSickness", "reduce_food_sickness", None, number, None),
+    ("ReduceInfectionPower", "reduce_infection_power", None, number, None),
+    ("PoisonPower", "poison_power", None, text, None),
+    ("UseDelta", "use_delta", None, text, None),
+    ("Tags", "tags", None, text, None),
+    ("Tooltip", "tooltip", None, text, None),
+    ("OnEat", "on_eat", None, text, None),
+    ("CustomContextMenu", "custom_context_menu", None, text, None),
+    ("DaysFresh", "days_fresh", None, text, "perishable"),
+    ("DaysTotallyRotten", "days_rotten", None, text, "perishable"),
+    ("ReplaceOnRotten", "replace_on_rotten", None, text, "perishable"),
+    ("IsCookable", None, None, constant("true"), "cookable"),
+    ("MinutesToCook", "minutes_to_cook", None, text, "cookable"),
+    ("MinutesToBurn", "minutes_to_burn", None, text, "cookable"),
+    ("ReplaceOnCooked", "replace_on_cooked", None, item_or_nil, "cookable"),
+    ("ReplaceOnUse", "replace_on_use", None, text, None),
+    ("FishingLure", "fishing_lure", None, flag, None),
+    ("DangerousUncooked", "dangerous_uncooked", None, flag, None),
+    ("BadCold", "bad_cold", None, flag, None),
+    ("BadInMicrowave", "bad_in_microwave", None, flag, None),
+    ("GoodHot", "good_hot", None, flag, None),
+    ("CantEat", "cant_eat", None, flag, None),
+    ("Medical", "medical", None, flag, None),
+    ("CannedFood", "canned_food", None, flag, None),
+    ("CantBeFrozen", "cant_be_frozen", None, flag, None),
+    ("Spice", "spice", None, flag, None),
+    ("Packaged", "packaged", None, flag, None),
+    ("RemoveUnhappinessWhenCooked", "remove_unhappiness_when_cooked", None, flag, None),
+    ("RemoveNegativeEffectOnCooked", "remove_negative_effect_on_cooked", None, flag, None),
+    ("EvolvedRecipeName", "evolved_recipe_name", None, text, None),
+    ("EvolvedItems", "evolved_recipes", None, evolved_items, "evolved_recipe_name"),
+    ("WorldStaticModel", "asset", None, text, None),
+    ("StaticModel", "asset", None, text, None),
+]
+
+
+# The table is turned into a flat list of prebuilt line prefixes once; each
+# item is then a single pass over that list.
+def compile_item_renderer(properties=ITEM_PROPERTIES):
+    compiled = [(f"    {key} = ", source, sign, formatter, when)
+                for key, source, sign, formatter, when in properties]
+
+    def render(spec):
+        lines = [f"item {spec['item']}", "{"]
+        append = lines.append
+        for prefix, source, sign, formatter, when in compiled:
+            if when is not None and not spec[when]:
+                continue
+            value = spec[source] if source is not None else None
+            if formatter is not None:
+                try:
+                    value = formatter(value)
+                except ValueError:
+                    raise GenerationError(f"{source} must be a number, got {spec[source]!r}") from None
+            if not value:
+                continue
+            if sign is not None and spec[sign] == "Decrease":
+                value = f"-{value}"
+            append(f"{prefix}{value},")
+        append("}")
+        return "\n".join(lines)
+    return render
+
+
+render_item_block = compile_item_renderer()
+
+
+# ===== Batch Generation =====
+# Script blocks are buffered per target file and flushed in batches, so a run
+# touches each category file once per FLUSH_EVERY items instead of once per item.
+class Generator:
+    def __init__(self, root, languages=DEFAULT_LANGUAGES, flush_every=FLUSH_EVERY, game=None):
+        self.root = root
+        self.dirs = output_dirs(root)
+        self.flush_every = flush_every
+        self.languages = languages
+        self.game = game
+        # None unless tracing is on; per-item stages are timed as laps
+        self.tracer = current_tracer()
+        # What the run did on disk, set by close()
+        self.io_started = io_stats.snapshot()
+        self.io = None
+        self.warnings = []
+        self.references = []
+        self.locks = {}
+        with span("setup"):
+            self.index = ItemIndex(root)
+            self.reset()
+            for key in ("scripts", "items", "models", "textures", "icons"):
+                ensure_dir(self.dirs[key])
+            remove_legacy_state(root, ".locks")
+        self.pending = 0
+        self.created = 0
+        self.updated = 0
+        self.duplicates = 0
+        self.errors = []
+
+    def reset(self):
+        self.writers = {}
+        self.translations = TranslationManager(self.root, self.languages)
+        self.distributions = DistributionManager(self.root)
+        self.foraging = ForageManager(self.root)
+
+    # ===== Module Locks =====
+    # A module's files are only touched while its advisory lock is held; locks
+    # are kept until close(). If a lock is contended, everything is flushed and
+    # released and the locks are re-acquired in sorted order, which rules out
+    # deadlocks between generator processes.
+    def lock_module(self, module_name):
+        if module_name in self.locks:
+            return
+        self.flush()
+        # Before any lock is let go, so later changes by others are seen as such
+        self.index.sync()
+        lock = module_lock(self.root, module_name)
+        if lock.acquire(blocking=False):
+            self.locks[module_name] = lock
+        else:
+            names = sorted([*self.locks, module_name])
+            self.release_locks()
+            for name in names:
+                lock = module_lock(self.root, name)
+                lock.acquire()
+                self.locks[name] = lock
+        self.reset()
+        self.index.reload()
+
+    def release_locks(self):
+        for lock in self.locks.values():
+            lock.release()
+        self.locks = {}
+
+    def writer(self, path, module_name):
+        writer = self.writers.get(path)
+        if writer is None:
+            try:
+                writer = ScriptWriter(path, module_name=module_name, declared=set(),
+                                      offsets=self.index.block_offsets(path, module_name))
+            except ScriptParseError as e:
+                raise GenerationError(str(e)) from None
+            self.writers[path] = writer
+        return writer
+
+    def check(self, spec, replace=False, validated=False):
+        # validated: the spec already passed validate_spec (check_batch/load_batch)
+        tracer = self.tracer
+        errors = [] if validated else validate_spec(spec)
+        if errors:
+            raise GenerationError("; ".join(errors))
+        if tracer:
+            tracer.lap("validation")
+        self.lock_module(spec["module"])
+        if tracer:
+            tracer.lap("module lock")
+        if not replace and self.index.has_item(spec["module"], spec["item"]):
+            raise DuplicateItemError(f"Item '{spec['item']}' already exists!")
+        if tracer:
+            tracer.lap("duplicate check")
+
+    # Per-module outputs shared by every category of the module. With replace,
+    # an item's existing entries are brought in line with the spec.
+    def add_shared(self, spec, paths, replace=False):
+        module_name = spec["module"]
+        item_name = spec["item"]
+        index = self.index
+        tracer = self.tracer
+
+        key = f"ItemName_{module_name}.{item_name}"
+        if replace:
+            self.translations.set(module_name, item_name, spec["ingame_name"], spec["translations"])
+            if not index.has_translation(key, paths["translations"]):
+                index.add_translation(paths["translations"], key)
+            else:
+                index.touch(paths["translations"])
+        elif self.translations.add(module_name, item_name, spec["ingame_name"], spec["translations"]):
+            index.add_translation(paths["translations"], key)
+        if tracer:
+            tracer.lap("translations")
+
+        if not index.has_model(module_name, spec["asset"]):
+            self.writer(paths["models"], module_name).add(render_model_block(spec["asset"]))
+            index.add_model(paths["models"], module_name, spec["asset"])
+        if tracer:
+            tracer.lap("model script")
+
+        if replace:
+            self.distributions.set(module_name, item_name, spec["distribution_lists"], spec["spawning_chance"])
+        elif spec["distribution_lists"]:
+            self.distributions.add(module_name, item_name, spec["distribution_lists"], spec["spawning_chance"])
+        if tracer:
+            tracer.lap("distributions")
+
+        if replace:
+            self.foraging.set(module_name, item_name, spec["forage_category"], *parse_forage_counts(spec))
+        elif spec["forage_category"]:
+            self.foraging.add(module_name, item_name, spec["forage_category"], *parse_forage_counts(spec))
+        if tracer:
+            tracer.lap("foraging")
+
+        index.add_item(paths["items"], module_name, item_name)
+
+    def generate(self, spec, replace=False, validated=False):
+        # Returns True when an existing item was replaced
+        tracer = self.tracer
+        if tracer:
+            tracer.start_item(item=f"{spec['module']}.{spec['item']}")
+        self.check(spec, replace, validated)
+        replace = replace and self.index.has_item(spec["module"], spec["item"])
+        block = render_item_block(spec)
+        paths = output_paths(self.root, spec)
+        if tracer:
+            tracer.lap("render")
+        item_writer = self.writer(paths["items"], spec["module"])
+
+        previous = self.index.item_file(spec["module"], spec["item"]) if replace else None
+        if replace:
+            try:
+                item_writer.check_parses()
+                if previous != paths["items"]:
+                    self.writer(previous, spec["module"]).check_parses()
+            except ScriptParseError as e:
+                raise GenerationError(f"cannot update an item in a file that does not parse: {e}") from None
+        if previous is not None and previous != paths["items"]:
+            # The category changed, so the block moves to another file
+            self.writer(previous, spec["module"]).remove("item", spec["item"])
+            self.index.remove_item(spec["module"], spec["item"])
+        self.add_shared(spec, paths, replace)
+        if replace:
+            item_writer.replace(block)
+        else:
+            item_writer.add(block)
+        if tracer:
+            tracer.lap("item block")
+        write_placeholders(paths)
+        if tracer:
+            tracer.lap("placeholders")
+            tracer.end_item()
+
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+        return previous is not None
+
+    # ===== Game Data Checks =====
+    # Names that only fail at runtime in game are reported as warnings. Item
+    # references are resolved once the batch is done, so they may point at
+    # items generated later in it.
+    def check_references(self, spec, row=None):
+        if self.game is None:
+            return
+        warnings, references = self.game.check_spec(spec)
+        self.warnings.extend((row, message) for message in warnings)
+        self.references.extend((row, *reference) for reference in references)
+
+    def resolve_references(self):
+        for row, field, value, candidates in self.references:
+            if not any(self.index.has_item(*candidate) for candidate in candidates):
+                self.warnings.append((row, f"{field} refers to unknown item '{value}'"))
+        self.references = []
+        self.warnings.sort(key=lambda warning: warning[0] or 0)
+
+    def record_error(self, row, error):
+        if isinstance(error, DuplicateItemError):
+            self.duplicates += 1
+        self.errors.append((row, str(error)))
+
+    def add(self, spec, row=None, replace=False, validated=False):
+        try:
+            replaced = self.generate(spec, replace, validated)
+        except GenerationError as e:
+            self.record_error(row, e)
+            return False
+        self.check_references(spec, row)
+        if replaced:
+            self.updated += 1
+        else:
+            self.created += 1
+        return True
+
+    def add_all(self, rows, replace=False, validated=False):
+        for row, spec in rows:
+            self.add(spec, row, replace, validated)
+
+    def flush(self):
+        with span("flush", items=self.pending):
+            for writer in self.writers.values():
+                try:
+                    writer.flush()
+                except ScriptParseError as e:
+                    # The file broke after its rows were checked; other files are still written
+                    writer.pending = []
+                    self.record_error(None, GenerationError(f"{e}; its changes were not written"))
+            self.translations.flush()
+            self.distributions.flush()
+            self.foraging.flush()
+        self.pending = 0
+
+    def close(self):
+        try:
+            with span("resolve references"):
+                self.resolve_references()
+            self.flush()
+            self.writers.clear()
+            with span("save index"):
+                self.index.save()
+        finally:
+            self.release_locks()
+            self.io = io_stats.since(self.io_started)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# ===== Generate One Item =====
+def generate_item(root, spec, game=None, replace=False):
+    # Returns the warnings and whether an existing item was updated
+    with Generator(root, game=game) as generator:
+        updated = generator.generate(spec, replace)
+        generator.check_references(spec)
+    if generator.errors:
+        raise GenerationError("; ".join(message for _, message in generator.errors))
+    return [message for _, message in generator.warnings], updated
@@ -0,0 +1,381 @@
+import os
+import shutil
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+# ===== I/O Accounting =====
+# Process-wide counters of what the generator does on disk. A run takes a
+# snapshot when it starts and reports the difference, so its totals cover the
+# reads and writes of every module it called. Whole-file reads count the file
+# size; mmap'd scripts count as read once.
+IO_FIELDS = ("files_opened", "bytes_read", "bytes_written", "files_unchanged", "files_linked", "dirs_created")
+
+
+class IOStats:
+    def __init__(self, **counts):
+        for field in IO_FIELDS:
+            setattr(self, field, counts.get(field, 0))
+
+    def snapshot(self):
+        return IOStats(**self.as_dict())
+
+    def since(self, start):
+        return IOStats(**{field: getattr(self, field) - getattr(start, field) for field in IO_FIELDS})
+
+    def add(self, counts):
+        for field in IO_FIELDS:
+            setattr(self, field, getattr(self, field) + counts.get(field, 0))
+
+    def count_read(self, f):
+        # An opened file that is read whole
+        self.files_opened += 1
+        self.bytes_read += os.fstat(f.fileno()).st_size
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in IO_FIELDS}
+
+    def summary(self):
+        return (f"{self.files_opened} file(s) opened, {format_size(self.bytes_read)} read, "
+                f"{format_size(self.bytes_written)} written, {self.files_unchanged} unchanged, "
+                f"{self.files_linked} linked, {self.dirs_created} dir(s) created")
+
+
+io_stats = IOStats()
+
+
+def format_size(value):
+    if value is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def make_dirs(path):
+    if os.path.isdir(path):
+        return
+    missing = 0
+    parent = path
+    while parent and not os.path.isdir(parent):
+        missing += 1
+        parent = os.path.dirname(parent)
+    os.makedirs(path, exist_ok=True)
+    io_stats.dirs_created += missing
+
+
+# ===== Atomic Writes =====
+# Every output goes to a temporary file in the target directory that is then
+# renamed over the target, so readers and crashes never see a partial file.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+DEFAULT_MODE = 0o666 & ~_UMASK
+COPY_CHUNK = 1024 * 1024
+
+
+def _replace(tmp, path):
+    # Windows refuses to replace a read-only target, such as a shared
+    # placeholder link that an imported image takes the place of. The target
+    # is renamed aside (allowed for read-only files) and removed once the new
+    # file is in place; removing it needs the read-only bit cleared, which
+    # other hard links of the placeholder share. POSIX renames over it as is.
+    try:
+        os.replace(tmp, path)
+        return
+    except PermissionError:
+        if os.name != "nt" or not os.path.exists(path) or os.access(path, os.W_OK):
+            raise
+    aside = f"{tmp}.old"
+    os.replace(path, aside)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        os.replace(aside, path)
+        raise
+    os.chmod(aside, stat.S_IREAD | stat.S_IWRITE)
+    os.unlink(aside)
+
+
+def _write_temp(path, fill, durable, mode=None):
+    directory = os.path.dirname(path) or "."
+    make_dirs(directory)
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # fill returns the bytes it really wrote when that is not the file size
+            written = fill(f)
+            f.flush()
+            io_stats.files_opened += 1
+            io_stats.bytes_written += f.tell() if written is None else written
+            if durable:
+                os.fsync(f.fileno())
+        if mode is None:
+            try:
+                mode = os.stat(path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = DEFAULT_MODE
+        os.chmod(tmp, mode)
+        _replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+# ===== Unchanged Content =====
+# A write whose bytes match what is already on disk is skipped, so unchanged
+# outputs keep their mtime and never show up in diffs or packager rescans.
+# Sizes are compared first; the content is only read when they match.
+def _matches(path, offset, data):
+    try:
+        if os.path.getsize(path) != offset + len(data):
+            return False
+        with open(path, "rb") as f:
+            io_stats.files_opened += 1
+            f.seek(offset)
+            view = memoryview(data)
+            pos = 0
+            while pos < len(data):
+                chunk = f.read(COPY_CHUNK)
+                io_stats.bytes_read += len(chunk)
+                if not chunk or view[pos:pos+len(chunk)] != chunk:
+                    return False
+                pos += len(chunk)
+        io_stats.files_unchanged += 1
+        return True
+    except OSError:
+        return False
+
+
+def atomic_write(path, data, durable=True, mode=None):
+    # Returns False when the file already held exactly these bytes. The file
+    # keeps its permissions unless mode is given.
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if _matches(path, 0, data):
+        return False
+    _write_temp(path, lambda f: f.write(data), durable, mode)
+    return True
+
+
+def _clone_prefix(src, dst, offset):
+    # Gives the empty temp file dst the first offset bytes of src without going
+    # through Python: a reflink shares the blocks copy-on-write (Btrfs, XFS,
+    # APFS-like filesystems), copy_file_range copies them in the kernel.
+    # Returns the bytes copied (0 for a reflink), or None if neither works.
+    device = os.fstat(src.fileno()).st_dev
+    if fcntl is not None and hasattr(fcntl, "ioctl") and device not in _no_reflink:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return 0
+        except OSError:
+            _no_reflink.add(device)
+    if not hasattr(os, "copy_file_range"):
+        return None
+    copied = 0
+    try:
+        while copied < offset:
+            count = os.copy_file_range(src.fileno(), dst.fileno(), offset - copied, copied, copied)
+            if not count:
+                break
+            copied += count
+    except OSError:
+        os.ftruncate(dst.fileno(), 0)
+        return None
+    return copied
+
+
+def atomic_splice(path, offset, data, durable=True):
+    # Keeps the first offset bytes of the file and replaces the rest with data.
+    # The prefix is cloned where the filesystem can; elsewhere it is still
+    # copied, which makes the splice cost the size of the file (appends that
+    # only move the closing brace use extend_in_place instead).
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if _matches(path, offset, data):
+        return False
+
+    def fill(f):
+        with open(path, "rb") as src:
+            io_stats.files_opened += 1
+            copied = _clone_prefix(src, f, offset)
+            if copied is None:
+                copied = 0
+                while copied < offset:
+                    chunk = src.read(min(COPY_CHUNK, offset - copied))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    copied += len(chunk)
+        io_stats.bytes_read += copied
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+        return copied + len(data)
+    _write_temp(path, fill, durable)
+    return True
+
+
+def extend_in_place(path, offset, data, durable=True):
+    # Overwrites the file from offset on with data, without a temp file or a
+    # copy of what comes before offset. Only for a caller that holds the
+    # file's lock and merely extends it: the bytes past offset are a short
+    # tail that data ends with again, so a crash can cut the new tail short
+    # but never loses earlier content. Returns None, having written nothing,
+    # for a file shared through hard links or one that cannot be opened for
+    # writing; atomic_splice handles those.
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        f = open(path, "r+b")
+    except OSError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_nlink > 1:
+            return None
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+        f.flush()
+        if durable:
+            os.fsync(f.fileno())
+    io_stats.files_opened += 1
+    io_stats.bytes_written += len(data)
+    return True
+
+
+# ===== Shared Files =====
+# Linux reflink ioctl: the clone shares the source's blocks copy-on-write, so
+# the two files can later diverge. Hard links share the inode itself.
+FICLONE = 0x40049409
+# Devices whose filesystem refused a reflink; they get hard links from then on
+_no_reflink = set()
+
+
+def _reflink(src, dst):
+    directory = os.path.dirname(dst) or "."
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(dst)}.", suffix=".tmp", dir=directory)
+    try:
+        with open(src, "rb") as f:
+            fcntl.ioctl(fd, FICLONE, f.fileno())
+            os.fchmod(fd, os.fstat(f.fileno()).st_mode & 0o777)
+        os.close(fd)
+        fd = None
+        os.link(tmp, dst)
+    finally:
+        if fd is not None:
+            os.close(fd)
+        os.unlink(tmp)
+
+
+def clone_file(src, dst):
+    # Makes dst a reflink or hard link of src; raises FileExistsError if dst
+    # exists and OSError if neither is possible (e.g. across filesystems)
+    make_dirs(os.path.dirname(dst) or ".")
+    device = os.stat(src).st_dev
+    if fcntl is not None and hasattr(fcntl, "ioctl") and device not in _no_reflink:
+        try:
+            _reflink(src, dst)
+            io_stats.files_linked += 1
+            return "reflink"
+        except FileExistsError:
+            raise
+        except OSError:
+            _no_reflink.add(device)
+    os.link(src, dst)
+    io_stats.files_linked += 1
+    return "link"
+
+
+# ===== Bookkeeping Files =====
+# The generator's own state lives next to media/, like the build manifest,
+# so none of it ships with the mod. Earlier versions kept it in
+# media/scripts/generated; each file is removed from there once its new copy
+# has been written.
+LEGACY_STATE_DIR = os.path.join("media", "scripts", "generated")
+
+
+def remove_legacy_state(root, name):
+    path = os.path.join(root, LEGACY_STATE_DIR, name)
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# ===== Advisory Locks =====
+def lock_dir(root):
+    return os.path.join(root, ".consumables_locks")
+
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.f = None
+
+    def acquire(self, blocking=True):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        f = open(self.path, "a+b")
+        try:
+            if fcntl is not None:
+                flags = fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB)
+                fcntl.flock(f.fileno(), flags)
+            else:
+                while True:
+                    try:
+                        f.seek(0)
+                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+                        time.sleep(0.05)
+        except OSError:
+            f.close()
+            if blocking:
+                raise
+            return False
+        self.f = f
+        return True
+
+    def release(self):
+        if self.f is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+            else:
+                self.f.seek(0)
+                msvcrt.locking(self.f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.f.close()
+            self.f = None
+
+    @property
+    def held(self):
+        return self.f is not None
+
+
+def module_lock(root, module_name):
+    return FileLock(os.path.join(lock_dir(root), f"{module_name}.lock"))
+
+
+@contextmanager
+def locked(lock):
+    lock.acquire()
+    try:
+        yield lock
+    finally:
+        lock.release()
@@ -0,0 +1,149 @@
+import os
+import re
+
+from .lua_file import GeneratedLuaFile
+
+CATEGORY_RE = re.compile(r'^\s*\["(.+)"\]\s*=\s*\{\s*$')
+ENTRY_RE = re.compile(r'^\s*\{\s*type\s*=\s*"(.+?)",\s*minCount\s*=\s*(-?\d+),\s*maxCount\s*=\s*(-?\d+),\s*skill\s*=\s*(-?\d+)\s*\},\s*$')
+
+# Layout written by earlier versions: a local table plus five lines per item
+LEGACY_LOCAL_RE = re.compile(r"^\s*local\s+(\w+)\s*=\s*\{\}\s*$")
+LEGACY_FIELD_RE = re.compile(r'^\s*(\w+)\.(type|minCount|maxCount|skill)\s*=\s*"?(.*?)"?\s*$')
+LEGACY_INSERT_RE = re.compile(r"^\s*table\.insert\(scavenges\.(\w+),\s*(\w+)\)\s*;?\s*$")
+
+
+def foraging_path(root, module_name):
+    return os.path.join(root, "media", "lua", "shared", "Foraging", "Categories", f"{module_name}_ForageDefinitions.lua")
+
+
+def parse_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# ===== Forage Model =====
+# Forage definitions of one module keyed by item type and grouped by scavenges
+# category. Rendered as one data table and one loop instead of a local per item.
+class ForageModel(GeneratedLuaFile):
+    REQUIRES = [
+        'require "Foraging/forageDefinitions";',
+        'require "Foraging/forageSystem";',
+    ]
+    BEGIN_MARKER = "-- BEGIN GENERATED FORAGE DEFINITIONS (edit the item specs, not this block)"
+    END_MARKER = "-- END GENERATED FORAGE DEFINITIONS"
+
+    def __init__(self, path):
+        self.categories = {}
+        self.types = {}
+        super().__init__(path)
+
+    def parse_generated(self, lines):
+        category = None
+        for line in lines:
+            match = CATEGORY_RE.match(line)
+            if match:
+                category = match.group(1)
+                continue
+            match = ENTRY_RE.match(line)
+            if match and category is not None:
+                item_type, min_count, max_count, skill = match.groups()
+                self._set(category, item_type, int(min_count), int(max_count), int(skill))
+
+    def parse_legacy(self, lines):
+        unknown = []
+        pending = {}
+        for line in lines:
+            match = LEGACY_LOCAL_RE.match(line)
+            if match:
+                pending[match.group(1)] = {}
+                continue
+            match = LEGACY_FIELD_RE.match(line)
+            if match and match.group(1) in pending:
+                var, field, value = match.groups()
+                pending[var][field] = value
+                continue
+            match = LEGACY_INSERT_RE.match(line)
+            if match and match.group(2) in pending:
+                category, var = match.groups()
+                fields = pending.pop(var)
+                if "type" in fields:
+                    min_count = parse_int(fields.get("minCount"), 1)
+                    self._set(category, fields["type"], min_count,
+                              parse_int(fields.get("maxCount"), min_count), parse_int(fields.get("skill"), 0))
+                continue
+            unknown.append(line)
+        return unknown
+
+    def _set(self, category, item_type, min_count, max_count, skill):
+        self.categories.setdefault(category, {})[item_type] = (min_count, max_count, skill)
+        self.types[item_type] = category
+
+    def add(self, category, item_type, min_count, max_count, skill):
+        if item_type in self.types:
+            return False
+        self._set(category, item_type, min_count, max_count, skill)
+        self.dirty = True
+        return True
+
+    def set_item(self, category, item_type, min_count, max_count, skill):
+        # category None drops the item; an unchanged category keeps its position
+        current = self.types.get(item_type)
+        if current is not None and current != category:
+            del self.categories[current][item_type]
+            if not self.categories[current]:
+                del self.categories[current]
+            del self.types[item_type]
+            self.dirty = True
+        if category is not None and self.categories.get(category, {}).get(item_type) != (min_count, max_count, skill):
+            self._set(category, item_type, min_count, max_count, skill)
+            self.dirty = True
+
+    def render_generated(self):
+        out = ["local ForageItems = {"]
+        for category, entries in self.categories.items():
+            out.append(f'    ["{category}"] = {{')
+            out.extend(
+                f'        {{ type = "{item_type}", minCount = {min_count}, maxCount = {max_count}, skill = {skill} }},'
+                for item_type, (min_count, max_count, skill) in entries.items())
+            out.append("    },")
+        out.extend([
+            "}",
+            "",
+            "for category, items in pairs(ForageItems) do",
+            "    local scavenge = scavenges[category]",
+            "    if scavenge then",
+            "        for _, def in ipairs(items) do",
+            "            table.insert(scavenge, def)",
+            "        end",
+            "    else",
+            '        print("Unknown scavenges category: " .. tostring(category))',
+            "    end",
+            "end",
+        ])
+        return out
+
+
+# ===== Forage Manager =====
+class ForageManager:
+    def __init__(self, root):
+        self.root = root
+        self.models = {}
+
+    def model(self, module_name):
+        model = self.models.get(module_name)
+        if model is None:
+            model = self.models[module_name] = ForageModel(foraging_path(self.root, module_name))
+        return model
+
+    def add(self, module_name, item_name, category, min_count, max_count, skill):
+        return self.model(module_name).add(category, f"{module_name}.{item_name}", min_count, max_count, skill)
+
+    def set(self, module_name, item_name, category, min_count, max_count, skill):
+        model = self.model(module_name)
+        if category or os.path.exists(model.path):
+            model.set_item(category or None, f"{module_name}.{item_name}", min_count, max_count, skill)
+
+    def flush(self):
+        return [model.path for model in self.models.values() if model.flush()]
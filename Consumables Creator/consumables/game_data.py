@@ -0,0 +1,259 @@
+import hashlib
+import os
+import re
+import sqlite3
+
+from .fileio import io_stats
+from .script_parser import ScriptFile, ScriptParseError
+
+GAME_DIR_ENV = "PZ_GAME_DIR"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER);
+CREATE TABLE IF NOT EXISTS items (
+    module TEXT, name TEXT, item_type TEXT, food_type TEXT, display_category TEXT, file TEXT);
+CREATE TABLE IF NOT EXISTS distribution_lists (name TEXT, file TEXT);
+CREATE TABLE IF NOT EXISTS forage_categories (name TEXT, file TEXT);
+CREATE INDEX IF NOT EXISTS items_name ON items (module, name);
+CREATE INDEX IF NOT EXISTS items_file ON items (file);
+CREATE INDEX IF NOT EXISTS distribution_lists_file ON distribution_lists (file);
+CREATE INDEX IF NOT EXISTS forage_categories_file ON forage_categories (file);
+"""
+DATA_TABLES = ("items", "distribution_lists", "forage_categories")
+
+# Comments, strings and braces of a Lua file, plus "Key = {" openings
+LUA_TOKEN_RE = re.compile(
+    r"""--\[(=*)\[.*?\]\1\]|--[^\n]*|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|\[(=*)\[.*?\]\2\]"""
+    r"""|(?:([A-Za-z_]\w*)|\[\s*["'](\w+)["']\s*\])\s*=\s*\{|[{}]""",
+    re.DOTALL)
+LUA_COMMENT_RE = re.compile(r"--\[(=*)\[.*?\]\1\]|--[^\n]*", re.DOTALL)
+PROCEDURAL_LIST = r"""ProceduralDistributions\s*(?:\.list|\[\s*["']list["']\s*\])"""
+PROCEDURAL_TABLE_RE = re.compile(PROCEDURAL_LIST + r"\s*=\s*\{")
+PROCEDURAL_ENTRY_RE = re.compile(PROCEDURAL_LIST + r"""\s*(?:\.(\w+)|\[\s*["'](\w+)["']\s*\])\s*=\s*\{""")
+FORAGE_CATEGORY_RE = re.compile(r"""\b(?:scavenges|forageCategories)\s*(?:\.(\w+)|\[\s*["'](\w+)["']\s*\])\s*=""")
+
+
+def cache_path(game_dir):
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha1(os.path.abspath(game_dir).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(base, "consumables", f"game-{key}.sqlite")
+
+
+def normalize_item_type(value):
+    # "base:food" (B42) and "Food" (B41) both become "food"
+    return value.rsplit(":", 1)[-1].strip().lower()
+
+
+def reference_candidates(value, module_name):
+    # A bare item name resolves against the item's own module and Base
+    ref_module, sep, item_name = value.strip().rpartition(".")
+    if sep:
+        return [(ref_module, item_name)]
+    return [(module_name, item_name), ("Base", item_name)]
+
+
+# ===== Scanners =====
+def _read_lua(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        io_stats.count_read(f)
+        return f.read()
+
+
+def _table_keys(text, start):
+    # Keys of the "Key = { ... }" entries of the table whose body starts at start
+    keys = []
+    depth = 1
+    for match in LUA_TOKEN_RE.finditer(text, start):
+        key = match.group(3) or match.group(4)
+        token = match.group()
+        if key:
+            if depth == 1:
+                keys.append(key)
+            depth += 1
+        elif token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                break
+    return keys
+
+
+def scan_script(path):
+    items = []
+    with ScriptFile(path) as script:
+        data = script.data
+        try:
+            for block in script.blocks():
+                if block.kind != "item" or block.depth != 1 or block.parent.kind != "module":
+                    continue
+                props = {key.lower(): value for key, value in block.properties(data)}
+                items.append((block.parent.name, block.name,
+                              normalize_item_type(props.get("itemtype") or props.get("type") or ""),
+                              props.get("foodtype", ""), props.get("displaycategory", "")))
+        except ScriptParseError:
+            # Keep the items declared before a syntax error
+            pass
+    return {"items": items}
+
+
+def scan_distributions(path):
+    text = _read_lua(path)
+    names = []
+    for match in PROCEDURAL_TABLE_RE.finditer(text):
+        names.extend(_table_keys(text, match.end()))
+    names.extend(match.group(1) or match.group(2) for match in PROCEDURAL_ENTRY_RE.finditer(text))
+    return {"distribution_lists": [(name,) for name in dict.fromkeys(names)]}
+
+
+def scan_foraging(path):
+    text = LUA_COMMENT_RE.sub("", _read_lua(path))
+    names = [match.group(1) or match.group(2) for match in FORAGE_CATEGORY_RE.finditer(text)]
+    return {"forage_categories": [(name,) for name in dict.fromkeys(names)]}
+
+
+def _walk(directory, suffix):
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            if name.endswith(suffix):
+                yield os.path.join(dirpath, name)
+
+
+# ===== Game Data Index =====
+# Every item, ProceduralDistributions list and forage category of a Project
+# Zomboid install, cached in SQLite. A refresh only re-reads the files whose
+# mtime or size changed since the last one.
+class GameData:
+    def __init__(self, game_dir, path=None):
+        if not os.path.isdir(os.path.join(game_dir, "media")):
+            raise FileNotFoundError(f"No media directory in game install: {game_dir}")
+        self.game_dir = game_dir
+        self.path = path or cache_path(game_dir)
+        self.rescanned = 0
+        self._sets = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(SCHEMA_VERSION):
+            with self.db:
+                for table in ("files", *DATA_TABLES):
+                    self.db.execute(f"DELETE FROM {table}")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(SCHEMA_VERSION),))
+
+    def _tracked_files(self):
+        media = os.path.join(self.game_dir, "media")
+        for path in _walk(os.path.join(media, "scripts"), ".txt"):
+            yield path, scan_script
+        for path in _walk(os.path.join(media, "lua", "server", "Items"), ".lua"):
+            yield path, scan_distributions
+        for side in ("shared", "server", "client"):
+            for path in _walk(os.path.join(media, "lua", side, "Foraging"), ".lua"):
+                yield path, scan_foraging
+
+    def refresh(self):
+        cached = {path: (mtime, size) for path, mtime, size in self.db.execute("SELECT path, mtime, size FROM files")}
+        seen = set()
+        self.rescanned = 0
+        with self.db:
+            for path, scan in self._tracked_files():
+                rel = os.path.relpath(path, self.game_dir)
+                st = os.stat(path)
+                seen.add(rel)
+                if cached.get(rel) == (st.st_mtime_ns, st.st_size):
+                    continue
+                self._forget(rel)
+                for table, rows in scan(path).items():
+                    if rows:
+                        self.db.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * (len(rows[0]) + 1))})",
+                                            [(*row, rel) for row in rows])
+                self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (rel, st.st_mtime_ns, st.st_size))
+                self.rescanned += 1
+            for rel in set(cached) - seen:
+                self._forget(rel)
+                self.db.execute("DELETE FROM files WHERE path = ?", (rel,))
+        self._sets = {}
+        return self.rescanned
+
+    def _forget(self, rel):
+        for table in DATA_TABLES:
+            self.db.execute(f"DELETE FROM {table} WHERE file = ?", (rel,))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ===== Lookups =====
+    def _set(self, query):
+        values = self._sets.get(query)
+        if values is None:
+            values = self._sets[query] = {row[0] for row in self.db.execute(query) if row[0]}
+        return values
+
+    def distribution_lists(self):
+        return self._set("SELECT DISTINCT name FROM distribution_lists")
+
+    def forage_categories(self):
+        return self._set("SELECT DISTINCT name FROM forage_categories")
+
+    def item_types(self):
+        return self._set("SELECT DISTINCT item_type FROM items")
+
+    def food_types(self):
+        return self._set("SELECT DISTINCT food_type FROM items")
+
+    def has_item(self, module_name, item_name):
+        row = self.db.execute("SELECT 1 FROM items WHERE module = ? AND name = ? LIMIT 1", (module_name, item_name))
+        return row.fetchone() is not None
+
+    def items(self, module_name=None):
+        if module_name is None:
+            return self.db.execute("SELECT module, name FROM items ORDER BY module, name").fetchall()
+        return self.db.execute("SELECT module, name FROM items WHERE module = ? ORDER BY name", (module_name,)).fetchall()
+
+    def counts(self):
+        return {table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in DATA_TABLES}
+
+    # ===== Validation =====
+    # Names the game would only reject at runtime. Unresolved item references
+    # are returned separately as (field, value, candidates) since they may
+    # point at items generated later in the same batch.
+    def check_spec(self, spec):
+        warnings = []
+        lists = self.distribution_lists()
+        for name in spec["distribution_lists"]:
+            if lists and name not in lists:
+                warnings.append(f"unknown distribution list '{name}'")
+        categories = self.forage_categories()
+        if categories and spec["forage_category"] and spec["forage_category"] not in categories:
+            warnings.append(f"unknown forage category '{spec['forage_category']}'")
+        item_types = self.item_types()
+        if item_types and normalize_item_type(spec["itemtype"]) not in item_types:
+            warnings.append(f"unknown item type '{spec['itemtype']}'")
+        food_types = self.food_types()
+        if food_types and spec["food_type"] and spec["food_type"] not in food_types:
+            warnings.append(f"unknown food type '{spec['food_type']}'")
+
+        references = []
+        for field in ("replace_on_rotten", "replace_on_cooked", "replace_on_use"):
+            if spec[field]:
+                candidates = reference_candidates(spec[field], spec["module"])
+                if not any(self.has_item(*candidate) for candidate in candidates):
+                    references.append((field, spec[field], candidates))
+        return warnings, references
+
+
+def open_game_data(game_dir=None):
+    game_dir = game_dir or os.environ.get(GAME_DIR_ENV)
+    if not game_dir:
+        return None
+    game = GameData(game_dir)
+    game.refresh()
+    return game
@@ -0,0 +1,322 @@
+import json
+import os
+import re
+
+from .fileio import FileLock, atomic_write, io_stats, lock_dir, locked, remove_legacy_state
+from .script_parser import ScriptFile, ScriptParseError
+from .script_writer import block_key
+
+INDEX_VERSION = 5
+INDEX_FILE = ".consumables_index.jsonl"
+LEGACY_INDEX_FILE = ".consumables_index.json"
+# The journal is rewritten instead of appended to when that would make it
+# this many bytes larger than half again its size when it was last rewritten
+COMPACT_SLACK = 256 * 1024
+
+_DECODER = json.JSONDecoder()
+TRANSLATION_RE = re.compile(r"^\s*(ItemName_[^\s.=]+\.[^\s=]+)\s*=", re.MULTILINE)
+
+
+def index_path(root):
+    # Next to media/, outside the files the game loads
+    return os.path.join(root, INDEX_FILE)
+
+
+def _stat(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _scan_script(path):
+    entry = {"module": "", "item": [], "model": [], "translation": [], "offsets": {}}
+    with ScriptFile(path) as script:
+        try:
+            for block in script.blocks():
+                if block.depth == 0 and block.kind == "module":
+                    entry["module"] = entry["module"] or block.name
+                elif block.depth == 1 and block.kind in ("item", "model") and block.parent.kind == "module":
+                    entry["module"] = entry["module"] or block.parent.name
+                    entry[block.kind].append(block.name)
+                    entry["offsets"][block_key(block.kind, block.name)] = (block.start, block.end)
+        except ScriptParseError:
+            # A broken hand-edited file still contributes what it declares
+            # before the syntax error, but its block offsets are not trusted
+            entry["offsets"] = None
+    return entry
+
+
+def _scan_translation(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        io_stats.count_read(f)
+        content = f.read()
+    return {"module": "", "item": [], "model": [], "translation": TRANSLATION_RE.findall(content)}
+
+
+# The sidecar stores a script's block spans as one flat list of small numbers,
+# a (gap after the previous block, length) pair per name in the order of its
+# item and model lists. They are only decoded for the files being written.
+def _encode_offsets(entry):
+    offsets = entry.get("offsets")
+    if not isinstance(offsets, dict):
+        return offsets
+    flat = []
+    position = 0
+    for kind in ("item", "model"):
+        for name in entry[kind]:
+            span = offsets.get(block_key(kind, name))
+            if span is None:
+                return None
+            flat += [span[0] - position, span[1] - span[0]]
+            position = span[1]
+    return flat
+
+
+def _decode_offsets(entry):
+    flat = entry.get("offsets")
+    if not isinstance(flat, list):
+        return flat
+    keys = [block_key(kind, name) for kind in ("item", "model") for name in entry[kind]]
+    if len(flat) != 2 * len(keys):
+        return None
+    offsets = {}
+    position = 0
+    for i, key in enumerate(keys):
+        start = position + flat[2*i]
+        position = start + flat[2*i+1]
+        offsets[key] = (start, position)
+    return offsets
+
+
+# ===== Persistent Item-Name Index =====
+# Maps every item, model and ItemName_ translation key declared under media/ to
+# the file that declares it. Entries are cached in a sidecar journal and only
+# files whose mtime or size changed since the last run are re-read. Script
+# entries also hold the byte span of every item and model block, which the
+# script writers keep current so an update can splice a block in place.
+#
+# The journal is a version line followed by one [path, entry] line per saved
+# entry ([path, null] for a file that is gone); later lines win. A save only
+# appends the entries it changed, and the journal is rewritten from its live
+# entries when it has grown too large or is missing or outdated. Only the
+# last line of each path is decoded in full.
+class ItemIndex:
+    def __init__(self, root):
+        self.root = root
+        self.path = index_path(root)
+        self.files = {}
+        self.items = {}
+        self.models = {}
+        self.translations = {}
+        self.dirty = set()
+        # Journal size as read and as last rewritten; None to rewrite it
+        self.size = None
+        self.compacted = None
+        self.load()
+
+    def _tracked_files(self):
+        scripts_dir = os.path.join(self.root, "media", "scripts", "generated")
+        translate_dir = os.path.join(self.root, "media", "lua", "shared", "translate")
+        for dirpath, _, filenames in os.walk(scripts_dir):
+            for name in filenames:
+                if name.endswith(".txt"):
+                    yield os.path.join(dirpath, name), _scan_script
+        if os.path.isdir(translate_dir):
+            for lang in os.listdir(translate_dir):
+                lang_dir = os.path.join(translate_dir, lang)
+                if not os.path.isdir(lang_dir):
+                    continue
+                for name in os.listdir(lang_dir):
+                    if "_ItemName_" in name and name.endswith(".txt"):
+                        yield os.path.join(lang_dir, name), _scan_translation
+
+    def _read_cache(self):
+        self.size = None
+        try:
+            with open(self.path, "rb") as f:
+                io_stats.count_read(f)
+                data = f.read()
+            lines = data.decode("utf-8").splitlines()
+            header = json.loads(lines[0]) if lines else {}
+            if header.get("version") != INDEX_VERSION:
+                return {}
+        except (OSError, ValueError, AttributeError):
+            return {}
+        latest = {}
+        for line in lines[1:]:
+            try:
+                rel = _DECODER.raw_decode(line, 1)[0]
+            except ValueError:
+                continue
+            latest[rel] = line
+        files = {}
+        for line in latest.values():
+            try:
+                rel, entry = json.loads(line)
+            except (ValueError, TypeError):
+                # Cut short by a crash; the file it described is scanned again
+                continue
+            if entry is not None:
+                files[rel] = entry
+        self.size = len(data)
+        self.compacted = header.get("size", 0)
+        return files
+
+    def load(self, cached=None):
+        # Entries come from the sidecar unless given
+        if cached is None:
+            cached = self._read_cache()
+        self.files = {}
+        self.items = {}
+        self.models = {}
+        self.translations = {}
+
+        for path, scan in self._tracked_files():
+            rel = os.path.relpath(path, self.root)
+            mtime, size = _stat(path)
+            entry = cached.get(rel)
+            if entry is None or entry.get("mtime") != mtime or entry.get("size") != size:
+                entry = scan(path)
+                entry["mtime"], entry["size"] = mtime, size
+                self.dirty.add(rel)
+            self.files[rel] = entry
+        # Files that are gone are saved as such
+        self.dirty.update(set(cached) - set(self.files))
+
+        for rel, entry in self.files.items():
+            for name in entry["item"]:
+                self.items.setdefault((entry["module"], name), rel)
+            for name in entry["model"]:
+                self.models.setdefault((entry["module"], name), rel)
+            for key in entry["translation"]:
+                self.translations.setdefault(key, set()).add(rel)
+
+    # Between module locks a generator records the stat of what it wrote and
+    # reloads from memory, so only files changed by other processes are read
+    # again, and the sidecar is not decoded once per module.
+    def sync(self):
+        for rel in self.dirty:
+            self._restat(rel)
+
+    def reload(self):
+        self.load(self.files)
+
+    # ===== Lookups =====
+    def item_file(self, module_name, item_name):
+        rel = self.items.get((module_name, item_name))
+        return os.path.join(self.root, rel) if rel else None
+
+    def has_item(self, module_name, item_name):
+        return (module_name, item_name) in self.items
+
+    def has_model(self, module_name, model_name):
+        return (module_name, model_name) in self.models
+
+    def has_translation(self, key, path=None):
+        files = self.translations.get(key)
+        if not files:
+            return False
+        return path is None or os.path.relpath(path, self.root) in files
+
+    # ===== Updates =====
+    def _entry(self, path, module_name=""):
+        rel = os.path.relpath(path, self.root)
+        entry = self.files.get(rel)
+        if entry is None:
+            entry = self.files[rel] = {"module": module_name, "item": [], "model": [], "translation": []}
+        self.dirty.add(rel)
+        return rel, entry
+
+    def add_item(self, path, module_name, item_name):
+        rel, entry = self._entry(path, module_name)
+        if self.items.get((module_name, item_name)) != rel:
+            entry["item"].append(item_name)
+        self.items[(module_name, item_name)] = rel
+
+    def remove_item(self, module_name, item_name):
+        rel = self.items.pop((module_name, item_name), None)
+        if rel is not None:
+            entry = self.files[rel]
+            entry["item"] = [name for name in entry["item"] if name != item_name]
+            self.dirty.add(rel)
+
+    def add_model(self, path, module_name, model_name):
+        rel, entry = self._entry(path, module_name)
+        entry["model"].append(model_name)
+        self.models[(module_name, model_name)] = rel
+
+    def block_offsets(self, path, module_name):
+        # The span map a ScriptWriter for path keeps up to date, or None when
+        # the file could not be parsed
+        rel, entry = self._entry(path, module_name)
+        offsets = entry.setdefault("offsets", {})
+        if isinstance(offsets, list):
+            offsets = entry["offsets"] = _decode_offsets(entry)
+        return offsets
+
+    def add_offsets(self, path, module_name, spans):
+        # Blocks another process appended after the ones already recorded
+        offsets = self.block_offsets(path, module_name)
+        if offsets is not None:
+            offsets.update(spans)
+
+    def touch(self, path):
+        # A tracked file rewritten with the same keys; its stat is taken again on save
+        rel = os.path.relpath(path, self.root)
+        if rel in self.files:
+            self.dirty.add(rel)
+
+    def add_translation(self, path, key):
+        rel, entry = self._entry(path)
+        entry["translation"].append(key)
+        self.translations.setdefault(key, set()).add(rel)
+
+    def _restat(self, rel):
+        # False when the file is gone
+        entry = self.files.get(rel)
+        path = os.path.join(self.root, rel) if entry is not None else None
+        if path is None or not os.path.exists(path):
+            return False
+        entry["mtime"], entry["size"] = _stat(path)
+        return True
+
+    # Other generator processes may have saved their own files in the meantime,
+    # so only the entries this instance touched are added to the journal.
+    def save(self):
+        if not self.dirty:
+            return
+        records = []
+        for rel in sorted(self.dirty):
+            if self._restat(rel):
+                entry = self.files[rel]
+                records.append([rel, {**entry, "offsets": _encode_offsets(entry)} if "offsets" in entry else entry])
+            else:
+                self.files.pop(rel, None)
+                records.append([rel, None])
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode("utf-8")
+        with locked(FileLock(os.path.join(lock_dir(self.root), "index.lock"))):
+            if self.size is None or self.size + len(data) > 3 * self.compacted // 2 + COMPACT_SLACK:
+                self._compact(records)
+            else:
+                with open(self.path, "ab") as f:
+                    f.write(data)
+                io_stats.files_opened += 1
+                io_stats.bytes_written += len(data)
+                self.size += len(data)
+        self.dirty.clear()
+
+    def _compact(self, records):
+        # Rewrites the journal with one line per live entry, its own records
+        # applied over what the journal holds
+        files = self._read_cache()
+        for rel, entry in records:
+            if entry is None:
+                files.pop(rel, None)
+            else:
+                files[rel] = entry
+        body = "".join(json.dumps([rel, entry], separators=(",", ":")) + "\n" for rel, entry in files.items())
+        body = body.encode("utf-8")
+        data = json.dumps({"version": INDEX_VERSION, "size": len(body)}).encode("utf-8") + b"\n" + body
+        atomic_write(self.path, data)
+        self.size = len(data)
+        self.compacted = len(body)
+        remove_legacy_state(self.root, LEGACY_INDEX_FILE)
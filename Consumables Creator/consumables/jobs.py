@@ -0,0 +1,116 @@
+import queue
+import threading
+
+from .completion import game_indexes
+from .engine import GenerationError, Generator, generate_item
+from .fileio import io_stats
+from .game_data import open_game_data
+from .schema import check_batch
+from .specs import iter_specs
+from .translations import DEFAULT_LANGUAGES
+
+MAX_LISTED_PROBLEMS = 5
+
+
+# ===== Background Jobs =====
+# Runs a function on a worker thread. The function is called with progress and
+# cancelled keyword arguments; what it reports ends up on a queue that the GUI
+# drains from the mainloop, since Tk widgets may only be touched from there.
+class Job:
+    def __init__(self, target, *args):
+        self.target = target
+        self.args = args
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def running(self):
+        return self.thread.is_alive()
+
+    def progress(self, done, total):
+        self.events.put(("progress", done, total))
+
+    def _run(self):
+        try:
+            result = self.target(*self.args, progress=self.progress, cancelled=self.cancel_event.is_set)
+        except Exception as e:
+            # Any failure is shown in the GUI instead of dying with the thread
+            self.events.put(("error", e))
+        else:
+            self.events.put(("done", result))
+
+    def drain(self):
+        # Everything reported since the last call, without blocking
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+# ===== Generation Jobs =====
+# The game data index is opened in the worker: SQLite connections belong to
+# the thread that made them, and the refresh is file I/O the GUI should not wait on.
+def create_item(root, spec, replace=False, progress=None, cancelled=None):
+    # Returns the warnings, whether an existing item was updated (replace
+    # allows that) and what generating the item, game data refresh included,
+    # did on disk
+    io_started = io_stats.snapshot()
+    game = open_game_data()
+    try:
+        warnings, updated = generate_item(root, spec, game=game, replace=replace)
+        io = io_stats.since(io_started)
+    finally:
+        if game is not None:
+            game.close()
+    if progress is not None:
+        progress(1, 1)
+    return warnings, updated, io
+
+
+def load_completions(progress=None, cancelled=None):
+    # Completion lists of the install in PZ_GAME_DIR; on a cold cache the
+    # refresh walks and parses the whole install
+    game = open_game_data()
+    try:
+        return game_indexes(game)
+    finally:
+        if game is not None:
+            game.close()
+
+
+def generate_file(root, path, languages=DEFAULT_LANGUAGES, progress=None, cancelled=None):
+    # Returns the generator and whether the job was cancelled part way
+    total, problems = check_batch(path)
+    if problems:
+        listed = "; ".join(f"row {row}: {message}" for row, message in problems[:MAX_LISTED_PROBLEMS])
+        more = f" (and {len(problems) - MAX_LISTED_PROBLEMS} more)" if len(problems) > MAX_LISTED_PROBLEMS else ""
+        raise GenerationError(f"{len(problems)} error(s), nothing was generated: {listed}{more}")
+    game = open_game_data()
+    stopped = False
+    try:
+        with Generator(root, languages=languages, game=game) as generator:
+            for done, (row, spec) in enumerate(iter_specs(path), start=1):
+                if cancelled is not None and cancelled():
+                    stopped = True
+                    break
+                generator.add(spec, row, validated=True)
+                if progress is not None:
+                    progress(done, total)
+    finally:
+        if game is not None:
+            game.close()
+    return generator, stopped
@@ -0,0 +1,71 @@
+import os
+
+from .fileio import atomic_write, io_stats
+
+
+# ===== Generated Lua File =====
+# Base for Lua files that are rebuilt from an in-memory model. The generated
+# part lives between BEGIN/END markers; requires are rewritten at the top and
+# any hand-written lines outside the markers are kept as they are.
+class GeneratedLuaFile:
+    REQUIRES = []
+    BEGIN_MARKER = ""
+    END_MARKER = ""
+
+    def __init__(self, path):
+        self.path = path
+        self.before = []
+        self.after = []
+        self.dirty = False
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            io_stats.count_read(f)
+            lines = f.read().splitlines()
+
+        if self.BEGIN_MARKER in lines and self.END_MARKER in lines:
+            begin = lines.index(self.BEGIN_MARKER)
+            end = lines.index(self.END_MARKER)
+            self.parse_generated(lines[begin+1:end])
+            self.before = self._strip_requires(lines[:begin])
+            self.after = self._strip_requires(lines[end+1:])
+        else:
+            self.after = self._strip_requires(self.parse_legacy(lines))
+            self.dirty = True
+
+    def _strip_requires(self, lines):
+        lines = [line for line in lines if line.strip() not in self.REQUIRES]
+        while lines and not lines[0].strip():
+            lines.pop(0)
+        while lines and not lines[-1].strip():
+            lines.pop()
+        return lines
+
+    def parse_generated(self, lines):
+        raise NotImplementedError
+
+    def parse_legacy(self, lines):
+        # Returns the lines that were not understood, to be kept verbatim
+        return lines
+
+    def render_generated(self):
+        raise NotImplementedError
+
+    def render(self):
+        out = [*self.REQUIRES, ""]
+        if self.before:
+            out.extend([*self.before, ""])
+        out.append(self.BEGIN_MARKER)
+        out.extend(self.render_generated())
+        out.append(self.END_MARKER)
+        if self.after:
+            out.extend(["", *self.after])
+        return "\n".join(out) + "\n"
+
+    def flush(self):
+        if not self.dirty:
+            return False
+        self.dirty = False
+        return atomic_write(self.path, self.render())
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+
+from .engine import GENERATOR_VERSION
+from .fileio import atomic_write, io_stats
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = ".consumables_build.json"
+# Outputs recorded per item; placeholders and imported art are left to their
+# own stages
+RECORDED_OUTPUTS = (".txt", ".lua")
+
+
+def manifest_path(root):
+    # Next to media/, outside the files the game loads
+    return os.path.join(root, MANIFEST_FILE)
+
+
+def raw_hash(raw):
+    # repr keeps the row's own key order, so reordering JSON keys rebuilds the item
+    return hashlib.sha1(repr(raw).encode("utf-8")).hexdigest()
+
+
+# ===== Build Manifest =====
+# Remembers, for every item built from a spec file, the hash of its raw spec
+# row and the output files it fed. A row whose hash is known (and whose
+# outputs still exist) is skipped before it is even validated, and a spec file
+# whose mtime and size are unchanged is not read at all. Any change to the
+# generator version or the languages rebuilds every item.
+class BuildManifest:
+    def __init__(self, root, languages):
+        self.root = root
+        self.path = manifest_path(root)
+        self.settings = {"generator": GENERATOR_VERSION, "languages": sorted(languages)}
+        self.items = {}
+        self.hashes = {}
+        self.sources = {}
+        self.dirty = False
+        self._exists = {}
+        self._relative = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                io_stats.count_read(f)
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            self.dirty = True
+            return
+        # Other settings rebuild every item, but which items came from which
+        # spec file is kept
+        current = data.get("settings") == self.settings
+        # Items fed by the same files share one outputs tuple
+        files = data["files"]
+        shared = {}
+        for key, (digest, source, numbers) in data["items"].items():
+            outputs = shared.get(numbers)
+            if outputs is None:
+                outputs = shared[numbers] = tuple(files[int(i)] for i in numbers.split(",") if i)
+            if current and digest is not None:
+                self.items[key] = (digest, source, outputs)
+                self.hashes[digest] = key
+            else:
+                self.items[key] = (None, source, outputs)
+        if current:
+            self.sources = {source: tuple(stat) for source, stat in data["sources"].items()}
+        else:
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        numbers = {}
+        encoded = {}
+        items = {}
+        for key, (digest, source, outputs) in self.items.items():
+            value = encoded.get(outputs)
+            if value is None:
+                value = encoded[outputs] = ",".join(str(numbers.setdefault(rel, len(numbers))) for rel in outputs)
+            items[key] = [digest, source, value]
+        data = {"version": MANIFEST_VERSION, "settings": self.settings,
+                "sources": self.sources, "files": list(numbers), "items": items}
+        atomic_write(self.path, json.dumps(data, separators=(",", ":")))
+        self.dirty = False
+
+    def _outputs_exist(self, outputs):
+        exists = self._exists.get(outputs)
+        if exists is None:
+            exists = self._exists[outputs] = all(os.path.exists(os.path.join(self.root, rel)) for rel in outputs)
+        return exists
+
+    # ===== Lookups =====
+    def built(self, digest):
+        # The item a raw spec row was built as, if it is still built
+        key = self.hashes.get(digest)
+        if key is None or not self._outputs_exist(self.items[key][2]):
+            return None
+        return key
+
+    def source_keys(self, source):
+        return {key for key, (_, item_source, _) in self.items.items() if item_source == source}
+
+    def source_unchanged(self, source):
+        try:
+            st = os.stat(source)
+        except OSError:
+            return False
+        if self.sources.get(source) != (st.st_mtime_ns, st.st_size):
+            return False
+        return all(self._outputs_exist(outputs) for _, item_source, outputs in self.items.values()
+                   if item_source == source)
+
+    # ===== Updates =====
+    def _relpath(self, path):
+        rel = self._relative.get(path)
+        if rel is None:
+            rel = self._relative[path] = os.path.relpath(path, self.root)
+        return rel
+
+    def record(self, key, digest, source, outputs):
+        previous = self.items.get(key)
+        if previous is not None:
+            self.hashes.pop(previous[0], None)
+        self.items[key] = (digest, source, tuple(sorted(self._relpath(path) for path in outputs
+                                                        if path.endswith(RECORDED_OUTPUTS))))
+        self.hashes[digest] = key
+        self.dirty = True
+
+    def forget(self, key):
+        previous = self.items.pop(key, None)
+        if previous is not None:
+            self.hashes.pop(previous[0], None)
+            self.dirty = True
+
+    def record_source(self, source):
+        try:
+            st = os.stat(source)
+        except OSError:
+            self.sources.pop(source, None)
+        else:
+            self.sources[source] = (st.st_mtime_ns, st.st_size)
+        self.dirty = True
+
+    def outputs(self, key):
+        entry = self.items.get(key)
+        return {os.path.join(self.root, rel) for rel in entry[2]} if entry else set()
@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import DuplicateItemError, GenerationError, output_paths, render_item_block, write_placeholders
+from .fileio import io_stats
+from .profiling import span
+from .script_parser import ScriptParseError
+from .script_writer import ScriptWriter
+
+
+# ===== Shard Worker =====
+# Runs in a worker process. The worker exclusively owns one category script
+# file and the placeholder assets assigned to it. Its I/O counts and the spans
+# of the blocks it appended are handed back to the parent's totals and index.
+def generate_shard(root, item_file, module_name, rows, owned_assets):
+    io_started = io_stats.snapshot()
+    blocks = []
+    done = []
+    errors = []
+    for row, spec in rows:
+        try:
+            blocks.append(render_item_block(spec))
+        except GenerationError as e:
+            errors.append((row, str(e)))
+            continue
+        done.append(row)
+
+    try:
+        writer = ScriptWriter(item_file, module_name=module_name, declared=set(), offsets={})
+    except ScriptParseError as e:
+        return item_file, [], errors + [(row, str(e)) for row in done], [], {}, io_stats.since(io_started).as_dict()
+    for block in blocks:
+        writer.add(block)
+    writer.flush()
+
+    created_assets = []
+    specs = dict(rows)
+    for row in done:
+        asset_name = specs[row]["asset"]
+        if asset_name in owned_assets and asset_name not in created_assets:
+            write_placeholders(output_paths(root, specs[row]))
+            created_assets.append(asset_name)
+    return item_file, done, errors, created_assets, writer.offsets, io_stats.since(io_started).as_dict()
+
+
+# ===== Parallel Generation =====
+# Splits a batch by target category file and generates each shard in a worker
+# process. Per-module shared outputs (models, translations, distributions,
+# foraging and the name index) are merged by the parent once the shards are done.
+def generate_parallel(generator, rows, workers=None, validated=False):
+    shards = {}
+    asset_owner = {}
+    seen = set()
+    with span("check", items=len(rows)):
+        for row, spec in rows:
+            try:
+                generator.check(spec, validated=validated)
+                if (spec["module"], spec["item"]) in seen:
+                    raise DuplicateItemError(f"Item '{spec['item']}' already exists!")
+            except GenerationError as e:
+                generator.record_error(row, e)
+                continue
+            seen.add((spec["module"], spec["item"]))
+            item_file = output_paths(generator.root, spec)["items"]
+            shards.setdefault(item_file, (spec["module"], []))[1].append((row, spec))
+            asset_owner.setdefault(spec["asset"], item_file)
+
+    owned = {}
+    for asset_name, item_file in asset_owner.items():
+        owned.setdefault(item_file, set()).add(asset_name)
+
+    done_rows = []
+    created_assets = set()
+    with span("shards", shards=len(shards)):
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [
+                pool.submit(generate_shard, generator.root, item_file, module_name, shard_rows, owned.get(item_file, set()))
+                for item_file, (module_name, shard_rows) in shards.items()
+            ]
+            for future in futures:
+                item_file, done, errors, assets, offsets, io = future.result()
+                io_stats.add(io)
+                generator.index.add_offsets(item_file, shards[item_file][0], offsets)
+                created_assets.update(assets)
+                generator.errors.extend(errors)
+                specs = dict(shards[item_file][1])
+                done_rows.extend((row, specs[row]) for row in done)
+
+    # Merge in input order so the shared files match a serial run byte for byte
+    with span("merge", items=len(done_rows)):
+        done_rows.sort(key=lambda pair: pair[0])
+        generator.errors.sort(key=lambda error: error[0])
+        for row, spec in done_rows:
+            paths = output_paths(generator.root, spec)
+            generator.add_shared(spec, paths)
+            generator.check_references(spec, row)
+            if spec["asset"] not in created_assets:
+                write_placeholders(paths)
+                created_assets.add(spec["asset"])
+            generator.created += 1
+
+    generator.flush()
@@ -0,0 +1,236 @@
+import os
+import struct
+import zlib
+
+from .fileio import atomic_write, clone_file
+
+ICON_SIZE = 32
+TEXTURE_SIZE = 64
+CHECKER = 8
+# Magenta and black, the usual "art missing" pattern
+COLORS = ((255, 0, 255, 255), (0, 0, 0, 255))
+MESH_HALF_SIZE = 0.1
+
+
+# ===== PNG =====
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def render_png(size, checker=CHECKER, colors=COLORS):
+    # 8-bit RGBA, one filter byte (none) in front of every row
+    rows = []
+    for y in range(size):
+        row = bytearray(b"\0")
+        for x in range(size):
+            row += bytes(colors[(x // checker + y // checker) % 2])
+        rows.append(bytes(row))
+    header = struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", header)
+            + _chunk(b"IDAT", zlib.compress(b"".join(rows), 9)) + _chunk(b"IEND", b""))
+
+
+# ===== Mesh =====
+# A textured cube as an ASCII FBX 7.3 file, with per-corner normals and UVs
+# so the item's texture maps onto every face.
+CUBE_FACES = [
+    ((0, 0, 1), [(-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)]),
+    ((0, 0, -1), [(1, -1, -1), (-1, -1, -1), (-1, 1, -1), (1, 1, -1)]),
+    ((1, 0, 0), [(1, -1, 1), (1, -1, -1), (1, 1, -1), (1, 1, 1)]),
+    ((-1, 0, 0), [(-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1)]),
+    ((0, 1, 0), [(-1, 1, 1), (1, 1, 1), (1, 1, -1), (-1, 1, -1)]),
+    ((0, -1, 0), [(-1, -1, -1), (1, -1, -1), (1, -1, 1), (-1, -1, 1)]),
+]
+CUBE_UVS = [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+FBX_TEMPLATE = """; FBX 7.3.0 project file
+FBXHeaderExtension:  {{
+	FBXHeaderVersion: 1003
+	FBXVersion: 7300
+	Creator: "Consumables Creator placeholder"
+}}
+GlobalSettings:  {{
+	Version: 1000
+	Properties70:  {{
+		P: "UpAxis", "int", "Integer", "",1
+		P: "UpAxisSign", "int", "Integer", "",1
+		P: "FrontAxis", "int", "Integer", "",2
+		P: "FrontAxisSign", "int", "Integer", "",1
+		P: "CoordAxis", "int", "Integer", "",0
+		P: "CoordAxisSign", "int", "Integer", "",1
+		P: "UnitScaleFactor", "double", "Number", "",1
+	}}
+}}
+Definitions:  {{
+	Version: 100
+	Count: 3
+	ObjectType: "Model" {{
+		Count: 1
+	}}
+	ObjectType: "Geometry" {{
+		Count: 1
+	}}
+	ObjectType: "Material" {{
+		Count: 1
+	}}
+}}
+Objects:  {{
+	Geometry: 1000, "Geometry::Placeholder", "Mesh" {{
+		Vertices: *{vertex_count} {{
+			a: {vertices}
+		}}
+		PolygonVertexIndex: *{index_count} {{
+			a: {indices}
+		}}
+		GeometryVersion: 124
+		LayerElementNormal: 0 {{
+			Version: 101
+			Name: ""
+			MappingInformationType: "ByPolygonVertex"
+			ReferenceInformationType: "Direct"
+			Normals: *{normal_count} {{
+				a: {normals}
+			}}
+		}}
+		LayerElementUV: 0 {{
+			Version: 101
+			Name: "UVMap"
+			MappingInformationType: "ByPolygonVertex"
+			ReferenceInformationType: "IndexToDirect"
+			UV: *{uv_count} {{
+				a: {uvs}
+			}}
+			UVIndex: *{index_count} {{
+				a: {uv_indices}
+			}}
+		}}
+		LayerElementMaterial: 0 {{
+			Version: 101
+			Name: ""
+			MappingInformationType: "AllSame"
+			ReferenceInformationType: "IndexToDirect"
+			Materials: *1 {{
+				a: 0
+			}}
+		}}
+		Layer: 0 {{
+			Version: 100
+			LayerElement:  {{
+				Type: "LayerElementNormal"
+				TypedIndex: 0
+			}}
+			LayerElement:  {{
+				Type: "LayerElementUV"
+				TypedIndex: 0
+			}}
+			LayerElement:  {{
+				Type: "LayerElementMaterial"
+				TypedIndex: 0
+			}}
+		}}
+	}}
+	Model: 2000, "Model::Placeholder", "Mesh" {{
+		Version: 232
+		Properties70:  {{
+		}}
+		Shading: T
+		Culling: "CullingOff"
+	}}
+	Material: 3000, "Material::Placeholder", "" {{
+		Version: 102
+		ShadingModel: "lambert"
+		MultiLayer: 0
+		Properties70:  {{
+			P: "DiffuseColor", "Color", "", "A",1,1,1
+		}}
+	}}
+}}
+Connections:  {{
+	C: "OO",2000,0
+	C: "OO",1000,2000
+	C: "OO",3000,2000
+}}
+"""
+
+
+def _numbers(values):
+    return ",".join(f"{value:g}" for value in values)
+
+
+def render_fbx(half_size=MESH_HALF_SIZE):
+    vertices, indices, normals, uv_indices = [], [], [], []
+    for normal, corners in CUBE_FACES:
+        first = len(vertices) // 3
+        for corner in corners:
+            vertices.extend(axis * half_size for axis in corner)
+            normals.extend(normal)
+        # The last index of every polygon is stored as -(index + 1)
+        indices.extend([first, first + 1, first + 2, -(first + 3) - 1])
+        uv_indices.extend(range(len(CUBE_UVS)))
+    uvs = [value for uv in CUBE_UVS for value in uv]
+    return FBX_TEMPLATE.format(
+        vertex_count=len(vertices), vertices=_numbers(vertices),
+        index_count=len(indices), indices=_numbers(indices),
+        normal_count=len(normals), normals=_numbers(normals),
+        uv_count=len(uvs), uvs=_numbers(uvs), uv_indices=_numbers(uv_indices),
+    ).encode("ascii")
+
+
+# ===== Shared Placeholder Files =====
+# Every placeholder of a kind has the same bytes, so each is rendered once per
+# process and the first file written for it is cloned (reflink) or hard linked
+# for every later item. The shared file is made read-only: an in-place edit of
+# a hard link would change every item at once, so real art has to replace the
+# file, which gives that item its own inode.
+RENDERERS = {
+    "mesh": render_fbx,
+    "texture": lambda: render_png(TEXTURE_SIZE),
+    "icon": lambda: render_png(ICON_SIZE),
+}
+READ_ONLY = 0o444
+_content = {}
+_sources = {}
+
+
+def placeholder_content(kind):
+    data = _content.get(kind)
+    if data is None:
+        data = _content[kind] = RENDERERS[kind]()
+    return data
+
+
+def _source(kind):
+    # The cached source is only reused while it is still the file we wrote
+    cached = _sources.get(kind)
+    if cached is None:
+        return None
+    path, identity = cached
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return path if (st.st_ino, st.st_size, st.st_mtime_ns) == identity else None
+
+
+def write_placeholder(path, kind):
+    if os.path.exists(path):
+        return False
+    source = _source(kind)
+    if source is not None:
+        try:
+            clone_file(source, path)
+            return True
+        except FileExistsError:
+            return False
+        except OSError:
+            pass
+    atomic_write(path, placeholder_content(kind), durable=False)
+    os.chmod(path, READ_ONLY)
+    st = os.stat(path)
+    _sources[kind] = (path, (st.st_ino, st.st_size, st.st_mtime_ns))
+    return True
+
+
+def write_placeholders(paths):
+    for kind in RENDERERS:
+        write_placeholder(paths[kind], kind)
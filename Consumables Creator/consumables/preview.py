@@ -0,0 +1,125 @@
+import difflib
+import filecmp
+import os
+import shutil
+import stat
+import tempfile
+from contextlib import contextmanager
+
+from .fileio import lock_dir, module_lock
+from .item_index import INDEX_FILE
+
+# Generator bookkeeping that earlier versions left inside media/
+INTERNAL_NAMES = {".consumables_index.json", ".consumables_assets.json", ".locks"}
+# Lock files in the lock directory that do not belong to a module
+SHARED_LOCKS = {"index.lock", "assets.lock"}
+
+
+# ===== Shadow Tree =====
+# A dry run generates into a hard-linked copy of the mod's media/ directory.
+# Every output is written through a temporary file and os.replace, which gives
+# the shadow path a new inode and leaves the linked original untouched, so the
+# run goes through exactly the same code as a real one without changing the mod.
+# The only in-place change, extending a script file, skips hard-linked files.
+# Read-only files are copied: replacing one on Windows clears the read-only bit
+# of the old inode, which a link would share with the real file.
+def _link_or_copy(src, dst):
+    if os.stat(src).st_mode & stat.S_IWUSR:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _lock_modules(root):
+    # Every module a generator has locked so far, in sorted order like the
+    # generator itself, so real runs wait for the dry run and vice versa
+    try:
+        names = sorted(name for name in os.listdir(lock_dir(root))
+                       if name.endswith(".lock") and name not in SHARED_LOCKS)
+    except FileNotFoundError:
+        return []
+    locks = []
+    try:
+        for name in names:
+            lock = module_lock(root, name[:-len(".lock")])
+            lock.acquire()
+            locks.append(lock)
+    except BaseException:
+        for lock in locks:
+            lock.release()
+        raise
+    return locks
+
+
+@contextmanager
+def shadow_tree(root):
+    # The real module locks are held from the snapshot until the diff is
+    # taken; the run itself locks the shadow's own lock files
+    locks = _lock_modules(root)
+    # Inside the root so hard links stay on the same filesystem
+    shadow = tempfile.mkdtemp(prefix=".consumables-dry-run-", dir=root if os.path.isdir(root) else None)
+    try:
+        media = os.path.join(root, "media")
+        if os.path.isdir(media):
+            shutil.copytree(media, os.path.join(shadow, "media"), copy_function=_link_or_copy, symlinks=True)
+        # Copied, not linked: the index is appended to in place
+        if os.path.exists(os.path.join(root, INDEX_FILE)):
+            shutil.copy2(os.path.join(root, INDEX_FILE), os.path.join(shadow, INDEX_FILE))
+        yield shadow
+    finally:
+        shutil.rmtree(shadow, ignore_errors=True)
+        for lock in locks:
+            lock.release()
+
+
+# ===== Tree Diff =====
+def _files(base):
+    found = {}
+    media = os.path.join(base, "media")
+    for dirpath, dirnames, filenames in os.walk(media):
+        dirnames[:] = [name for name in dirnames if name not in INTERNAL_NAMES]
+        for name in filenames:
+            if name not in INTERNAL_NAMES:
+                path = os.path.join(dirpath, name)
+                found[os.path.relpath(path, base)] = path
+    return found
+
+
+def _read_text(path):
+    if path is None:
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return data.decode("utf-8").splitlines(keepends=True)
+    except UnicodeDecodeError:
+        return None
+
+
+def changed_files(root, shadow):
+    # (relative path, original path or None, new path) for every file the run changed
+    before = _files(root)
+    after = _files(shadow)
+    changes = []
+    for rel in sorted(after):
+        old, new = before.get(rel), after[rel]
+        if old is not None and (os.path.samefile(old, new) or filecmp.cmp(old, new, shallow=False)):
+            continue
+        changes.append((rel, old, new))
+    return changes
+
+
+def unified_diff(root, shadow):
+    for rel, old, new in changed_files(root, shadow):
+        rel = rel.replace(os.sep, "/")
+        old_lines, new_lines = _read_text(old), _read_text(new)
+        if old_lines is None or new_lines is None:
+            yield f"Binary file {rel} {'changed' if old else 'added'}\n"
+            continue
+        lines = list(difflib.unified_diff(old_lines, new_lines,
+                                          "/dev/null" if old is None else f"a/{rel}", f"b/{rel}"))
+        for line in lines:
+            yield line if line.endswith("\n") else line + "\n\\ No newline at end of file\n"
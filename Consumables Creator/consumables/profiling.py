@@ -0,0 +1,111 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from .fileio import atomic_write
+
+TRACE_ENV = "CONSUMABLES_TRACE"
+
+_tracer = None
+_untraced = nullcontext()
+
+
+# ===== Stage Tracer =====
+# Times the stages of a run and writes them as Chrome trace events (complete
+# "X" events in microseconds), which chrome://tracing and ui.perfetto.dev can
+# open. Per-item stages are laps: every lap() closes the stage that ran since
+# the previous one, so an instrumented call site is one attribute check when
+# tracing is off. Batch-level work is timed with span().
+class Tracer:
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self.origin = time.perf_counter()
+        self.events = []
+        self.totals = {}
+        self.mark = self.origin
+        self.item_started = None
+        self.item_args = None
+        self.saved = None
+
+    def _record(self, name, category, start, end, args=None):
+        event = {"name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": threading.get_ident(),
+                 "ts": round((start - self.origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1)}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+        total = self.totals.get(name)
+        if total is None:
+            total = self.totals[name] = [0, 0.0]
+        total[0] += 1
+        total[1] += end - start
+
+    def start_item(self, **args):
+        self.item_started = self.mark = time.perf_counter()
+        self.item_args = args
+
+    def lap(self, stage):
+        # Outside an item (e.g. the checks of a parallel run) laps are not recorded
+        if self.item_started is None:
+            return
+        now = time.perf_counter()
+        self._record(stage, "stage", self.mark, now)
+        self.mark = now
+
+    def end_item(self):
+        if self.item_started is not None:
+            self._record("item", "item", self.item_started, time.perf_counter(), self.item_args)
+            self.item_started = None
+
+    @contextmanager
+    def span(self, name, **args):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, "batch", started, time.perf_counter(), args)
+
+    def summary(self):
+        # [(name, calls, seconds)], slowest first; items are the sum of their stages
+        return sorted(((name, calls, seconds) for name, (calls, seconds) in self.totals.items()),
+                      key=lambda entry: -entry[2])
+
+    def save(self):
+        # Also runs at exit, which has nothing to add after an explicit save
+        if self.saved == len(self.events):
+            return
+        data = {"traceEvents": self.events, "displayTimeUnit": "ms"}
+        atomic_write(self.path, json.dumps(data, separators=(",", ":")))
+        self.saved = len(self.events)
+
+
+# ===== Switching Tracing On =====
+def current_tracer():
+    return _tracer
+
+
+def start_tracing(path=None):
+    # With no path, CONSUMABLES_TRACE decides; returns the tracer or None.
+    # The trace is written when the process exits.
+    global _tracer
+    path = path or os.environ.get(TRACE_ENV)
+    if not path:
+        return None
+    if _tracer is None:
+        _tracer = Tracer(path)
+        atexit.register(_tracer.save)
+    return _tracer
+
+
+def span(name, **args):
+    return _untraced if _tracer is None else _tracer.span(name, **args)
+
+
+def format_summary(tracer):
+    lines = [f"{'stage':<20} {'calls':>8} {'total ms':>10} {'mean us':>10}"]
+    for name, calls, seconds in tracer.summary():
+        lines.append(f"{name:<20} {calls:>8} {seconds * 1000:>10.1f} {seconds / calls * 1e6:>10.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,281 @@
+import re
+
+from .specs import SpecError, STAT_FIELDS, iter_raw_specs, normalize_spec
+
+# ===== Value Kinds =====
+# Names end up in file names and script headers; text ends up in a
+# "Key = Value," script line; Lua strings end up between double quotes.
+NAME_RE = re.compile(r"[^\s.,;:{}=\"'/\\]+\Z")
+REFERENCE_RE = re.compile(r"(?:[^\s.,;:{}=\"'/\\]+\.)?[^\s.,;:{}=\"'/\\]+\Z")
+TEXT_RE = re.compile(r"[^,{}\r\n]*\Z")
+LUA_STRING_RE = re.compile(r"[^\"\\\r\n]*\Z")
+
+NUMBER = "number"
+INTEGER = "integer"
+NAME = "name"
+NAMES = "names"
+REFERENCE = "reference"
+TEXT = "text"
+LUA_STRING = "lua string"
+CHOICE = "choice"
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"must be a number, got {value!r}") from None
+    if number != number or number in (float("inf"), float("-inf")):
+        raise ValueError(f"must be a finite number, got {value!r}")
+    return number
+
+
+def _integer(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"must be a whole number, got {value!r}") from None
+
+
+def _pattern(regex, what):
+    def check(value):
+        if not regex.match(value):
+            raise ValueError(f"{what}, got {value!r}")
+        return value
+    return check
+
+
+def _names(value):
+    for name in value:
+        if not NAME_RE.match(name):
+            raise ValueError(f"entries must not contain spaces or punctuation, got {name!r}")
+    return value
+
+
+KINDS = {
+    NUMBER: _number,
+    INTEGER: _integer,
+    NAME: _pattern(NAME_RE, "must not contain spaces or punctuation"),
+    NAMES: _names,
+    REFERENCE: _pattern(REFERENCE_RE, "must be an item name or Module.Item"),
+    TEXT: _pattern(TEXT_RE, "must not contain commas, braces or line breaks"),
+    LUA_STRING: _pattern(LUA_STRING_RE, "must not contain double quotes, backslashes or line breaks"),
+    CHOICE: None,
+}
+
+
+# ===== Property Schema =====
+# One entry per spec field. name is the script property the field is written
+# as (None for fields that only shape file names or other outputs). when names
+# the flag or field that makes the generator emit it; required is True to
+# require it whenever it is emitted, or the name of the trigger that does.
+class Property:
+    __slots__ = ("key", "name", "kind", "minimum", "maximum", "when", "required", "choices")
+
+    def __init__(self, key, name, kind, minimum=None, maximum=None, when=None, required=False, choices=None):
+        self.key = key
+        self.name = name
+        self.kind = kind
+        self.minimum = minimum
+        self.maximum = maximum
+        self.when = when
+        self.required = required
+        self.choices = choices
+
+
+STAT_NAMES = {
+    "hunger": "HungerChange",
+    "thirst": "ThirstChange",
+    "unhappy": "UnhappyChange",
+    "stress": "StressChange",
+    "boredom": "BoredomChange",
+    "fatigue": "FatigueChange",
+    "endurance": "EnduranceChange",
+}
+NUTRITION_FIELDS = ["carbohydrates", "proteins", "lipids", "calories"]
+
+PROPERTIES = [
+    Property("module", None, NAME, required=True),
+    Property("item", None, NAME, required=True),
+    Property("ingame_name", None, LUA_STRING, required=True),
+    Property("asset", "StaticModel", NAME, required=True),
+    Property("category", "DisplayCategory", NAME, required=True),
+    Property("itemtype", "ItemType", NAME, required=True),
+    Property("weight", "Weight", NUMBER, minimum=0, required=True),
+
+    *[Property(f"{stat}_mode", None, CHOICE, choices=("Increase", "Decrease")) for stat in STAT_FIELDS],
+    *[Property(stat, STAT_NAMES[stat], NUMBER, required=f"{stat}_mode") for stat in STAT_FIELDS],
+
+    Property("carbohydrates", "Carbohydrates", NUMBER, minimum=0, required="nutrition"),
+    Property("proteins", "Proteins", NUMBER, minimum=0, required="nutrition"),
+    Property("lipids", "Lipids", NUMBER, minimum=0, required="nutrition"),
+    Property("calories", "Calories", NUMBER, minimum=0, required="nutrition"),
+
+    Property("food_type", "FoodType", TEXT),
+    Property("eat_type", "EatType", TEXT),
+    Property("cooking_sound", "CookingSound", TEXT),
+    Property("custom_eat_sound", "CustomEatSound", TEXT),
+    Property("herbalist_type", "HerbalistType", TEXT),
+
+    Property("flu_reduction", "FluReduction", NUMBER, minimum=0),
+    Property("pain_reduction", "PainReduction", NUMBER, minimum=0),
+    Property("reduce_food_sickness", "ReduceFoodSickness", NUMBER, minimum=0),
+    Property("reduce_infection_power", "ReduceInfectionPower", NUMBER, minimum=0),
+    Property("poison_power", "PoisonPower", NUMBER, minimum=0),
+    Property("use_delta", "UseDelta", NUMBER, minimum=0, maximum=1),
+    Property("tags", "Tags", TEXT),
+    Property("tooltip", "Tooltip", TEXT),
+    Property("on_eat", "OnEat", TEXT),
+    Property("custom_context_menu", "CustomContextMenu", TEXT),
+
+    Property("days_fresh", "DaysFresh", INTEGER, minimum=0, when="perishable", required=True),
+    Property("days_rotten", "DaysTotallyRotten", INTEGER, minimum=0, when="perishable", required=True),
+    Property("replace_on_rotten", "ReplaceOnRotten", REFERENCE, when="perishable"),
+
+    Property("minutes_to_cook", "MinutesToCook", INTEGER, minimum=0, when="cookable", required=True),
+    Property("minutes_to_burn", "MinutesToBurn", INTEGER, minimum=0, when="cookable", required=True),
+    Property("replace_on_cooked", "ReplaceOnCooked", REFERENCE, when="cookable"),
+    Property("replace_on_use", "ReplaceOnUse", REFERENCE),
+
+    Property("evolved_recipe_name", "EvolvedRecipeName", TEXT),
+    Property("evolved_recipes", "EvolvedItems", NAMES, when="evolved_recipe_name"),
+
+    Property("distribution_lists", None, NAMES),
+    Property("spawning_chance", None, NUMBER, minimum=0, when="distribution_lists"),
+    Property("forage_category", None, NAME),
+    Property("forage_min", None, INTEGER, minimum=0, when="forage_category"),
+    Property("forage_max", None, INTEGER, minimum=0, when="forage_category"),
+    Property("forage_skill", None, INTEGER, minimum=0, maximum=10, when="forage_category"),
+]
+
+# Triggers that are not a single spec field
+TRIGGERS = {
+    "nutrition": lambda spec: any(spec[key] for key in NUTRITION_FIELDS),
+}
+TRIGGER_TEXT = {
+    "nutrition": "any nutrition value is set",
+}
+TRIGGER_FIELDS = {
+    "nutrition": NUTRITION_FIELDS,
+}
+
+# Pairs whose second value may not be below the first
+ORDERED = [
+    ("days_fresh", "days_rotten", "perishable"),
+    ("minutes_to_cook", "minutes_to_burn", "cookable"),
+    ("forage_min", "forage_max", "forage_category"),
+]
+
+
+# ===== Compiled Validators =====
+def _trigger(name):
+    if name is None:
+        return None
+    return TRIGGERS.get(name) or (lambda spec: bool(spec[name]))
+
+
+def compile_property(prop):
+    key = prop.key
+    parse = KINDS[prop.kind]
+    emitted = _trigger(prop.when)
+    required = _trigger(prop.required) if isinstance(prop.required, str) else None
+    trigger = prop.required if required is not None else prop.when
+    missing = f"{key} is required" + (f" when {TRIGGER_TEXT.get(trigger, f'{trigger} is set')}" if trigger else "")
+    choices = prop.choices
+    minimum = prop.minimum
+    maximum = prop.maximum
+
+    def check(spec, values):
+        if emitted is not None and not emitted(spec):
+            return None
+        value = spec[key]
+        if not value:
+            if prop.required is True or (required is not None and required(spec)):
+                return missing
+            return None
+        if choices is not None:
+            if value not in choices:
+                return f"{key} must be one of {', '.join(choices)}, got {value!r}"
+            return None
+        try:
+            value = parse(value)
+        except ValueError as e:
+            return f"{key} {e}"
+        if minimum is not None and value < minimum:
+            return f"{key} must be at least {minimum}, got {spec[key]!r}"
+        if maximum is not None and value > maximum:
+            return f"{key} must be at most {maximum}, got {spec[key]!r}"
+        values[key] = value
+        return None
+
+    # A check can only fail if its own field or a required-trigger field is
+    # filled in, so validate_spec skips it otherwise without calling it
+    always = prop.required is True and prop.when is None
+    watched = frozenset([key, *TRIGGER_FIELDS.get(trigger, [trigger] if trigger else [])])
+    return always, watched, check
+
+
+def compile_schema(properties=PROPERTIES):
+    return [compile_property(prop) for prop in properties]
+
+
+VALIDATORS = compile_schema()
+
+
+def validate_spec(spec, validators=VALIDATORS):
+    errors = []
+    values = {}
+    filled = {key for key, value in spec.items() if value}
+    for always, watched, check in validators:
+        if always or not filled.isdisjoint(watched):
+            message = check(spec, values)
+            if message:
+                errors.append(message)
+
+    for low, high, trigger in ORDERED:
+        if low in values and high in values and values[high] < values[low] and spec[trigger]:
+            errors.append(f"{high} must not be below {low} ({spec[high]} < {spec[low]})")
+    for stat in STAT_FIELDS:
+        if spec[f"{stat}_mode"] and values.get(stat, 0) < 0:
+            errors.append(f"{stat} must not be negative when {stat}_mode is set, the mode gives the sign")
+    for lang, name in spec["translations"].items():
+        if not LUA_STRING_RE.match(name):
+            errors.append(f"ingame_name_{lang} must not contain double quotes, backslashes or line breaks")
+    return errors
+
+
+# ===== Batch Validation =====
+# Reads and checks a whole input file before anything is generated, so every
+# problem of every row is reported at once and a bad batch writes nothing.
+def check_batch(path, fmt=None):
+    # First pass of a streamed batch: every problem of every row, keeping
+    # nothing else in memory. Returns (row count, errors); once there are no
+    # errors, specs.iter_specs streams the rows again for generation.
+    count = 0
+    errors = []
+    for row, raw in iter_raw_specs(path, fmt, errors):
+        count += 1
+        try:
+            spec = normalize_spec(raw, row)
+        except SpecError as e:
+            errors.append((row, e.message))
+            continue
+        errors.extend((row, message) for message in validate_spec(spec))
+    return count, errors
+
+
+# Rows for which skip(row, raw) is true are left out without being checked.
+def load_batch(path, fmt=None, skip=None):
+    rows = []
+    errors = []
+    for row, raw in iter_raw_specs(path, fmt, errors):
+        if skip is not None and skip(row, raw):
+            continue
+        try:
+            spec = normalize_spec(raw, row)
+        except SpecError as e:
+            errors.append((row, e.message))
+            continue
+        errors.extend((row, message) for message in validate_spec(spec))
+        rows.append((row, spec))
+    return rows, errors
@@ -0,0 +1,238 @@
+import mmap
+import os
+import re
+
+from .fileio import io_stats
+
+# Braces and comments are the only tokens the block structure depends on;
+# everything between them is header or property text that is sliced on demand.
+# All three are located with find() on the buffer as given, which scans far
+# faster than a regex would and never copies a mapped file; a brace inside a
+# comment is skipped by searching again past the comment's end (an
+# unterminated block comment runs to the end).
+OPEN, CLOSE = b"{", b"}"
+# Only for block bodies, which are cleaned up in one piece
+COMMENT_RE = re.compile(rb"/(?:\*(?:.*?\*/|.*)|/[^\r\n]*)", re.DOTALL)
+BRACE_RE = re.compile(rb"[{}]")
+HEADER_WINDOW = 512
+
+
+class ScriptParseError(ValueError):
+    def __init__(self, message, path=None, offset=None, line=None):
+        self.path = path
+        self.offset = offset
+        self.line = line
+        where = f"{path or '<script>'}" + (f":{line}" if line is not None else "")
+        super().__init__(f"{where}: {message}")
+
+
+# ===== Blocks =====
+class Block:
+    __slots__ = ("kind", "name", "start", "end", "body_start", "body_end", "depth", "parent")
+
+    def __init__(self, kind, name, start, body_start, depth, parent):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.body_start = body_start
+        self.body_end = None
+        self.end = None
+        self.depth = depth
+        self.parent = parent
+
+    def __repr__(self):
+        return f"Block({self.kind!r}, {self.name!r}, {self.start}:{self.end}, depth={self.depth})"
+
+    def text(self, data):
+        return bytes(data[self.start:self.end]).decode("utf-8", errors="replace")
+
+    def properties(self, data):
+        return parse_properties(bytes(data[self.body_start:self.body_end]))
+
+
+def _line_of(data, offset):
+    return data[:offset].count(b"\n") + 1
+
+
+def _commented_header(data, floor, brace, comments):
+    # Walks back over the comments of the segment, which count as whitespace,
+    # until the text between two of them holds the newline or comma
+    pieces = []
+    blank = True
+    end = brace
+    i = len(comments)
+    while True:
+        lo = max(comments[i-1][1], floor) if i else floor
+        region = data[lo:end]
+        if blank:
+            region = region.rstrip()
+            blank = not region
+        cut = max(region.rfind(b"\n"), region.rfind(b","))
+        pieces.append((lo + cut + 1, region[cut+1:]))
+        if cut != -1 or lo == floor:
+            break
+        i -= 1
+        end = comments[i][0]
+    pieces.reverse()
+    # The header starts in the first piece that is not blank
+    start, text = next((piece for piece in pieces if piece[1].strip()), pieces[0])
+    return start + len(text) - len(text.lstrip()), b" ".join(text for _, text in pieces).strip()
+
+
+def _header(data, seg_start, brace, comments):
+    # The header is the text between the last newline or comma and the brace;
+    # comments holds the (start, end) spans of the comments in the segment
+    floor = max(seg_start, brace - HEADER_WINDOW)
+    if comments:
+        start, header = _commented_header(data, floor, brace, comments)
+    else:
+        region = data[floor:brace].rstrip()
+        cut = max(region.rfind(b"\n"), region.rfind(b","))
+        text = region[cut+1:]
+        header = text.lstrip()
+        start = floor + cut + 1 + len(text) - len(header)
+    parts = header.decode("utf-8", errors="replace").split(None, 1)
+    kind = parts[0] if parts else ""
+    name = parts[1] if len(parts) > 1 else ""
+    return kind, name, start
+
+
+# ===== Streaming Parser =====
+# Yields every block as soon as its closing brace is read (children before
+# their parent), with byte offsets into the parsed buffer.
+def iter_blocks(data, path=None):
+    size = len(data)
+    find = data.find
+
+    def next_token(token, start):
+        pos = find(token, start)
+        return size if pos == -1 else pos
+
+    stack = []
+    seg_start = 0
+    seg_comments = []
+    next_open = next_token(OPEN, 0)
+    next_close = next_token(CLOSE, 0)
+    next_slash = next_token(b"/", 0)
+    while True:
+        if next_slash < next_open and next_slash < next_close:
+            pos = next_slash
+            mark = data[pos+1:pos+2]
+            if mark == b"/":
+                end = next_token(b"\n", pos + 2)
+            elif mark == b"*":
+                end = find(b"*/", pos + 2)
+                end = size if end == -1 else end + 2
+            else:
+                next_slash = next_token(b"/", pos + 1)
+                continue
+            seg_comments.append((pos, end))
+            if next_open < end:
+                next_open = next_token(OPEN, end)
+            if next_close < end:
+                next_close = next_token(CLOSE, end)
+            next_slash = next_token(b"/", end)
+        elif next_open < next_close:
+            pos = next_open
+            kind, name, start = _header(data, seg_start, pos, seg_comments)
+            parent = stack[-1] if stack else None
+            stack.append(Block(kind, name, start, pos + 1, len(stack), parent))
+            seg_start = pos + 1
+            if seg_comments:
+                seg_comments = []
+            next_open = find(OPEN, seg_start)
+            if next_open == -1:
+                next_open = size
+        elif next_close < size:
+            pos = next_close
+            if not stack:
+                raise ScriptParseError("unexpected '}'", path, pos, _line_of(data, pos))
+            block = stack.pop()
+            block.body_end = pos
+            block.end = seg_start = pos + 1
+            if seg_comments:
+                seg_comments = []
+            next_close = find(CLOSE, seg_start)
+            if next_close == -1:
+                next_close = size
+            yield block
+        else:
+            break
+    if stack:
+        block = stack[-1]
+        header = f"{block.kind} {block.name}".strip()
+        raise ScriptParseError(f"unclosed block '{header}'", path, block.start, _line_of(data, block.start))
+
+
+def parse_properties(body):
+    # Key = Value pairs of a block body; nested blocks and comments are skipped
+    if b"/" in body:
+        body = COMMENT_RE.sub(b"\n", body)
+    if b"{" in body or b"}" in body:
+        parts = []
+        depth = 0
+        last = 0
+        for match in BRACE_RE.finditer(body):
+            if match.group() == OPEN:
+                if depth == 0:
+                    parts.append(body[last:match.start()])
+                depth += 1
+            elif depth:
+                depth -= 1
+                last = match.end()
+        if depth == 0:
+            parts.append(body[last:])
+        body = b"\n".join(parts)
+    props = []
+    for line in body.decode("utf-8", errors="replace").replace(",", "\n").splitlines():
+        key, sep, value = line.partition("=")
+        if sep and key.strip():
+            props.append((key.strip(), value.strip()))
+    return props
+
+
+# ===== File Helpers =====
+class ScriptFile:
+    def __init__(self, path):
+        self.path = path
+        self.f = None
+        self.data = b""
+
+    def __enter__(self):
+        self.f = open(self.path, "rb")
+        io_stats.count_read(self.f)
+        if os.fstat(self.f.fileno()).st_size:
+            self.data = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.f.close()
+
+    def blocks(self):
+        return iter_blocks(self.data, self.path)
+
+
+def parse_file(path):
+    with ScriptFile(path) as script:
+        return list(script.blocks())
+
+
+def declarations(path):
+    # Module name plus the (kind, name) of every block directly inside it
+    module_name = ""
+    found = []
+    with ScriptFile(path) as script:
+        for block in script.blocks():
+            if block.depth == 1 and block.parent.kind == "module":
+                module_name = module_name or block.parent.name
+                found.append((block.kind, block.name))
+    return module_name, found
+
+
+def iter_tree(directory, suffix=".txt"):
+    for dirpath, _, filenames in os.walk(directory):
+        for name in sorted(filenames):
+            if name.endswith(suffix):
+                yield os.path.join(dirpath, name)
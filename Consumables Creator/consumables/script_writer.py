@@ -0,0 +1,252 @@
+import bisect
+import os
+
+from .fileio import atomic_splice, atomic_write, extend_in_place, io_stats
+from .script_parser import ScriptFile, ScriptParseError, declarations, iter_blocks
+
+TAIL_CHUNK = 64 * 1024
+
+
+def module_header(module_name):
+    return f"module {module_name}\n{{\n    imports {{\n        Base\n    }}\n\n" if module_name else ""
+
+
+def block_key(kind, name):
+    # Key of a block in the offset index (JSON keys have to be strings)
+    return f"{kind} {name}"
+
+
+def block_declaration(block):
+    parts = block.lstrip().split(None, 2)
+    if len(parts) >= 2 and parts[0] in ("item", "model"):
+        return parts[0], parts[1].rstrip("{")
+    return None
+
+
+# ===== Append-Optimized Script Writer =====
+# Keeps the position of the closing brace of a script file so a flush only has
+# to splice the new blocks in at that offset instead of re-reading, searching
+# and re-rendering the whole file for every item.
+#
+# offsets, when given, maps block_key() of every item and model block in the
+# file to its (start, end) byte span. The writer keeps it current through
+# every write, and replacing or removing a block then only swaps its span
+# instead of parsing the file. None means the spans are unknown.
+class ScriptWriter:
+    def __init__(self, path, module_name=None, declared=None, offsets=None):
+        self.path = path
+        self.module_name = module_name
+        self.pending = []
+        self.replacements = {}
+        self.insert_at = None
+        self.tail = None
+        self.declared = declared
+        self.offsets = offsets
+        self.parsed = False
+        if os.path.exists(path):
+            self._locate_tail()
+            if self.declared is None:
+                self.declared = self._scan_declarations()
+        elif self.declared is None:
+            self.declared = set()
+
+    def _locate_tail(self):
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            buf = b""
+            pos = size
+            while True:
+                read = min(TAIL_CHUNK, pos)
+                pos -= read
+                f.seek(pos)
+                buf = f.read(read) + buf
+                brace = buf.rfind(b"}")
+                if brace != -1 and (buf[:brace].rstrip() or pos == 0):
+                    break
+                if pos == 0:
+                    raise ScriptParseError("no closing brace, invalid file structure", self.path)
+        io_stats.files_opened += 1
+        io_stats.bytes_read += len(buf)
+        self.insert_at = pos + len(buf[:brace].rstrip())
+        self.tail = buf[brace:]
+
+    def _scan_declarations(self):
+        _, found = declarations(self.path)
+        return {(kind, name) for kind, name in found if kind in ("item", "model")}
+
+    def has(self, kind, name):
+        return (kind, name) in self.declared
+
+    def add(self, block):
+        declaration = block_declaration(block)
+        if declaration is not None:
+            if declaration in self.declared:
+                return False
+            self.declared.add(declaration)
+        self.pending.append(block.strip())
+        return True
+
+    # ===== Replacing Blocks =====
+    # Blocks already in the file are swapped (or dropped, for None) in a single
+    # write at flush time, however many of them changed. Blocks the file
+    # turns out not to have are appended instead.
+    def in_file(self, declaration):
+        # False only when the offset index says the file has no such block
+        return self.insert_at is not None and (self.offsets is None or block_key(*declaration) in self.offsets)
+
+    def replace(self, block):
+        declaration = block_declaration(block)
+        if declaration is None or self.insert_at is None:
+            if declaration is not None:
+                self.remove(*declaration)
+            return self.add(block)
+        if declaration in self.declared:
+            for i, pending in enumerate(self.pending):
+                if block_declaration(pending) == declaration:
+                    self.pending[i] = block.strip()
+                    return True
+        if not self.in_file(declaration):
+            return self.add(block)
+        self.declared.add(declaration)
+        self.replacements[declaration] = block.strip()
+        return True
+
+    def remove(self, kind, name):
+        self.declared.discard((kind, name))
+        self.pending = [block for block in self.pending if block_declaration(block) != (kind, name)]
+        if self.in_file((kind, name)):
+            self.replacements[(kind, name)] = None
+
+    def check_parses(self):
+        # Without offsets, replacing a block parses the file at flush time, so
+        # a file that does not parse is turned down before anything is queued
+        if self.offsets is None and self.insert_at is not None and not self.parsed:
+            declarations(self.path)
+            self.parsed = True
+
+    def _at(self, data, start, end, declaration):
+        # Whether a recorded span still holds the block it was recorded for
+        header = block_key(*declaration).encode("utf-8")
+        after = data[start+len(header):start+len(header)+1]
+        return (end <= len(data) and data.startswith(header, start) and (after.isspace() or after == b"{")
+                and data[end-1:end] == b"}")
+
+    def _write_edits(self, data, edits, offsets):
+        # Writes data with every (start, end, declaration, new) edit applied, in
+        # order of start, and moves the spans in offsets to match. Returns how
+        # far everything after the last edit moved.
+        pieces = []
+        # (old end, shift of everything after it, declaration, new span or None)
+        moved = []
+        last = 0
+        shift = 0
+        for start, end, declaration, new in edits:
+            if new is None:
+                # Drop the blank lines that separated the block from the previous one
+                while start > last and data[start-1:start].isspace():
+                    start -= 1
+                new = b""
+                span = None
+            else:
+                new = new.encode("utf-8")
+                span = (start + shift, start + shift + len(new))
+            pieces.append(data[last:start])
+            pieces.append(new)
+            shift += len(new) - (end - start)
+            moved.append((end, shift, declaration, span))
+            last = end
+        pieces.append(data[last:])
+        atomic_write(self.path, b"".join(pieces))
+
+        ends = [end for end, _, _, _ in moved]
+        for key, (start, end) in list(offsets.items()):
+            before = bisect.bisect_right(ends, start)
+            if before:
+                offsets[key] = (start + moved[before-1][1], end + moved[before-1][1])
+        for _, _, declaration, span in moved:
+            if span is None:
+                offsets.pop(block_key(*declaration), None)
+            else:
+                offsets[block_key(*declaration)] = span
+        return shift
+
+    def _splice(self):
+        # Swaps the spans of the replaced blocks without parsing the file.
+        # Returns False, having written nothing, when a span is missing or stale.
+        edits = []
+        for declaration, new in self.replacements.items():
+            span = self.offsets.get(block_key(*declaration))
+            if span is None:
+                return False
+            edits.append((span[0], span[1], declaration, new))
+        edits.sort(key=lambda edit: edit[0])
+        with open(self.path, "rb") as f:
+            io_stats.count_read(f)
+            data = f.read()
+        last = 0
+        for start, end, declaration, _ in edits:
+            if start < last or not self._at(data, start, end, declaration):
+                return False
+            last = end
+        self.insert_at += self._write_edits(data, edits, self.offsets)
+        self.replacements = {}
+        return True
+
+    def _rewrite(self):
+        # Parses the whole file; also how a missing or stale offset index is rebuilt
+        replacements = self.replacements
+        self.replacements = {}
+        with ScriptFile(self.path) as script:
+            data = bytes(script.data)
+        edits = []
+        spans = {}
+        for block in list(iter_blocks(data, self.path)):
+            if block.depth != 1:
+                continue
+            declaration = (block.kind, block.name)
+            if declaration in replacements:
+                edits.append((block.start, block.end, declaration, replacements.pop(declaration)))
+            elif block.kind in ("item", "model") and block.parent.kind == "module":
+                spans[block_key(*declaration)] = (block.start, block.end)
+        self._write_edits(data, edits, spans)
+        if self.offsets is not None:
+            self.offsets.clear()
+            self.offsets.update(spans)
+        self._locate_tail()
+        self.pending.extend(block for block in replacements.values() if block is not None)
+
+    def _record_appended(self, blocks, start):
+        if self.offsets is None:
+            return
+        for block in blocks:
+            declaration = block_declaration(block.decode("utf-8"))
+            if declaration is not None:
+                self.offsets[block_key(*declaration)] = (start, start + len(block))
+            start += len(block) + 2
+
+    def flush(self):
+        if self.replacements and (self.offsets is None or not self._splice()):
+            self._rewrite()
+        if not self.pending:
+            return
+        blocks = [block.encode("utf-8") for block in self.pending]
+        body = b"\n\n".join(blocks)
+        self.pending = []
+
+        if self.insert_at is None:
+            header = module_header(self.module_name).encode("utf-8")
+            data = header + body + b"\n"
+            tail = b"}\n"
+            atomic_write(self.path, data + tail)
+            self._record_appended(blocks, len(header))
+            self.insert_at = len(data) - 1
+            self.tail = tail
+            return
+
+        data = b"\n\n" + body + b"\n"
+        # With only the closing brace after the insert point, the file is
+        # extended where it is; anything else after it goes through a copy
+        if self.tail.strip() != b"}" or not extend_in_place(self.path, self.insert_at, data + self.tail):
+            atomic_splice(self.path, self.insert_at, data + self.tail)
+        self._record_appended(blocks, self.insert_at + 2)
+        self.insert_at += len(data) - 1
@@ -0,0 +1,163 @@
+import csv
+import json
+import os
+
+
+# ===== Item Spec Fields =====
+STAT_FIELDS = ["hunger", "thirst", "unhappy", "stress", "boredom", "fatigue", "endurance"]
+
+TEXT_FIELDS = [
+    "module", "item", "ingame_name", "asset", "category", "itemtype", "weight",
+    *STAT_FIELDS,
+    *[f"{stat}_mode" for stat in STAT_FIELDS],
+    "flu_reduction", "pain_reduction", "reduce_food_sickness", "reduce_infection_power",
+    "poison_power", "use_delta",
+    "food_type", "eat_type", "cooking_sound", "custom_eat_sound", "herbalist_type",
+    "carbohydrates", "proteins", "lipids", "calories",
+    "tags", "tooltip", "on_eat", "custom_context_menu",
+    "days_fresh", "days_rotten", "replace_on_rotten",
+    "minutes_to_cook", "minutes_to_burn", "replace_on_cooked", "replace_on_use",
+    "evolved_recipe_name",
+    "spawning_chance",
+    "forage_category", "forage_min", "forage_max", "forage_skill",
+]
+
+FLAG_FIELDS = [
+    "perishable", "cookable",
+    "fishing_lure", "dangerous_uncooked", "bad_cold", "bad_in_microwave", "good_hot",
+    "cant_eat", "medical", "canned_food", "cant_be_frozen", "spice", "packaged",
+    "remove_unhappiness_when_cooked", "remove_negative_effect_on_cooked",
+]
+
+LIST_FIELDS = ["evolved_recipes", "distribution_lists"]
+
+ALL_FIELDS = TEXT_FIELDS + FLAG_FIELDS + LIST_FIELDS + ["translations"]
+
+# In-game names for other languages, e.g. an "ingame_name_ES" column
+TRANSLATION_PREFIX = "ingame_name_"
+
+REQUIRED_FIELDS = ["module", "item", "ingame_name", "asset", "weight", "itemtype", "category"]
+
+DEFAULTS = {
+    "spawning_chance": "1",
+    "forage_min": "1",
+    "forage_skill": "0",
+}
+
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "on"}
+FALSE_VALUES = {"", "0", "false", "no", "n", "off"}
+
+
+class SpecError(ValueError):
+    def __init__(self, message, row=None):
+        self.row = row
+        self.message = message
+        super().__init__(f"row {row}: {message}" if row is not None else message)
+
+
+# ===== Normalization =====
+def parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def parse_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(x).strip() for x in value if str(x).strip()]
+    return [x.strip() for x in str(value).replace(";", ",").split(",") if x.strip()]
+
+
+def parse_translations(raw):
+    translations = {}
+    given = raw.get("translations") or {}
+    if not isinstance(given, dict):
+        raise ValueError("translations must be an object of LANG: name")
+    for lang, name in given.items():
+        if name and str(name).strip():
+            translations[str(lang).upper()] = str(name).strip()
+    for key, name in raw.items():
+        if key and key.startswith(TRANSLATION_PREFIX) and name and str(name).strip():
+            translations[key[len(TRANSLATION_PREFIX):].upper()] = str(name).strip()
+    return translations
+
+
+def normalize_spec(raw, row=None):
+    unknown = [key for key in raw
+               if key is not None and key not in ALL_FIELDS and not key.startswith(TRANSLATION_PREFIX)]
+    if unknown:
+        raise SpecError(f"unknown field(s): {', '.join(sorted(unknown))}", row)
+
+    spec = {}
+    for key in TEXT_FIELDS:
+        value = raw.get(key)
+        spec[key] = "" if value is None else str(value).strip()
+    for key in FLAG_FIELDS:
+        try:
+            spec[key] = parse_flag(raw.get(key))
+        except ValueError as e:
+            raise SpecError(f"{key}: {e}", row) from None
+    for key in LIST_FIELDS:
+        spec[key] = parse_list(raw.get(key))
+    try:
+        spec["translations"] = parse_translations(raw)
+    except ValueError as e:
+        raise SpecError(str(e), row) from None
+
+    for key, default in DEFAULTS.items():
+        if not spec[key]:
+            spec[key] = default
+    if not spec["ingame_name"]:
+        spec["ingame_name"] = spec["item"]
+    if not spec["asset"]:
+        spec["asset"] = spec["item"]
+    return spec
+
+
+# ===== Streaming Readers =====
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    return "csv"
+
+
+def iter_raw_specs(path, fmt=None, errors=None):
+    # With an errors list, unreadable rows are recorded there and skipped
+    fmt = fmt or detect_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            for row_number, row in enumerate(csv.DictReader(f), start=2):
+                yield row_number, row
+        elif fmt == "jsonl":
+            for row_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    row = json.loads(line)
+                    if not isinstance(row, dict):
+                        raise SpecError("expected a JSON object", row_number)
+                except (json.JSONDecodeError, SpecError) as e:
+                    message = f"invalid JSON: {e.msg}" if isinstance(e, json.JSONDecodeError) else e.message
+                    if errors is None:
+                        raise SpecError(message, row_number) from None
+                    errors.append((row_number, message))
+                    continue
+                yield row_number, row
+        else:
+            raise SpecError(f"unsupported input format: {fmt}")
+
+
+def iter_specs(path, fmt=None):
+    for row_number, raw in iter_raw_specs(path, fmt):
+        yield row_number, normalize_spec(raw, row_number)
@@ -0,0 +1,171 @@
+import os
+import re
+
+from .fileio import atomic_write, io_stats
+
+DEFAULT_LANGUAGES = ("EN",)
+FALLBACK_LANGUAGE = "EN"
+
+ENTRY_RE = re.compile(r'^\s*(ItemName_[^\s=]+)\s*=\s*"(.*)",?\s*$')
+
+
+def translate_dir(root):
+    return os.path.join(root, "media", "lua", "shared", "translate")
+
+
+def translation_path(root, module_name, lang):
+    return os.path.join(translate_dir(root), lang, f"{module_name}_ItemName_{lang}.txt")
+
+
+def translation_key(module_name, item_name):
+    return f"ItemName_{module_name}.{item_name}"
+
+
+def shipped_languages(root, module_name):
+    base = translate_dir(root)
+    if not os.path.isdir(base):
+        return []
+    return sorted(lang for lang in os.listdir(base)
+                  if os.path.exists(translation_path(root, module_name, lang)))
+
+
+# ===== Translation Table =====
+# One {module}_ItemName_{LANG}.txt file. Existing keys are held in a dict so
+# membership checks are O(1); new entries are buffered and merged in one write.
+class TranslationTable:
+    def __init__(self, path, lang):
+        self.path = path
+        self.lang = lang
+        self.head = []
+        self.tail = []
+        self.entries = {}
+        self.lines = {}
+        self.pending = []
+        self.changed = False
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            io_stats.count_read(f)
+            lines = f.readlines()
+        close = len(lines)
+        for i in range(len(lines)-1, -1, -1):
+            if lines[i].strip() == "}":
+                close = i
+                break
+        self.head = lines[:close]
+        self.tail = lines[close:]
+        for i, line in enumerate(self.head):
+            match = ENTRY_RE.match(line)
+            if match:
+                self.entries[match.group(1)] = match.group(2)
+                self.lines[match.group(1)] = i
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, key, value):
+        if key in self.entries:
+            return False
+        self.entries[key] = value
+        self.pending.append(f'    {key} = "{value}",\n')
+        return True
+
+    def set(self, key, value):
+        # Rewrites an existing entry in place, or adds it
+        if key not in self.lines:
+            if key in self.entries and self.entries[key] != value:
+                self.entries[key] = value
+                self.pending = [line for line in self.pending if ENTRY_RE.match(line).group(1) != key]
+                self.pending.append(f'    {key} = "{value}",\n')
+                return True
+            return self.add(key, value)
+        if self.entries[key] == value:
+            return False
+        self.entries[key] = value
+        self.head[self.lines[key]] = f'    {key} = "{value}",\n'
+        self.changed = True
+        return True
+
+    def flush(self):
+        if not self.pending and not self.changed:
+            return False
+        self.changed = False
+        if not self.head:
+            self.head = [f"ItemName_{self.lang} = {{\n"]
+        if not self.tail:
+            self.tail = ["}\n"]
+        if self.head[-1] and not self.head[-1].endswith("\n"):
+            self.head[-1] += "\n"
+        for line in self.pending:
+            self.lines[ENTRY_RE.match(line).group(1)] = len(self.head)
+            self.head.append(line)
+        self.pending = []
+        return atomic_write(self.path, "".join(self.head + self.tail))
+
+
+# ===== Translation Manager =====
+# Collects ItemName_ entries for every module and language of a batch, then
+# writes each language file once. Languages without a translation for an item
+# fall back to the EN name.
+class TranslationManager:
+    def __init__(self, root, languages=DEFAULT_LANGUAGES):
+        self.root = root
+        self.languages = list(dict.fromkeys([FALLBACK_LANGUAGE, *languages]))
+        self.tables = {}
+        self.module_languages = {}
+
+    def table(self, module_name, lang):
+        table = self.tables.get((module_name, lang))
+        if table is None:
+            table = TranslationTable(translation_path(self.root, module_name, lang), lang)
+            self.tables[(module_name, lang)] = table
+            self.module_languages.setdefault(module_name, set()).add(lang)
+        return table
+
+    def languages_for(self, module_name):
+        if module_name not in self.module_languages:
+            for lang in [*self.languages, *shipped_languages(self.root, module_name)]:
+                self.table(module_name, lang)
+        return self.module_languages[module_name]
+
+    def add(self, module_name, item_name, name, translations=None):
+        translations = translations or {}
+        key = translation_key(module_name, item_name)
+        languages = self.languages_for(module_name)
+        for lang in translations:
+            self.table(module_name, lang)
+        added = False
+        for lang in sorted(languages):
+            if lang == FALLBACK_LANGUAGE:
+                added = self.table(module_name, lang).add(key, name) or added
+            else:
+                self.table(module_name, lang).add(key, translations.get(lang) or name)
+        return added
+
+    def set(self, module_name, item_name, name, translations=None):
+        # Other languages keep their own text unless the spec gives one; text
+        # that was only the old EN name is a fallback and follows the new one
+        translations = translations or {}
+        key = translation_key(module_name, item_name)
+        languages = self.languages_for(module_name)
+        for lang in translations:
+            self.table(module_name, lang)
+        old_name = self.table(module_name, FALLBACK_LANGUAGE).entries.get(key)
+        for lang in sorted(languages):
+            table = self.table(module_name, lang)
+            if lang == FALLBACK_LANGUAGE or translations.get(lang):
+                table.set(key, translations.get(lang) or name)
+            elif table.entries.get(key, old_name) == old_name:
+                table.set(key, name)
+
+    def flush(self):
+        for (module_name, lang), table in list(self.tables.items()):
+            if lang == FALLBACK_LANGUAGE:
+                continue
+            fallback = self.table(module_name, FALLBACK_LANGUAGE)
+            for key, value in fallback.entries.items():
+                if key not in table:
+                    table.add(key, value)
+        return [table.path for table in self.tables.values() if table.flush()]
@@ -0,0 +1,198 @@
+import os
+import time
+
+from .engine import DuplicateItemError, Generator, output_paths
+from .manifest import BuildManifest, raw_hash
+from .schema import load_batch
+from .specs import SpecError
+from .translations import DEFAULT_LANGUAGES, FALLBACK_LANGUAGE, translation_path
+
+SPEC_EXTENSIONS = (".csv", ".jsonl")
+POLL_INTERVAL = 0.1
+DEBOUNCE = 0.2
+
+
+# ===== Dependency Map =====
+# Every file an item feeds. When its spec changes, only these (and the ones it
+# fed before the change) can need rewriting.
+def item_outputs(root, spec, languages=DEFAULT_LANGUAGES):
+    paths = output_paths(root, spec)
+    outputs = {paths["items"], paths["models"], paths["mesh"], paths["texture"], paths["icon"]}
+    for lang in {FALLBACK_LANGUAGE, *languages, *spec["translations"]}:
+        outputs.add(translation_path(root, spec["module"], lang))
+    if spec["distribution_lists"]:
+        outputs.add(paths["distributions"])
+    if spec["forage_category"]:
+        outputs.add(paths["foraging"])
+    return outputs
+
+
+def spec_files(directory):
+    found = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith(SPEC_EXTENSIONS) and os.path.isfile(path):
+            st = os.stat(path)
+            found[path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+# ===== Spec Watcher =====
+# Builds items from spec files through the build manifest, so only rows whose
+# spec hash changed are validated and regenerated, replacing their existing
+# blocks and entries in place. watch() polls a directory and debounces edits
+# until the files have been quiet for DEBOUNCE seconds.
+#
+# Every item belongs to one spec file: the one it was last built from, or else
+# the first that defines it. Rows defining it elsewhere are reported as
+# duplicates, and so are rows for items that exist but were never built from
+# the specs (hand-written or made in the window), unless adopt is set.
+class SpecWatcher:
+    def __init__(self, root, directory=None, languages=DEFAULT_LANGUAGES, game=None, report=print, adopt=False):
+        self.root = root
+        self.directory = directory
+        self.languages = languages
+        self.game = game
+        self.report = report
+        self.adopt = adopt
+        self.files = {}
+        self.manifest = BuildManifest(root, languages)
+        self.sources = {}
+        # Spec files with rows that failed, read again on the next apply
+        self.retry = set()
+
+    def load(self, path, known, force=False):
+        # Rows the manifest already built are skipped before validation
+        digests = {}
+
+        def skip(row, raw):
+            digest = digests[row] = raw_hash(raw)
+            key = None if force else self.manifest.built(digest)
+            if key is not None:
+                known.add(key)
+            return key is not None
+
+        try:
+            rows, problems = load_batch(path, skip=skip)
+        except (OSError, SpecError) as e:
+            self.report(f"error: {e}")
+            return None
+        if problems:
+            for row, message in problems:
+                self.report(f"{os.path.basename(path)} row {row}: {message}")
+            self.report(f"{os.path.basename(path)}: {len(problems)} error(s), waiting for the next save")
+            return None
+        return [(row, digests[row], spec) for row, spec in rows]
+
+    def owner(self, key):
+        # The spec file an item belongs to, or None if no spec file defines it
+        built = self.manifest.items.get(key)
+        if built is not None:
+            source = built[1]
+            if key in self.sources.get(source, ()) or (source not in self.sources and os.path.exists(source)):
+                return source
+        return next((path for path, keys in self.sources.items() if key in keys), None)
+
+    def apply(self, paths, force=False):
+        started = time.perf_counter()
+        manifest = self.manifest
+        changed = []
+        dropped = set()
+        loaded = []
+        paths = [*dict.fromkeys([*(os.path.abspath(path) for path in paths), *sorted(self.retry)])]
+        for path in paths:
+            if path not in self.sources:
+                self.sources[path] = manifest.source_keys(path)
+            if not force and manifest.source_unchanged(path):
+                continue
+            keys = set()
+            rows = [] if not os.path.exists(path) else self.load(path, keys, force)
+            if rows is None:
+                continue
+            for row, digest, spec in rows:
+                key = f"{spec['module']}.{spec['item']}"
+                if key in keys:
+                    changed.append((f"{os.path.basename(path)} row {row}", key, None, path, spec))
+                    continue
+                keys.add(key)
+                changed.append((f"{os.path.basename(path)} row {row}", key, digest, path, spec))
+            dropped |= self.sources[path] - keys
+            self.sources[path] = keys
+            loaded.append(path)
+        # Removing an item from the specs does not delete what it generated
+        for key in sorted(dropped - set().union(*self.sources.values())):
+            self.report(f"{key} is no longer in any spec file, its outputs were kept")
+            manifest.forget(key)
+        if not changed:
+            for path in loaded:
+                manifest.record_source(path)
+            manifest.save()
+            return None
+
+        touched = set()
+        failed = set()
+        with Generator(self.root, languages=self.languages, game=self.game) as generator:
+            for row, key, digest, path, spec in changed:
+                duplicate = self.duplicate(generator, key, digest, path, spec)
+                if duplicate:
+                    generator.record_error(row, DuplicateItemError(duplicate))
+                    failed.add(path)
+                elif generator.add(spec, row, replace=True, validated=True):
+                    outputs = item_outputs(self.root, spec, self.languages)
+                    touched |= outputs | manifest.outputs(key)
+                    manifest.record(key, digest, path, outputs)
+                else:
+                    failed.add(path)
+        # A source with a failed row keeps its old stat, so the next build reads
+        # it again and retries the rows that were not recorded
+        for path in loaded:
+            if path not in failed:
+                manifest.record_source(path)
+        self.retry = failed
+        manifest.save()
+        for row, message in generator.errors:
+            self.report(f"{row}: {message}" if row is not None else f"error: {message}")
+        for row, message in generator.warnings:
+            self.report(f"{row}: warning: {message}")
+        elapsed = time.perf_counter() - started
+        self.report(f"{generator.created} item(s) created, {generator.updated} updated, "
+                    f"{len(generator.errors)} error(s), {len(touched)} output file(s) affected in {elapsed:.2f}s")
+        self.report(f"I/O: {generator.io.summary()}")
+        return generator
+
+    def duplicate(self, generator, key, digest, path, spec):
+        # Why a row may not build its item, or None
+        name = os.path.basename(path)
+        if digest is None:
+            return f"{key} is defined more than once in {name}"
+        owner = self.owner(key)
+        if owner != path:
+            return f"{key} is already defined in {os.path.basename(owner)}"
+        if (not self.adopt and key not in self.manifest.items
+                and generator.index.has_item(spec["module"], spec["item"])):
+            return f"{key} already exists outside the spec files (add --adopt to build it from {name})"
+        return None
+
+    def poll(self):
+        # Returns the spec files whose stat changed since the last poll
+        current = spec_files(self.directory)
+        changed = [path for path, stat in current.items() if self.files.get(path) != stat]
+        changed.extend(path for path in self.files if path not in current)
+        self.files = current
+        return changed
+
+    def watch(self):
+        self.apply(self.poll())
+        self.report(f"watching {self.directory} (Ctrl+C to stop)")
+        pending = set()
+        quiet_since = None
+        while True:
+            time.sleep(POLL_INTERVAL)
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending.update(changed)
+                quiet_since = now
+            elif pending and now - quiet_since >= DEBOUNCE:
+                self.apply(sorted(pending))
+                pending.clear()
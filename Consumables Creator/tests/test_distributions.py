@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from consumables.distributions import DistributionManager, DistributionModel, distributions_path
+
+HAND_WRITTEN = [
+    'table.insert(ProceduralDistributions["list"]["FridgeGeneric"].items, "Base.Apple");',
+    'table.insert(ProceduralDistributions["list"]["FridgeGeneric"].items, 4);',
+]
+
+
+def baseline_entry(item_name, dist, chance):
+    # As the baseline generator appended each (list, item) pair
+    var = f"Food_{item_name}SpawningChance"
+    return [
+        f"local {var} = {chance}",
+        f'table.insert(ProceduralDistributions["list"]["{dist}"].items, "Food.{item_name}");',
+        f"table.insert(ProceduralDistributions['list']['{dist}'].items, {var} * 0.1);",
+        "",
+    ]
+
+
+class LegacyMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = distributions_path(self.root, "Food")
+        os.makedirs(os.path.dirname(self.path))
+        lines = [
+            "require 'Items/Distributions'",
+            "",
+            "require 'Items/ProceduralDistributions'",
+            *baseline_entry("Pear", "FridgeGeneric", 5),
+            *HAND_WRITTEN,
+            "",
+            *baseline_entry("Pear", "KitchenDryFood", 5),
+            *baseline_entry("Plum", "FridgeGeneric", 2.5),
+        ]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def read(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_migration_keeps_hand_written_lines(self):
+        distributions = DistributionManager(self.root)
+        distributions.set("Food", "Pear", ["FridgeGeneric"], "5")
+        self.assertEqual(distributions.flush(), [self.path])
+
+        model = DistributionModel(self.path)
+        self.assertFalse(model.dirty)
+        self.assertEqual(model.lists, {"FridgeGeneric": {"Food.Pear": "5.0", "Food.Plum": "2.5"}})
+        content = self.read()
+        self.assertNotIn("SpawningChance", content)
+        self.assertEqual(content.count("require 'Items/Distributions'"), 1)
+        # The literal item/weight pair stays together, after the generated block
+        self.assertIn("\n".join(HAND_WRITTEN), content.split(DistributionModel.END_MARKER)[1])
+
+    def update(self):
+        distributions = DistributionManager(self.root)
+        distributions.set("Food", "Pear", ["FridgeGeneric", "KitchenDryFood"], "5")
+        distributions.set("Food", "Plum", ["FridgeGeneric"], "2.5")
+        return distributions.flush()
+
+    def test_rerun_leaves_the_file_unchanged(self):
+        self.assertEqual(self.update(), [self.path])
+        content = self.read()
+        self.assertEqual(self.update(), [])
+        self.assertEqual(self.read(), content)
+
+
+if __name__ == "__main__":
+    unittest.main()
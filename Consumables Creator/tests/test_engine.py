@@ -0,0 +1,23 @@
+import unittest
+
+from consumables.engine import render_item_block
+from consumables.schema import validate_spec
+from consumables.specs import normalize_spec
+
+
+class StatModeTest(unittest.TestCase):
+    def spec(self, **fields):
+        return normalize_spec({"module": "Food", "item": "Apple", "category": "Food", "itemtype": "Food",
+                               "weight": "1", **fields})
+
+    def test_stat_without_mode_is_inactive(self):
+        spec = self.spec(hunger="10", thirst="5", thirst_mode="Decrease", stress="3", stress_mode="Increase")
+        self.assertEqual(validate_spec(spec), [])
+        block = render_item_block(spec)
+        self.assertNotIn("HungerChange", block)
+        self.assertIn("ThirstChange = -5,", block)
+        self.assertIn("StressChange = 3,", block)
+
+
+if __name__ == "__main__":
+    unittest.main()
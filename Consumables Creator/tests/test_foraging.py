@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from consumables.foraging import ForageManager, ForageModel, foraging_path
+
+HAND_WRITTEN = [
+    'local Berry = { type = "Base.BerryBlack", minCount = 1, maxCount = 3, skill = 2 }',
+    "table.insert(scavenges.berries, Berry)",
+]
+
+
+def baseline_entry(item_name, category, min_count, max_count, skill):
+    # As the baseline generator appended each item
+    var = f"Food_{item_name}_Forage"
+    return [
+        f"local {var} = {{}}",
+        f'{var}.type = "Food.{item_name}"',
+        f"{var}.minCount = {min_count}",
+        f"{var}.maxCount = {max_count}",
+        f"{var}.skill = {skill}",
+        f"table.insert(scavenges.{category}, {var})",
+        "",
+    ]
+
+
+class LegacyMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = foraging_path(self.root, "Food")
+        os.makedirs(os.path.dirname(self.path))
+        lines = [
+            'require "Foraging/forageDefinitions";',
+            'require "Foraging/forageSystem";',
+            "",
+            *baseline_entry("Pear", "forestGoods", 1, 2, 0),
+            *HAND_WRITTEN,
+            "",
+            *baseline_entry("Plum", "forestGoods", 2, 4, 3),
+        ]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def read(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def update(self):
+        foraging = ForageManager(self.root)
+        foraging.set("Food", "Pear", "forestGoods", 1, 2, 0)
+        foraging.set("Food", "Plum", "forestGoods", 2, 4, 3)
+        return foraging.flush()
+
+    def test_migration_keeps_hand_written_lines(self):
+        self.assertEqual(self.update(), [self.path])
+
+        model = ForageModel(self.path)
+        self.assertFalse(model.dirty)
+        self.assertEqual(model.categories, {"forestGoods": {"Food.Pear": (1, 2, 0), "Food.Plum": (2, 4, 3)}})
+        content = self.read()
+        self.assertNotIn("_Forage", content)
+        self.assertEqual(content.count('require "Foraging/forageSystem";'), 1)
+        self.assertIn("\n".join(HAND_WRITTEN), content.split(ForageModel.END_MARKER)[1])
+
+    def test_rerun_leaves_the_file_unchanged(self):
+        self.assertEqual(self.update(), [self.path])
+        content = self.read()
+        self.assertEqual(self.update(), [])
+        self.assertEqual(self.read(), content)
+
+
+if __name__ == "__main__":
+    unittest.main()
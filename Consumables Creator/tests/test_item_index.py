@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from consumables.engine import Generator
+from consumables.item_index import ItemIndex, index_path
+from consumables.specs import normalize_spec
+
+
+class ItemIndexJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def generate(self, *items, module="Orchard"):
+        with Generator(self.root) as generator:
+            generator.add_all(enumerate(normalize_spec({"module": module, "item": item, "category": "Food",
+                                                        "itemtype": "Food", "weight": "1"}) for item in items))
+        self.assertEqual(generator.errors, [])
+
+    def test_bookkeeping_stays_out_of_media(self):
+        legacy = os.path.join(self.root, "media", "scripts", "generated")
+        os.makedirs(os.path.join(legacy, ".locks"))
+        with open(os.path.join(legacy, ".consumables_index.json"), "w") as f:
+            f.write("{}")
+        self.generate("Apple")
+        internal = [name for _, dirnames, filenames in os.walk(os.path.join(self.root, "media"))
+                    for name in dirnames + filenames if name.startswith(".")]
+        self.assertEqual(internal, [])
+        self.assertTrue(os.path.exists(index_path(self.root)))
+
+    def test_save_appends_only_changed_entries(self):
+        self.generate("Apple")
+        self.generate("Chip", module="Snack")
+        with open(index_path(self.root), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        # Version line, the Orchard files, then the Snack files alone
+        appended = [line for line in lines[1:] if "Snack" in line]
+        self.assertEqual(lines[-len(appended):], appended)
+        self.assertFalse(any("Orchard" in line for line in lines[-len(appended):]))
+
+        index = ItemIndex(self.root)
+        self.assertEqual(index.dirty, set())
+        self.assertTrue(index.has_item("Orchard", "Apple"))
+        self.assertTrue(index.has_item("Snack", "Chip"))
+
+    def test_torn_last_line_is_scanned_again(self):
+        self.generate("Apple")
+        self.generate("Chip", module="Snack")
+        with open(index_path(self.root), "rb+") as f:
+            f.truncate(f.seek(0, os.SEEK_END) - 20)
+        index = ItemIndex(self.root)
+        self.assertTrue(index.has_item("Orchard", "Apple"))
+        self.assertTrue(index.has_item("Snack", "Chip"))
+        self.assertNotEqual(index.dirty, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import re
+import shutil
+import struct
+import tempfile
+import unittest
+import zlib
+
+from consumables.placeholders import (COLORS, ICON_SIZE, TEXTURE_SIZE, placeholder_content, render_fbx,
+                                      write_placeholders)
+
+
+class PlaceholderContentTest(unittest.TestCase):
+    def decode_png(self, data):
+        # (width, height, rows of RGBA pixels); every chunk's CRC is checked
+        self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+        chunks = []
+        pos = 8
+        while pos < len(data):
+            length, kind = struct.unpack(">I4s", data[pos:pos+8])
+            body = data[pos+8:pos+8+length]
+            self.assertEqual(struct.unpack(">I", data[pos+8+length:pos+12+length])[0], zlib.crc32(kind + body))
+            chunks.append((kind, body))
+            pos += 12 + length
+        self.assertEqual([kind for kind, _ in chunks], [b"IHDR", b"IDAT", b"IEND"])
+        width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", chunks[0][1])
+        self.assertEqual((depth, color_type, interlace), (8, 6, 0))
+        raw = zlib.decompress(chunks[1][1])
+        stride = 1 + 4 * width
+        self.assertEqual(len(raw), stride * height)
+        rows = []
+        for y in range(height):
+            row = raw[y*stride:(y+1)*stride]
+            self.assertEqual(row[0], 0)
+            rows.append([tuple(row[1+4*x:5+4*x]) for x in range(width)])
+        return width, height, rows
+
+    def test_png_decodes_at_its_size(self):
+        for kind, size in (("icon", ICON_SIZE), ("texture", TEXTURE_SIZE)):
+            width, height, rows = self.decode_png(placeholder_content(kind))
+            self.assertEqual((width, height), (size, size))
+            self.assertEqual(rows[0][0], COLORS[0])
+            self.assertEqual(rows[0][8], COLORS[1])
+            self.assertEqual(rows[8][8], COLORS[0])
+
+    def test_fbx_is_ascii_fbx(self):
+        text = render_fbx().decode("ascii")
+        self.assertTrue(text.startswith("; FBX 7.3.0 project file\n"))
+        self.assertEqual(text.count("{"), text.count("}"))
+        # Every array holds as many values as its *count says
+        arrays = {}
+        for name, count, values in re.findall(r"(\w+): \*(\d+) \{\s*a: ([^\n]*)", text):
+            arrays[name] = [float(value) for value in values.split(",")]
+            self.assertEqual(len(arrays[name]), int(count), name)
+        vertices = len(arrays["Vertices"]) // 3
+        indices = [int(value) for value in arrays["PolygonVertexIndex"]]
+        self.assertEqual(sum(1 for index in indices if index < 0), 6)
+        self.assertTrue(all(0 <= (index if index >= 0 else -index - 1) < vertices for index in indices))
+        self.assertEqual(len(arrays["Normals"]), 3 * len(indices))
+        self.assertEqual(len(arrays["UVIndex"]), len(indices))
+
+
+class WritePlaceholdersTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def paths(self, name):
+        return {kind: os.path.join(self.dir, f"{name}_{kind}") for kind in ("mesh", "texture", "icon")}
+
+    def test_existing_art_is_never_overwritten(self):
+        apple, pear = self.paths("Apple"), self.paths("Pear")
+        with open(apple["icon"], "wb") as f:
+            f.write(b"real icon")
+        write_placeholders(apple)
+        write_placeholders(pear)
+        # Real art replaces the placeholder later ones are cloned from
+        with open(apple["texture"] + ".tmp", "wb") as f:
+            f.write(b"real texture")
+        os.replace(apple["texture"] + ".tmp", apple["texture"])
+        write_placeholders(apple)
+        write_placeholders(self.paths("Plum"))
+
+        with open(apple["icon"], "rb") as f:
+            self.assertEqual(f.read(), b"real icon")
+        with open(apple["texture"], "rb") as f:
+            self.assertEqual(f.read(), b"real texture")
+        for paths in (pear, self.paths("Plum")):
+            with open(paths["texture"], "rb") as f:
+                self.assertEqual(f.read(), placeholder_content("texture"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from consumables.engine import Generator, output_paths
+from consumables.fileio import module_lock
+from consumables.preview import shadow_tree, unified_diff
+from consumables.specs import normalize_spec
+
+
+def tree_state(root):
+    state = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                state[os.path.relpath(path, root)] = (f.read(), stat.S_IMODE(os.stat(path).st_mode))
+    return state
+
+
+class DryRunTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        with Generator(self.root) as generator:
+            generator.add_all(enumerate([self.spec("Apple", "1"), self.spec("Pear", "1")]), replace=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def spec(self, item, weight):
+        return normalize_spec({"module": "Food", "item": item, "category": "Food", "itemtype": "Food",
+                               "weight": weight, "distribution_lists": "FridgeGeneric"})
+
+    def test_dry_run_leaves_the_mod_untouched(self):
+        before = tree_state(self.root)
+        with shadow_tree(self.root) as shadow:
+            self.assertFalse(module_lock(self.root, "Food").acquire(blocking=False))
+            icon = output_paths(self.root, self.spec("Apple", "1"))["icon"]
+            self.assertFalse(os.path.samefile(icon, os.path.join(shadow, os.path.relpath(icon, self.root))))
+
+            with Generator(shadow) as generator:
+                # An update, and an append to the linked item file
+                generator.add_all(enumerate([self.spec("Apple", "2"), self.spec("Plum", "1")]), replace=True)
+            self.assertEqual(generator.errors, [])
+            diff = "".join(unified_diff(self.root, shadow))
+        self.assertIn("+    Weight = 2,", diff)
+        self.assertIn("+item Plum", diff)
+        self.assertEqual(tree_state(self.root), before)
+        self.assertEqual([name for name in os.listdir(self.root) if name.startswith(".consumables-dry-run-")], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
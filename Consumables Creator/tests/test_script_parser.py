@@ -0,0 +1,49 @@
+import unittest
+
+from consumables.script_parser import ScriptParseError, iter_blocks
+
+
+def blocks(text):
+    data = text.encode("utf-8")
+    return [(block.kind, block.name, block.depth, data[block.start:block.end].decode("utf-8"))
+            for block in iter_blocks(data)]
+
+
+class IterBlocksTest(unittest.TestCase):
+    def test_nested_blocks_close_before_their_parent(self):
+        text = "module Food\n{\n    item Apple\n    {\n        Weight = 1,\n    }\n    model Apple { mesh = A, }\n}\n"
+        self.assertEqual(blocks(text), [
+            ("item", "Apple", 1, "item Apple\n    {\n        Weight = 1,\n    }"),
+            ("model", "Apple", 1, "model Apple { mesh = A, }"),
+            ("module", "Food", 0, text.rstrip("\n")),
+        ])
+        module = list(iter_blocks(text.encode("utf-8")))[-1]
+        self.assertEqual(module.properties(text.encode("utf-8")), [])
+
+    def test_braces_in_comments_are_skipped(self):
+        text = ("module Food\n{\n    // item Old {\n    /* } */ item /* the { new one */ Apple\n    {\n"
+                "        Weight = 1, // }\n    }\n}\n")
+        found = blocks(text)
+        self.assertEqual([block[:3] for block in found], [("item", "Apple", 1), ("module", "Food", 0)])
+        self.assertTrue(found[0][3].startswith("item /* the { new one */ Apple"))
+
+    def test_unterminated_block_comment_runs_to_the_end(self):
+        with self.assertRaises(ScriptParseError) as caught:
+            blocks("module Food\n{\n    item Apple { }\n    /* }\n")
+        self.assertEqual(caught.exception.line, 1)
+        self.assertIn("unclosed block 'module Food'", str(caught.exception))
+
+    def test_errors_name_the_line(self):
+        with self.assertRaises(ScriptParseError) as caught:
+            blocks("module Food\n{\n}\n}\n")
+        self.assertEqual((caught.exception.line, caught.exception.offset), (4, 16))
+        self.assertIn("unexpected '}'", str(caught.exception))
+
+        with self.assertRaises(ScriptParseError) as caught:
+            blocks("module Food\n{\n    item Apple\n    {\n        Weight = 1,\n}\n")
+        self.assertEqual(caught.exception.line, 1)
+        self.assertIn("unclosed block 'module Food'", str(caught.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
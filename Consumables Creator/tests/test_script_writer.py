@@ -0,0 +1,192 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from consumables.engine import Generator, output_paths
+from consumables.item_index import ItemIndex
+from consumables.script_parser import parse_file
+from consumables.script_writer import ScriptWriter, block_key
+from consumables.specs import normalize_spec
+
+
+def parsed_offsets(path):
+    return {block_key(block.kind, block.name): (block.start, block.end) for block in parse_file(path)
+            if block.depth == 1 and block.kind in ("item", "model")}
+
+
+def item_block(name, lines):
+    body = "".join(f"        Weight = {n}.5,\n" for n in range(lines))
+    return f"    item {name}\n    {{\n{body}    }}"
+
+
+class ScriptWriterOffsetsTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "Test_Food.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_random_edits_keep_offsets(self):
+        rng = random.Random(7)
+        offsets = {}
+        names = set()
+        for round_ in range(40):
+            writer = ScriptWriter(self.path, "Test", offsets=offsets)
+            for _ in range(rng.randint(1, 8)):
+                op = rng.random()
+                if op < 0.4 or not names:
+                    name = f"Item{rng.randint(0, 60)}"
+                    writer.replace(item_block(name, rng.randint(0, 4)))
+                    names.add(name)
+                elif op < 0.7:
+                    name = rng.choice(sorted(names))
+                    writer.remove("item", name)
+                    names.discard(name)
+                else:
+                    writer.add(item_block(f"New{round_}_{rng.randint(0, 9)}", rng.randint(0, 3)))
+            writer.flush()
+            names = {name for kind, name in writer.declared if kind == "item"}
+            self.assertEqual(parsed_offsets(self.path), offsets)
+
+    def test_stale_offsets_fall_back_to_parsing(self):
+        offsets = {}
+        writer = ScriptWriter(self.path, "Test", offsets=offsets)
+        for n in range(5):
+            writer.add(item_block(f"Item{n}", n))
+        writer.flush()
+        stale = {key: (start + 3, end + 3) for key, (start, end) in offsets.items()}
+        writer = ScriptWriter(self.path, "Test", offsets=stale)
+        writer.replace(item_block("Item2", 6))
+        writer.remove("item", "Item4")
+        writer.flush()
+        self.assertEqual(parsed_offsets(self.path), stale)
+        self.assertNotIn(block_key("item", "Item4"), stale)
+
+
+class InPlaceAppendTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "Test_Food.txt")
+        writer = ScriptWriter(self.path, "Test", offsets={})
+        writer.add(item_block("Apple", 2))
+        writer.flush()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def append(self, name):
+        offsets = parsed_offsets(self.path)
+        writer = ScriptWriter(self.path, "Test", offsets=offsets)
+        writer.add(item_block(name, 1))
+        writer.flush()
+        self.assertEqual(parsed_offsets(self.path), offsets)
+
+    def test_append_keeps_the_file(self):
+        inode = os.stat(self.path).st_ino
+        self.append("Pear")
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith(item_block("Pear", 1).strip() + "\n}\n"))
+
+    def test_hard_linked_file_is_copied(self):
+        link = os.path.join(self.dir, "Linked.txt")
+        os.link(self.path, link)
+        with open(link, "rb") as f:
+            before = f.read()
+        self.append("Pear")
+        self.assertNotEqual(os.stat(self.path).st_ino, os.stat(link).st_ino)
+        with open(link, "rb") as f:
+            self.assertEqual(f.read(), before)
+
+
+class UpsertIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def spec(self, rng, n):
+        return normalize_spec({
+            "module": f"mod{n % 2}",
+            "item": f"Item{n}",
+            "category": f"Cat{rng.randint(0, 2)}",
+            "itemtype": "Food",
+            "weight": str(rng.randint(1, 40) / 4),
+            "ingame_name": rng.choice(["", f"Item {n}", f"Fine Item {n}"]),
+        })
+
+    def test_random_upserts_keep_index_offsets(self):
+        rng = random.Random(3)
+        for round_ in range(6):
+            rows = [(row, self.spec(rng, rng.randint(0, 30))) for row in range(rng.randint(5, 25))]
+            with Generator(self.root, flush_every=rng.randint(1, 10)) as generator:
+                generator.add_all(rows, replace=True)
+            self.assertEqual(generator.errors, [])
+
+            index = ItemIndex(self.root)
+            self.assertEqual(index.dirty, set())
+            declared = []
+            for rel, entry in index.files.items():
+                if not rel.startswith(os.path.join("media", "scripts")):
+                    continue
+                path = os.path.join(self.root, rel)
+                spans = parsed_offsets(path)
+                self.assertEqual(index.block_offsets(path, entry["module"]), spans, rel)
+                declared.extend((entry["module"], key) for key in spans if key.startswith("item "))
+            # A category move leaves the item in its new file only
+            self.assertEqual(len(declared), len(set(declared)))
+
+
+class UnparsableFileTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.specs = [normalize_spec({"module": module, "item": item, "category": "Food", "itemtype": "Food",
+                                      "weight": "1"}) for module, item in (("Food", "Apple"), ("Snack", "Chip"))]
+        with Generator(self.root) as generator:
+            generator.add_all(enumerate(self.specs), replace=True)
+        self.path = output_paths(self.root, self.specs[0])["items"]
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def break_file(self):
+        # Drop the closing brace of the module
+        with open(self.path, "r", encoding="utf-8") as f:
+            content = f.read().rstrip()[:-1]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return content
+
+    def updated(self, spec, weight):
+        return {**spec, "weight": weight}
+
+    def test_update_in_unparsable_file_is_a_row_error(self):
+        content = self.break_file()
+        with Generator(self.root) as generator:
+            generator.add_all(enumerate(self.updated(spec, "2") for spec in self.specs), replace=True)
+        self.assertEqual([row for row, _ in generator.errors], [0])
+        self.assertIn("does not parse", generator.errors[0][1])
+        self.assertEqual(generator.updated, 1)
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), content)
+        with open(output_paths(self.root, self.specs[1])["items"], "r", encoding="utf-8") as f:
+            self.assertIn("Weight = 2,", f.read())
+
+    def test_file_broken_before_flush_is_a_file_error(self):
+        generator = Generator(self.root)
+        generator.add(self.updated(self.specs[0], "2"), 0, replace=True)
+        # As if the offsets were unknown, so the flush has to parse the file
+        generator.writers[self.path].offsets = None
+        content = self.break_file()
+        generator.close()
+        self.assertEqual([row for row, _ in generator.errors], [None])
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import shutil
+import tempfile
+import unittest
+
+from consumables.translations import TranslationManager
+
+
+class UpsertTranslationsTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def entries(self, lang):
+        return TranslationManager(self.root, ["EN", "ES", "FR"]).table("M", lang).entries
+
+    def test_rename_refreshes_fallbacks_only(self):
+        translations = TranslationManager(self.root, ["EN", "ES", "FR"])
+        translations.add("M", "Pear", "Pear", {"FR": "Poire"})
+        translations.add("M", "Apple", "Apple")
+        translations.flush()
+
+        translations = TranslationManager(self.root, ["EN", "ES", "FR"])
+        translations.set("M", "Pear", "Golden Pear")
+        translations.set("M", "Apple", "Red Apple", {"FR": "Pomme rouge"})
+        translations.flush()
+
+        self.assertEqual(self.entries("EN"), {"ItemName_M.Pear": "Golden Pear", "ItemName_M.Apple": "Red Apple"})
+        self.assertEqual(self.entries("ES"), {"ItemName_M.Pear": "Golden Pear", "ItemName_M.Apple": "Red Apple"})
+        self.assertEqual(self.entries("FR"), {"ItemName_M.Pear": "Poire", "ItemName_M.Apple": "Pomme rouge"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from consumables.engine import Generator, output_paths
+from consumables.specs import normalize_spec
+from consumables.watch import SpecWatcher
+
+HEADER = "module,item,category,itemtype,weight\n"
+
+
+class SpecOwnershipTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.dir, "mod")
+        self.specs = os.path.join(self.dir, "specs")
+        os.makedirs(self.specs)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, *rows):
+        path = os.path.join(self.specs, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(HEADER + "".join(f"Food,{row},Food,Food,{weight}\n" for row, weight in rows))
+        return path
+
+    def weight(self, item):
+        path = output_paths(self.root, {"module": "Food", "category": "Food", "asset": item})["items"]
+        with open(path, "r", encoding="utf-8") as f:
+            block = f.read().split(f"item {item}\n", 1)[1]
+        return block.split("Weight = ", 1)[1].split(",", 1)[0]
+
+    def build(self, *paths, adopt=False):
+        watcher = SpecWatcher(self.root, report=lambda message: None, adopt=adopt)
+        return watcher.apply(paths)
+
+    def test_item_in_two_spec_files_is_reported(self):
+        a = self.write("a.csv", ("Apple", "0.3"))
+        b = self.write("b.csv", ("Apple", "0.9"), ("Pear", "1"), ("Pear", "2"))
+        generator = self.build(a, b)
+        self.assertEqual(sorted(row for row, _ in generator.errors), ["b.csv row 2", "b.csv row 4"])
+        self.assertEqual((generator.created, generator.updated), (2, 0))
+        self.assertEqual(self.weight("Apple"), "0.3")
+        self.assertEqual(self.weight("Pear"), "1")
+
+        # The item stays with the file it was built from, in any order
+        generator = self.build(b, a)
+        self.assertEqual([row for row, _ in generator.errors], ["b.csv row 2", "b.csv row 4"])
+        self.assertEqual(self.weight("Apple"), "0.3")
+
+    def test_item_made_outside_the_specs_is_kept(self):
+        with Generator(self.root) as generator:
+            generator.add(normalize_spec({"module": "Food", "item": "Plum", "category": "Food",
+                                          "itemtype": "Food", "weight": "1"}))
+        c = self.write("c.csv", ("Plum", "5"))
+        generator = self.build(c)
+        self.assertEqual(len(generator.errors), 1)
+        self.assertEqual(self.weight("Plum"), "1")
+        generator = self.build(c, adopt=True)
+        self.assertEqual((generator.updated, generator.errors), (1, []))
+        self.assertEqual(self.weight("Plum"), "5")
+
+    def test_watch_cycle_keeps_items_with_their_file(self):
+        watcher = SpecWatcher(self.root, self.specs, report=lambda message: None)
+        self.write("a.csv", ("Apple", "0.3"))
+        watcher.apply(watcher.poll())
+        self.write("b.csv", ("Apple", "0.9"))
+        generator = watcher.apply(watcher.poll())
+        self.assertEqual([row for row, _ in generator.errors], ["b.csv row 2"])
+        self.assertEqual(self.weight("Apple"), "0.3")
+
+        # Once a.csv lets go of it, the row b.csv still has is built without b.csv being saved again
+        self.write("a.csv", ("Pear", "1"))
+        generator = watcher.apply(watcher.poll())
+        self.assertEqual(generator.errors, [])
+        self.assertEqual(self.weight("Apple"), "0.9")
+
+
+if __name__ == "__main__":
+    unittest.main()